@@ -1,7 +1,13 @@
 from queue import PriorityQueue
-from game import Spot
-import pygame
+from spot import Spot
+from components import ComponentIndex
+from gridmap import grid_edit_count, map_from_grid
+from landmarks import Landmarks
+from search import TABLE_SIZE, Solution, make_tie_breaker, nearest_distance
+from search import ara_star as grid_ara_star
+from workspace import SearchWorkspace
 from collections import deque
+from typing import Callable, Optional, Sequence
 
 
 def h(
@@ -51,11 +57,63 @@ def reconstruct_path(
         draw()
 
 
+def _workspace(grid: list) -> tuple:
+    """Get the thread's workspace for a grid and its number of columns."""
+    # cells are indexed by their own position, which the last one bounds
+    last = grid[-1][-1]
+    rows = max(len(grid), last.row + 1)
+    cols = max(len(grid[0]), last.col + 1)
+    return SearchWorkspace.for_size(rows * cols), cols
+
+
+def _disconnected(
+    start: Spot,
+    end: Spot,
+    components: Optional[ComponentIndex],
+) -> bool:
+    """Check if an index shows that no path joins two spots."""
+    if components is None:
+        return False
+    gmap = components.gmap
+    return not components.connected(gmap.index(*start.get_pos()),
+                                    gmap.index(*end.get_pos()))
+
+
+def _nearest_heuristic(targets: set) -> Callable[[Spot], float]:
+    """Get the Manhattan distance from a spot to the nearest target."""
+    if len(targets) == 1:
+        goal = next(iter(targets)).get_pos()
+        return lambda spot: h(spot.get_pos(), goal)
+    nearest = nearest_distance([target.get_pos() for target in targets])
+    return lambda spot: nearest(*spot.get_pos())
+
+
+# how a_star and dijkstra order open nodes of equal f, one of
+# `search.TIE_BREAKING`, e.g. set from the command line
+TIE_BREAK_OPTIONS = {"policy": "fifo"}
+
+
+def _tie_breaker(
+    policy: Optional[str],
+    cols: int,
+    start: Spot,
+    end: Spot,
+) -> Optional[Callable[[int, float, int], float]]:
+    """Build the open-set tie-breaking key of a search (see search.py)."""
+    return make_tie_breaker(policy or TIE_BREAK_OPTIONS["policy"], cols,
+                            start.row * cols + start.col,
+                            end.row * cols + end.col)
+
+
 def a_star(
     draw: callable,
     grid: list,
     start: Spot,
     end: Spot,
+    heuristic: Optional[Callable[[Spot], float]] = None,
+    starts: Sequence[Spot] = (),
+    goals: Sequence[Spot] = (),
+    tie_break: Optional[str] = None,
 ) -> bool:
     """
     Perform the A* search algorithm to find the shortest path between two
@@ -66,53 +124,71 @@ def a_star(
     - grid (list): A 2D list representing the grid or graph.
     - start (Spot): The starting node in the grid.
     - end (Spot): The end or target node in the grid.
+    - heuristic (Optional[Callable[[Spot], float]]): Estimated distance
+    from a spot to the nearest goal (default: Manhattan distance).
+    - starts (Sequence[Spot]): More starting nodes, searched from at once.
+    - goals (Sequence[Spot]): More target nodes; the search stops at the
+    nearest of them and `end`.
+    - tie_break (Optional[str]): How nodes of equal f are ordered, one of
+    `search.TIE_BREAKING` (default: `TIE_BREAK_OPTIONS['policy']`).
 
     Returns:
     - bool: True if a path is found, False otherwise.
     """
     if not grid:  # handle empty grid
         return False
-    count = 0
+    # dicts keep the order the starts were given in
+    sources = dict.fromkeys([start, *starts])
+    targets = {end, *goals}
+    if heuristic is None:
+        heuristic = _nearest_heuristic(targets)
     open_set = PriorityQueue()
-    open_set.put((0, count, start))
     came_from = {}
-    g_score = {spot: float("inf") for row in grid for spot in row}
-    g_score[start] = 0
-    f_score = {spot: float("inf") for row in grid for spot in row}
-    f_score[start] = h(start.get_pos(), end.get_pos())
-
-    open_set_hash = {start}
+    # g per cell index in a reused workspace, so a search only touches the
+    # cells it reaches
+    workspace, cols = _workspace(grid)
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    g_score = workspace.g
+    tie_breaker = _tie_breaker(tie_break, cols, start, end)
+    for count, source in enumerate(sources):
+        index = source.row * cols + source.col
+        tie = count if tie_breaker is None else tie_breaker(count, 0.0, index)
+        open_set.put((0, tie, count, source))
+        workspace.visit(index, 0.0, -1)
+
+    open_set_hash = set(sources)
 
     while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current = open_set.get()[2]
+        current = open_set.get()[3]
         open_set_hash.remove(current)
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
+        if current in targets:
+            reconstruct_path(came_from, current, draw)
+            current.make_end()
             return True
 
+        current_g = g_score[current.row * cols + current.col]
         for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
+            temp_g_score = current_g + 1
+            index = neighbor.row * cols + neighbor.col
 
-            if temp_g_score < g_score[neighbor]:
+            if stamp[index] != generation or temp_g_score < g_score[index]:
                 came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h(
-                    neighbor.get_pos(), end.get_pos())
+                stamp[index] = generation
+                g_score[index] = temp_g_score
                 if neighbor not in open_set_hash:
                     count += 1
-                    open_set.put((f_score[neighbor], count, neighbor))
+                    tie = (count if tie_breaker is None
+                           else tie_breaker(count, temp_g_score, index))
+                    open_set.put((temp_g_score + heuristic(neighbor), tie,
+                                  count, neighbor))
                     open_set_hash.add(neighbor)
                     neighbor.make_open()
 
         draw()
 
-        if current != start:
+        if current not in sources:
             current.make_closed()
     
     return False
@@ -123,6 +199,8 @@ def bfs(
     grid: list,
     start: Spot,
     end: Spot,
+    starts: Sequence[Spot] = (),
+    goals: Sequence[Spot] = (),
 ) -> bool:
     """
     Perform the Breadth-First Search (BFS) algorithm to find the shortest path.
@@ -132,39 +210,44 @@ def bfs(
     - grid (list): A 2D list representing the grid or graph.
     - start (Spot): The starting node in the grid.
     - end (Spot): The end or target node in the grid.
+    - starts (Sequence[Spot]): More starting nodes, searched from at once.
+    - goals (Sequence[Spot]): More target nodes; the search stops at the
+    first of them and `end` reached.
 
     Returns:
     - bool: True if a path is found, False otherwise.
     """
     if not grid:  # handle empty grid
         return False
-    queue = deque([start])
+    sources = dict.fromkeys([start, *starts])
+    targets = {end, *goals}
+    queue = deque(sources)
     came_from = {}
-    visited = {spot: False for row in grid for spot in row}
-    visited[start] = True
+    workspace, cols = _workspace(grid)
+    generation = workspace.next_generation()
+    visited = workspace.stamp
+    for source in sources:
+        visited[source.row * cols + source.col] = generation
 
     while queue:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
         current = queue.popleft()
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
+        if current in targets:
+            reconstruct_path(came_from, current, draw)
+            current.make_end()
             return True
 
         for neighbor in current.neighbors:
-            if not visited[neighbor]:
+            index = neighbor.row * cols + neighbor.col
+            if visited[index] != generation:
                 came_from[neighbor] = current
-                visited[neighbor] = True
+                visited[index] = generation
                 queue.append(neighbor)
                 neighbor.make_open()
 
         draw()
 
-        if current != start:
+        if current not in sources:
             current.make_closed()
 
     return False
@@ -175,6 +258,8 @@ def dfs(
     grid: list,
     start: Spot,
     end: Spot,
+    starts: Sequence[Spot] = (),
+    goals: Sequence[Spot] = (),
 ) -> bool:
     """
     Perform the Depth-First Search (DFS) algorithm to find a path.
@@ -184,39 +269,44 @@ def dfs(
     - grid (list): A 2D list representing the grid or graph.
     - start (Spot): The starting node in the grid.
     - end (Spot): The end or target node in the grid.
+    - starts (Sequence[Spot]): More starting nodes, searched from at once.
+    - goals (Sequence[Spot]): More target nodes; the search stops at the
+    first of them and `end` reached.
 
     Returns:
     - bool: True if a path is found, False otherwise.
     """
     if not grid:  # handle empty grid
         return False
-    stack = [start]
+    sources = dict.fromkeys([start, *starts])
+    targets = {end, *goals}
+    stack = list(sources)
     came_from = {}
-    visited = {spot: False for row in grid for spot in row}
-    visited[start] = True
+    workspace, cols = _workspace(grid)
+    generation = workspace.next_generation()
+    visited = workspace.stamp
+    for source in sources:
+        visited[source.row * cols + source.col] = generation
 
     while stack:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
         current = stack.pop()
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
+        if current in targets:
+            reconstruct_path(came_from, current, draw)
+            current.make_end()
             return True
 
         for neighbor in current.neighbors:
-            if not visited[neighbor]:
+            index = neighbor.row * cols + neighbor.col
+            if visited[index] != generation:
                 came_from[neighbor] = current
-                visited[neighbor] = True
+                visited[index] = generation
                 stack.append(neighbor)
                 neighbor.make_open()
 
         draw()
 
-        if current != start:
+        if current not in sources:
             current.make_closed()
 
     return False
@@ -226,7 +316,10 @@ def dijkstra(
         draw: callable,
         grid: list,
         start: Spot,
-        end: Spot
+        end: Spot,
+        starts: Sequence[Spot] = (),
+        goals: Sequence[Spot] = (),
+        tie_break: Optional[str] = None,
 ) -> bool:
     """
     Perform Dijkstra's algorithm to find the shortest path in a grid.
@@ -236,53 +329,398 @@ def dijkstra(
     - grid (list): A 2D list representing the grid or graph.
     - start (Spot): The starting node in the grid.
     - end (Spot): The end or target node in the grid.
+    - starts (Sequence[Spot]): More starting nodes, searched from at once.
+    - goals (Sequence[Spot]): More target nodes; the search stops at the
+    nearest of them and `end`.
+    - tie_break (Optional[str]): How nodes of equal distance are ordered,
+    one of `search.TIE_BREAKING` (default: `TIE_BREAK_OPTIONS['policy']`).
 
     Returns:
     - bool: True if the shortest path is found, False otherwise.
     """
     if not grid:  # handle empty grid
         return False
+    sources = dict.fromkeys([start, *starts])
+    targets = {end, *goals}
     open_set = PriorityQueue()
-    open_set.put((0, start))
     came_from = {}
-    distance = {spot: float("inf") for row in grid for spot in row}
-    distance[start] = 0
+    workspace, cols = _workspace(grid)
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    distance = workspace.g
+    tie_breaker = _tie_breaker(tie_break, cols, start, end)
+    for count, source in enumerate(sources):
+        index = source.row * cols + source.col
+        tie = count if tie_breaker is None else tie_breaker(count, 0.0, index)
+        open_set.put((0, tie, count, source))
+        workspace.visit(index, 0.0, -1)
     # unexplored = set(spot for row in grid for spot in row)
 
-    open_set_hash = {start}
+    open_set_hash = set(sources)
 
     # current = start
 
     while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current = open_set.get()[1]
+        current = open_set.get()[3]
         open_set_hash.remove(current)
         # open_set = PriorityQueue()
         # open_set.put((distance[current], current))
         # open_set_hash = {current}
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
+        if current in targets:
+            reconstruct_path(came_from, current, draw)
+            current.make_end()
             return True
 
+        current_distance = distance[current.row * cols + current.col]
         for neighbor in current.neighbors:
-            temp_distance = distance[current] + 1
+            temp_distance = current_distance + 1
+            index = neighbor.row * cols + neighbor.col
 
-            if temp_distance < distance[neighbor]:
+            if stamp[index] != generation or temp_distance < distance[index]:
                 came_from[neighbor] = current
-                distance[neighbor] = temp_distance
+                stamp[index] = generation
+                distance[index] = temp_distance
                 if neighbor not in open_set_hash:
-                    open_set.put((distance[neighbor], neighbor))
+                    count += 1
+                    tie = (count if tie_breaker is None
+                           else tie_breaker(count, temp_distance, index))
+                    open_set.put((temp_distance, tie, count, neighbor))
                     open_set_hash.add(neighbor)
                     neighbor.make_open()
 
         draw()
 
-        if current != start:
+        if current not in sources:
             current.make_closed()
 
     return False
+
+
+def ida_star(
+    draw: callable,
+    grid: list,
+    start: Spot,
+    end: Spot,
+    table_size: int = TABLE_SIZE,
+    components: Optional[ComponentIndex] = None,
+) -> bool:
+    """
+    Perform IDA* (iterative-deepening A*): depth-first passes bounded by
+    an f threshold that grows after each pass.
+
+    Only the current path and a transposition table of at most
+    `table_size` spots are kept, so memory does not grow with the grid.
+
+    Parameters:
+    - draw (callable): Function to draw or update the grid state.
+    - grid (list): A 2D list representing the grid or graph.
+    - start (Spot): The starting node in the grid.
+    - end (Spot): The end or target node in the grid.
+    - table_size (int): The most spots kept in the transposition table.
+    - components (Optional[ComponentIndex]): A component index of the
+    grid's barriers. If given, an unreachable end is reported without
+    searching; otherwise every pass retraces the start's whole region.
+
+    Returns:
+    - bool: True if a path is found, False otherwise.
+    """
+    if not grid:  # handle empty grid
+        return False
+    if _disconnected(start, end, components):
+        return False
+    if start == end:
+        end.make_end()
+        return True
+    goal = end.get_pos()
+    threshold = h(start.get_pos(), goal)
+
+    while True:
+        next_threshold = float("inf")
+        # cheapest g per spot in this pass, to prune repeated paths
+        table = {start: 0}
+        path = [start]
+        on_path = {start}
+        frames = [iter(start.neighbors)]
+        draw()
+
+        while frames:
+            neighbor = next(frames[-1], None)
+            if neighbor is None:
+                # every neighbor tried: backtrack
+                frames.pop()
+                current = path.pop()
+                on_path.discard(current)
+                if current != start:
+                    current.make_closed()
+                continue
+            if neighbor in on_path:
+                continue
+            g = len(path)
+            f = g + h(neighbor.get_pos(), goal)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            seen = table.get(neighbor)
+            if seen is not None and seen <= g:
+                continue
+            if seen is not None or len(table) < table_size:
+                table[neighbor] = g
+            if neighbor == end:
+                came_from = dict(zip(path[1:] + [end], path))
+                reconstruct_path(came_from, end, draw)
+                end.make_end()
+                return True
+            path.append(neighbor)
+            on_path.add(neighbor)
+            frames.append(iter(neighbor.neighbors))
+            neighbor.make_open()
+            draw()
+
+        if next_threshold == float("inf"):
+            return False
+        threshold = next_threshold
+
+
+def fringe_search(
+    draw: callable,
+    grid: list,
+    start: Spot,
+    end: Spot,
+    components: Optional[ComponentIndex] = None,
+) -> bool:
+    """
+    Perform Fringe Search: passes bounded by a growing f threshold, like
+    IDA*, that keep the fringe between passes and cache the g of every
+    spot visited, so nothing is searched twice.
+
+    The fringe is kept in two plain lists instead of a priority queue, and
+    only spots that were visited take up memory.
+
+    Parameters:
+    - draw (callable): Function to draw or update the grid state.
+    - grid (list): A 2D list representing the grid or graph.
+    - start (Spot): The starting node in the grid.
+    - end (Spot): The end or target node in the grid.
+    - components (Optional[ComponentIndex]): A component index of the
+    grid's barriers. If given, an unreachable end is reported without
+    searching.
+
+    Returns:
+    - bool: True if a path is found, False otherwise.
+    """
+    if not grid:  # handle empty grid
+        return False
+    if _disconnected(start, end, components):
+        return False
+    goal = end.get_pos()
+    came_from = {}
+    g_score = {start: 0}
+    # entries are (spot, g); one whose g is no longer current is stale
+    now = [(start, 0)]
+    threshold = h(start.get_pos(), goal)
+
+    while now:
+        next_threshold = float("inf")
+        later = []
+        while now:
+            current, current_g = now.pop()
+            if g_score[current] != current_g:
+                continue
+            f = current_g + h(current.get_pos(), goal)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                later.append((current, current_g))
+                continue
+
+            if current == end:
+                reconstruct_path(came_from, end, draw)
+                end.make_end()
+                return True
+
+            for neighbor in current.neighbors:
+                temp_g_score = current_g + 1
+                if temp_g_score < g_score.get(neighbor, float("inf")):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    now.append((neighbor, temp_g_score))
+                    neighbor.make_open()
+
+            draw()
+
+            if current != start:
+                current.make_closed()
+        later.reverse()
+        now = later
+        threshold = next_threshold
+
+    return False
+
+
+# landmark tables of the last grid searched with alt_a_star, with that grid
+# and the edit count they were checked at
+_landmark_cache: dict = {}
+
+
+def alt_a_star(
+    draw: callable,
+    grid: list,
+    start: Spot,
+    end: Spot,
+) -> bool:
+    """
+    Perform A* with the ALT (landmark) heuristic.
+
+    Landmark distance tables are built the first time a grid is searched
+    and reused until its barriers change. Searching the same grid again
+    costs nothing extra until `gridmap.grid_edited` reports an edit; only
+    then, or for another grid, are the tables checked against its
+    barriers. Code that edits barriers in place between searches must
+    call `grid_edited`.
+
+    Parameters:
+    - draw (callable): Function to draw or update the grid state.
+    - grid (list): A 2D list representing the grid or graph.
+    - start (Spot): The starting node in the grid.
+    - end (Spot): The end or target node in the grid.
+
+    Returns:
+    - bool: True if a path is found, False otherwise.
+    """
+    if not grid:  # handle empty grid
+        return False
+    edits = grid_edit_count()
+    landmarks = _landmark_cache.get("landmarks")
+    if (
+        landmarks is None
+        or _landmark_cache["grid"] is not grid
+        or _landmark_cache["edits"] != edits
+    ):
+        gmap = map_from_grid(grid)
+        if landmarks is None or not landmarks.is_current(gmap):
+            landmarks = Landmarks.build(gmap)
+        _landmark_cache.update(landmarks=landmarks, grid=grid, edits=edits)
+
+    cols = len(grid[0])
+    alt = landmarks.heuristic(end.row * cols + end.col)
+    return a_star(
+        draw,
+        grid,
+        start,
+        end,
+        heuristic=lambda spot: alt(spot.row * cols + spot.col),
+    )
+
+
+# weight and time budget (seconds, None for no limit) of the weighted and
+# anytime searches, e.g. set from the command line
+ANYTIME_OPTIONS = {"weight": 2.0, "deadline": None}
+
+
+def weighted_a_star(
+    draw: callable,
+    grid: list,
+    start: Spot,
+    end: Spot,
+) -> bool:
+    """
+    Perform A* with the Manhattan heuristic multiplied by
+    `ANYTIME_OPTIONS['weight']`, which finds a path with far fewer
+    expansions that costs at most that many times the shortest one.
+
+    Parameters:
+    - draw (callable): Function to draw or update the grid state.
+    - grid (list): A 2D list representing the grid or graph.
+    - start (Spot): The starting node in the grid.
+    - end (Spot): The end or target node in the grid.
+
+    Returns:
+    - bool: True if a path is found, False otherwise.
+    """
+    weight = ANYTIME_OPTIONS["weight"]
+    goal = end.get_pos()
+    return a_star(
+        draw,
+        grid,
+        start,
+        end,
+        heuristic=lambda spot: weight * h(spot.get_pos(), goal),
+    )
+
+
+def ara_star(
+    draw: callable,
+    grid: list,
+    start: Spot,
+    end: Spot,
+) -> bool:
+    """
+    Perform ARA* (anytime repairing A*), starting at weight
+    `ANYTIME_OPTIONS['weight']` and improving the path until it is optimal
+    or `ANYTIME_OPTIONS['deadline']` passes.
+
+    Every improved path is drawn as soon as it is found; cells of the
+    previous path that are no longer on it are shown as closed.
+
+    Parameters:
+    - draw (callable): Function to draw or update the grid state.
+    - grid (list): A 2D list representing the grid or graph.
+    - start (Spot): The starting node in the grid.
+    - end (Spot): The end or target node in the grid.
+
+    Returns:
+    - bool: True if a path is found, False otherwise.
+    """
+    if not grid:  # handle empty grid
+        return False
+    gmap = map_from_grid(grid)
+    cols = gmap.cols
+    shown = []
+
+    def observe(index: int, state: str) -> None:
+        spot = grid[index // cols][index % cols]
+        if state == "open":
+            spot.make_open()
+            return
+        draw()
+        if spot != start:
+            spot.make_closed()
+
+    def show(solution: Solution) -> None:
+        # like reconstruct_path: the start is marked, the end is not
+        path = solution.path[:-1]
+        on_path = set(path)
+        for index in shown:
+            if index not in on_path:
+                grid[index // cols][index % cols].make_closed()
+        for index in path:
+            grid[index // cols][index % cols].make_path()
+        shown[:] = path
+
+    result = grid_ara_star(
+        gmap,
+        gmap.index(*start.get_pos()),
+        gmap.index(*end.get_pos()),
+        weight=ANYTIME_OPTIONS["weight"],
+        deadline=ANYTIME_OPTIONS["deadline"],
+        on_solution=show,
+        observer=observe,
+    )
+    if result.found:
+        end.make_end()
+    return result.found
+
+
+ALGORITHMS = {
+    "a_star": a_star,
+    "alt": alt_a_star,
+    "ara_star": ara_star,
+    "bfs": bfs,
+    "dfs": dfs,
+    "dijkstra": dijkstra,
+    "fringe_search": fringe_search,
+    "ida_star": ida_star,
+    "weighted_a_star": weighted_a_star,
+}
+# algorithms that also take extra `starts` and `goals`
+MULTI_GOAL_ALGORITHMS = ("a_star", "bfs", "dfs", "dijkstra")
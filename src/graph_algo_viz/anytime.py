@@ -0,0 +1,128 @@
+import argparse
+import random
+import statistics
+from typing import Dict, List, Optional, Tuple
+from components import ComponentIndex
+from gridmap import GridMap, load_movingai_map
+from search import a_star, ara_star
+
+
+def connected_queries(
+    gmap: GridMap,
+    count: int,
+    seed: int = 0,
+) -> List[Tuple[int, int]]:
+    """
+    Pick random pairs of passable cells that are connected to each other.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - count (int): The number of pairs.
+    - seed (int): Random seed.
+
+    Returns:
+    - List[Tuple[int, int]]: (start, goal) cell indices.
+    """
+    components = ComponentIndex(gmap)
+    free = [cell for cell, barrier in enumerate(gmap.cells) if not barrier]
+    rng = random.Random(seed)
+    queries = []
+    while free and len(queries) < count:
+        start, goal = rng.choice(free), rng.choice(free)
+        if components.connected(start, goal):
+            queries.append((start, goal))
+    return queries
+
+
+def evaluate(
+    gmap: GridMap,
+    queries: List[Tuple[int, int]],
+    connectivity: int = 8,
+    weight: float = 2.0,
+    weight_step: float = 0.5,
+    deadline: Optional[float] = None,
+) -> Dict[str, float]:
+    """
+    Run ARA* on a set of queries and compare it with A*.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - queries (List[Tuple[int, int]]): (start, goal) cell indices.
+    - connectivity (int): 4 or 8.
+    - weight (float): The initial heuristic weight.
+    - weight_step (float): How much the weight drops after each pass.
+    - deadline (Optional[float]): Time budget per query in seconds.
+
+    Returns:
+    - Dict[str, float]: How many queries were solved and proven optimal,
+    first-path and returned latencies in milliseconds (median and max), the
+    mean and max cost over the optimal cost, the largest reported bound and
+    A*'s latencies.
+    """
+    first_ms, returned_ms, optimal_ms, ratios, bounds = [], [], [], [], []
+    for start, goal in queries:
+        result = ara_star(gmap, start, goal, connectivity, weight,
+                          weight_step, deadline)
+        optimal = a_star(gmap, start, goal, connectivity)
+        optimal_ms.append(optimal.seconds * 1000)
+        returned_ms.append(result.seconds * 1000)
+        if not result.found:
+            continue
+        first_ms.append(result.solutions[0].seconds * 1000)
+        ratios.append(result.cost / optimal.cost if optimal.cost else 1.0)
+        bounds.append(result.bound)
+
+    return {
+        "solved": len(first_ms),
+        "proven_optimal": sum(bound == 1.0 for bound in bounds),
+        "first_median_ms": statistics.median(first_ms or [0.0]),
+        "first_max_ms": max(first_ms, default=0.0),
+        "returned_median_ms": statistics.median(returned_ms or [0.0]),
+        "returned_max_ms": max(returned_ms, default=0.0),
+        "cost_ratio_mean": statistics.mean(ratios or [1.0]),
+        "cost_ratio_max": max(ratios, default=1.0),
+        "bound_max": max(bounds, default=1.0),
+        "a_star_median_ms": statistics.median(optimal_ms or [0.0]),
+        "a_star_max_ms": max(optimal_ms, default=0.0),
+    }
+
+
+if __name__ == "__main__":
+    """
+    Run ARA* with a time budget on random queries of a MovingAI map and
+    report how fast the first path arrives and how good the returned paths
+    are against A*, e.g.
+
+        python anytime.py arena.map -weight 3 -deadline-ms 5 -queries 100
+    """
+    parser = argparse.ArgumentParser(description="Anytime search (ARA*)")
+    parser.add_argument("map", help="MovingAI '.map' file")
+    parser.add_argument("-weight", type=float, default=2.0,
+                        help="Initial heuristic weight")
+    parser.add_argument("-weight-step", type=float, default=0.5,
+                        help="Weight decrease after each pass")
+    parser.add_argument("-deadline-ms", type=float, default=5.0,
+                        help="Time budget per query in milliseconds")
+    parser.add_argument("-connectivity", type=int, choices=[4, 8],
+                        default=8, help="Grid connectivity")
+    parser.add_argument("-queries", type=int, default=100,
+                        help="Number of random queries")
+    parser.add_argument("-seed", type=int, default=0, help="Query seed")
+    args = parser.parse_args()
+
+    gmap = load_movingai_map(args.map)
+    queries = connected_queries(gmap, args.queries, args.seed)
+    report = evaluate(gmap, queries, args.connectivity, args.weight,
+                      args.weight_step, args.deadline_ms / 1000)
+    print(f"{report['solved']} of {len(queries)} queries solved within "
+          f"{args.deadline_ms:g} ms, {report['proven_optimal']} proven "
+          "optimal")
+    print(f"first path: median {report['first_median_ms']:.2f} ms, "
+          f"max {report['first_max_ms']:.2f} ms")
+    print(f"returned:   median {report['returned_median_ms']:.2f} ms, "
+          f"max {report['returned_max_ms']:.2f} ms, cost/optimal mean "
+          f"{report['cost_ratio_mean']:.3f} max "
+          f"{report['cost_ratio_max']:.3f}, bound max "
+          f"{report['bound_max']:.2f}")
+    print(f"A*:         median {report['a_star_median_ms']:.2f} ms, "
+          f"max {report['a_star_max_ms']:.2f} ms")
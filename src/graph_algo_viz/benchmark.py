@@ -0,0 +1,450 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+from algorithms import ALGORITHMS
+from components import ComponentIndex
+from generators import generate
+from gridmap import GridMap, grid_from_map
+from recorder import SearchRecorder, make_recording_grid
+from search import TIE_BREAKING
+from spot import Spot
+from workspace import SearchWorkspace
+
+
+SIZES = [32, 64, 128]
+MAP_TYPES = ["random", "caves", "maze", "rooms"]
+DENSITIES = [0.1, 0.3]
+# generators that take a barrier density
+DENSITY_MAPS = {"random", "caves"}
+# algorithms that take an open-set tie-breaking policy
+TIE_BREAK_ALGORITHMS = {"a_star", "dijkstra"}
+# algorithms that skip unreachable goals given a component index
+INDEXED_ALGORITHMS = {"ida_star", "fringe_search"}
+# largest grid size run per algorithm; IDA* repeats its passes and takes
+# seconds per query on a 128x128 maze
+MAX_SIZES = {"ida_star": 64}
+
+
+class StepCounter:
+    """
+    A `draw` callback that counts search steps instead of drawing.
+    """
+    def __init__(self) -> None:
+        self.steps = 0
+
+    def __call__(self) -> None:
+        self.steps += 1
+
+
+def make_cases(
+    sizes: List[int],
+    map_types: List[str],
+    densities: List[float],
+    seed: int,
+) -> List[Dict]:
+    """
+    Build the benchmark matrix of maps.
+
+    Parameters:
+    - sizes (List[int]): Grid sizes (rows = columns).
+    - map_types (List[str]): Generator names.
+    - densities (List[float]): Barrier densities, used by the generators in
+    `DENSITY_MAPS`.
+    - seed (int): The seed used for every map.
+
+    Returns:
+    - List[Dict]: One dict per map with 'map', 'size', 'density' and 'seed'.
+    """
+    cases = []
+    for map_type in map_types:
+        for size in sizes:
+            for density in densities if map_type in DENSITY_MAPS else [None]:
+                cases.append({
+                    "map": map_type,
+                    "size": size,
+                    "density": density,
+                    "seed": seed,
+                })
+    return cases
+
+
+def case_key(result: Dict) -> Tuple:
+    """
+    Get the key identifying a benchmark result across runs.
+
+    Parameters:
+    - result (Dict): A benchmark result.
+
+    Returns:
+    - Tuple: (algorithm, tie-breaking policy, map, size, density, seed).
+    """
+    return (
+        result["algorithm"],
+        # reports from before tie-breaking policies all used 'fifo'
+        result.get("tie_break") or "fifo",
+        result["map"],
+        result["size"],
+        result["density"],
+        result["seed"],
+    )
+
+
+def build_map(case: Dict) -> GridMap:
+    """
+    Generate the map for a benchmark case.
+
+    Parameters:
+    - case (Dict): The benchmark case.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    options = {}
+    if case["density"] is not None:
+        options["density"] = case["density"]
+    return generate(case["map"], case["size"], seed=case["seed"], **options)
+
+
+def endpoints(gmap: GridMap) -> Optional[Tuple[int, int]]:
+    """
+    Pick the query endpoints for a map: the first and last passable cells in
+    row-major order, which are far apart on every map type.
+
+    Parameters:
+    - gmap (GridMap): The map.
+
+    Returns:
+    - Optional[Tuple[int, int]]: The (start, end) cell indices, or None if
+    the map has fewer than two passable cells.
+    """
+    first = gmap.cells.find(0)
+    last = gmap.cells.rfind(0)
+    if first == -1 or first == last:
+        return None
+    return first, last
+
+
+def reset_search_state(grid: List[List[Spot]]) -> None:
+    """
+    Clear the open, closed and path colours left behind by a run.
+
+    Parameters:
+    - grid (List[List[Spot]]): The grid to clear.
+    """
+    for row in grid:
+        for spot in row:
+            if not spot.is_barrier():
+                spot.reset()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Get a nearest-rank percentile.
+
+    Parameters:
+    - values (List[float]): The samples.
+    - fraction (float): The percentile as a fraction, e.g. 0.95.
+
+    Returns:
+    - float: The percentile value.
+    """
+    ordered = sorted(values)
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def run_case(
+    algorithm: str,
+    case: Dict,
+    repeats: int,
+    tie_break: Optional[str] = None,
+) -> Optional[Dict]:
+    """
+    Benchmark one algorithm on one map.
+
+    The algorithm runs headless `repeats` times for latency, once on a
+    recording copy of the grid to count its expansions and path cost, and
+    once more under tracemalloc for peak memory, since recording and
+    tracing slow the run down.
+    Peak memory covers what the search allocates, including its workspace,
+    but not the grid itself, nor the component index handed to the
+    algorithms in `INDEXED_ALGORITHMS`, which callers keep per map.
+
+    Parameters:
+    - algorithm (str): The algorithm name in `ALGORITHMS`.
+    - case (Dict): The benchmark case.
+    - repeats (int): The number of timed runs.
+    - tie_break (Optional[str]): The tie-breaking policy, for the algorithms
+    in `TIE_BREAK_ALGORITHMS`.
+
+    Returns:
+    - Optional[Dict]: The result, or None if the map has no endpoints.
+    """
+    gmap = build_map(case)
+    ends = endpoints(gmap)
+    if ends is None:
+        return None
+    grid = grid_from_map(gmap)
+    (start_row, start_col), (end_row, end_col) = (
+        gmap.pos(ends[0]), gmap.pos(ends[1])
+    )
+    start = grid[start_row][start_col]
+    end = grid[end_row][end_col]
+    search = ALGORITHMS[algorithm]
+    options = {"tie_break": tie_break} if tie_break else {}
+    if algorithm in INDEXED_ALGORITHMS:
+        options["components"] = ComponentIndex(gmap)
+
+    timings = []
+    for _ in range(repeats):
+        reset_search_state(grid)
+        t0 = time.perf_counter()
+        found = search(StepCounter(), grid, start, end, **options)
+        timings.append(time.perf_counter() - t0)
+
+    # expansions are the steps before the last path was drawn, so
+    # searches that draw their path without a step still count right
+    reset_search_state(grid)
+    recorder = SearchRecorder()
+    copy = make_recording_grid(grid, recorder)
+    recorder.finish(search(recorder.tick, copy, copy[start_row][start_col],
+                           copy[end_row][end_col], **options))
+    path_cost = recorder.path_cost
+    expansions = recorder.expansions
+
+    reset_search_state(grid)
+    # count the scratch arrays the timed runs left allocated for reuse
+    SearchWorkspace.release()
+    tracemalloc.start()
+    search(StepCounter(), grid, start, end, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "algorithm": algorithm,
+        "tie_break": tie_break,
+        **case,
+        "found": found,
+        "path_cost": path_cost,
+        "expansions": expansions,
+        "median_ms": median * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "expansions_per_s": expansions / median if median > 0 else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(
+    algorithms: List[str],
+    cases: List[Dict],
+    repeats: int,
+    verbose: bool = True,
+    tie_breaks: Sequence[str] = ("fifo",),
+) -> Dict:
+    """
+    Run every algorithm over every benchmark case.
+
+    Parameters:
+    - algorithms (List[str]): Algorithm names in `ALGORITHMS`. Each skips
+    the cases larger than its entry in `MAX_SIZES`.
+    - cases (List[Dict]): The benchmark cases.
+    - repeats (int): The number of timed runs per result.
+    - verbose (bool): Print each result as it finishes.
+    - tie_breaks (Sequence[str]): Tie-breaking policies; the algorithms in
+    `TIE_BREAK_ALGORITHMS` are run once per policy.
+
+    Returns:
+    - Dict: The report, with 'meta' and 'results' keys.
+    """
+    results = []
+    for case in cases:
+        for algorithm in algorithms:
+            if case["size"] > MAX_SIZES.get(algorithm, case["size"]):
+                continue
+            policies = (tie_breaks if algorithm in TIE_BREAK_ALGORITHMS
+                        else [None])
+            for policy in policies:
+                result = run_case(algorithm, case, repeats, policy)
+                if result is None:
+                    continue
+                results.append(result)
+                if verbose:
+                    print(format_result(result))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def format_result(result: Dict) -> str:
+    """
+    Format a result as one table row.
+
+    Parameters:
+    - result (Dict): A benchmark result.
+
+    Returns:
+    - str: The formatted row.
+    """
+    density = "-" if result["density"] is None else f"{result['density']:.2f}"
+    name = result["algorithm"]
+    if result.get("tie_break") not in (None, "fifo"):
+        name += f"/{result['tie_break']}"
+    return (
+        f"{name:>15} {result['map']:>8} {result['size']:>5} "
+        f"{density:>5} | median {result['median_ms']:9.2f} ms "
+        f"p95 {result['p95_ms']:9.2f} ms | {result['expansions']:>8} exp "
+        f"{result['expansions_per_s']:>11.0f} exp/s | "
+        f"peak {result['peak_kib']:9.1f} KiB"
+    )
+
+
+def compare_to_baseline(
+    report: Dict,
+    baseline: Dict,
+    tolerance: float = 0.25,
+    min_delta_ms: float = 0.5,
+) -> List[str]:
+    """
+    Find regressions against a stored baseline report.
+
+    A result regresses when its median latency or peak memory grows by more
+    than `tolerance`, or when it expands more nodes. Latency changes
+    smaller than `min_delta_ms` are ignored as timer noise.
+
+    Parameters:
+    - report (Dict): The new report.
+    - baseline (Dict): The baseline report.
+    - tolerance (float): The allowed relative growth.
+    - min_delta_ms (float): The smallest latency change that counts.
+
+    Returns:
+    - List[str]: A description of each regression.
+    """
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        name = " ".join(str(part) for part in case_key(result))
+        if (
+            result["median_ms"] > old["median_ms"] * (1 + tolerance)
+            and result["median_ms"] - old["median_ms"] > min_delta_ms
+        ):
+            regressions.append(
+                f"{name}: median {old['median_ms']:.2f} -> "
+                f"{result['median_ms']:.2f} ms"
+            )
+        if result["expansions"] > old["expansions"]:
+            regressions.append(
+                f"{name}: expansions {old['expansions']} -> "
+                f"{result['expansions']}"
+            )
+        if result["peak_kib"] > old["peak_kib"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak memory {old['peak_kib']:.1f} -> "
+                f"{result['peak_kib']:.1f} KiB"
+            )
+    return regressions
+
+
+def arg_parse():
+    """
+    Parse command-line arguments for the benchmark suite.
+
+    Returns:
+    - argparse.Namespace: An object containing the parsed command-line
+    arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Headless pathfinding benchmark suite"
+    )
+    parser.add_argument(
+        "-algo",
+        "--algorithms",
+        nargs="+",
+        choices=list(ALGORITHMS),
+        default=list(ALGORITHMS),
+        help="Algorithms to benchmark (default: all; ida_star only up to "
+        "64x64)",
+    )
+    parser.add_argument(
+        "-tie-break",
+        nargs="+",
+        choices=TIE_BREAKING,
+        default=["fifo"],
+        help="Tie-breaking policies to run a_star and dijkstra with",
+    )
+    parser.add_argument(
+        "-sizes", nargs="+", type=int, default=SIZES, help="Grid sizes"
+    )
+    parser.add_argument(
+        "-maps", nargs="+", default=MAP_TYPES, help="Map generators"
+    )
+    parser.add_argument(
+        "-densities",
+        nargs="+",
+        type=float,
+        default=DENSITIES,
+        help="Barrier densities for the 'random' and 'caves' maps",
+    )
+    parser.add_argument("-seed", type=int, default=0, help="Map seed")
+    parser.add_argument(
+        "-repeats", type=int, default=5, help="Timed runs per result"
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write the JSON report here"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Fail if the report regresses against this JSON report",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative latency and memory growth",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    """
+    Run the benchmark suite, e.g.
+
+        python benchmark.py -o baseline.json
+        python benchmark.py --baseline baseline.json
+    """
+    args = arg_parse()
+    cases = make_cases(args.sizes, args.maps, args.densities, args.seed)
+    report = run_suite(args.algorithms, cases, args.repeats,
+                       tie_breaks=args.tie_break)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against "
+                  f"{args.baseline}:")
+            for regression in regressions:
+                print(f"  REGRESSION {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
@@ -0,0 +1,238 @@
+import math
+from array import array
+from typing import List, Optional, Tuple
+from gridmap import GridMap
+
+
+# bytes of '0' and '1' digits for passable (0) and barrier (1) map cells
+_PASSABLE_DIGITS = bytes.maketrans(b"\x00\x01", b"10")
+# '0' and '1' digits to the bytes 0 and 1
+_DIGIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class BitGrid:
+    """
+    The passable cells of a GridMap as one bitboard: a Python int whose bit
+    `row * cols + col` is set for every passable cell.
+
+    `reachable`, `distances` and `shortest_path` grow a whole
+    breadth-first layer at once, with about ten shifts, masks and ORs, each
+    a single big-int operation over the map's cells, instead of one queue
+    operation per cell. Only 4-connected, unit-cost moves are supported.
+    `search.bfs` and `search.distance_field` use it as their 'bitboard'
+    backend.
+
+    Every layer costs a pass over the map, so this only pays off when a
+    search takes few layers. On open 1024x1024 maps a distance field takes
+    about 0.75 s against 1.2 s with a queue, but on a 1023x1023 maze,
+    where paths wind one cell per layer, it takes 16 s against 0.6 s.
+
+    Parameters:
+    - gmap (GridMap): The map. Later edits to it are not seen.
+
+    Attributes:
+    - passable (int): The bitboard of passable cells.
+    """
+    def __init__(self, gmap: GridMap) -> None:
+        self.rows = gmap.rows
+        self.cols = gmap.cols
+        digits = bytes(gmap.cells).translate(_PASSABLE_DIGITS)
+        # the last cell is the most significant digit
+        self.passable = int(digits[::-1], 2) if digits else 0
+
+        # moving a cell one column left or right must not wrap it onto the
+        # neighboring row, so those moves are masked by column
+        first_col = int(("0" * (self.cols - 1) + "1") * self.rows or "0", 2)
+        last_col = first_col << (self.cols - 1)
+        self._from_left = self.passable & ~first_col
+        self._from_right = self.passable & ~last_col
+
+    def grow(
+        self,
+        frontier: int,
+        previous: int,
+    ) -> int:
+        """
+        Get the next layer of a breadth-first search.
+
+        A neighbor of a cell in one layer lies in the layer before, the
+        same layer or the next, so only the last two layers have to be
+        excluded, not every cell reached so far.
+
+        Parameters:
+        - frontier (int): The bitboard of the current layer.
+        - previous (int): The bitboard of the layer before it.
+
+        Returns:
+        - int: The bitboard of the next layer.
+        """
+        cols = self.cols
+        grown = (
+            ((frontier << 1) & self._from_left)
+            | ((frontier >> 1) & self._from_right)
+            | (((frontier << cols) | (frontier >> cols)) & self.passable)
+        )
+        # `grown & ~seen` would work on negative ints, which is slower
+        return grown ^ (grown & (frontier | previous))
+
+    def reachable(self, source: int) -> int:
+        """
+        Get every cell reachable from a cell.
+
+        Parameters:
+        - source (int): The source cell index.
+
+        Returns:
+        - int: The bitboard of the reachable cells, 0 if the source is a
+        barrier.
+        """
+        frontier = visited = (1 << source) & self.passable
+        previous = 0
+        while frontier:
+            frontier, previous = self.grow(frontier, previous), frontier
+            visited |= frontier
+        return visited
+
+    def cells(self, board: int) -> List[int]:
+        """
+        Get the cell indices of the set bits of a bitboard.
+
+        Parameters:
+        - board (int): The bitboard.
+
+        Returns:
+        - List[int]: The cell indices in increasing order.
+        """
+        digits = format(board, "b")[::-1]
+        found = []
+        index = digits.find("1")
+        while index != -1:
+            found.append(index)
+            index = digits.find("1", index + 1)
+        return found
+
+    def distances(self, source: int) -> array:
+        """
+        Get the number of moves from a cell to every cell.
+
+        Each layer's cells are added to the bit planes of their distance:
+        plane j holds the cells whose distance has bit j set. The planes are
+        only unpacked into one number per cell at the end.
+
+        Parameters:
+        - source (int): The source cell index.
+
+        Returns:
+        - array: Distance per cell index ('d' typecode), math.inf where
+        unreachable.
+        """
+        size = self.rows * self.cols
+        frontier = visited = (1 << source) & self.passable
+        previous = 0
+        planes: List[int] = []
+        layer = 0
+        while frontier:
+            bit = 0
+            while layer >> bit:
+                if layer >> bit & 1:
+                    while len(planes) <= bit:
+                        planes.append(0)
+                    planes[bit] |= frontier
+                bit += 1
+            frontier, previous = self.grow(frontier, previous), frontier
+            visited |= frontier
+            layer += 1
+
+        # one 32-bit lane per cell; the planes' bits never overlap, so
+        # adding them up in lanes assembles every distance at once
+        total = 0
+        for bit, plane in enumerate(planes):
+            lanes = bytearray(4 * size)
+            lanes[::4] = (format(plane, "b").zfill(size)[::-1]
+                          .encode().translate(_DIGIT_BYTES))
+            total |= int.from_bytes(lanes, "little") << bit
+        lane_values = array("I", total.to_bytes(4 * size, "little"))
+
+        reached = format(visited, "b").zfill(size)[::-1]
+        return array("d", [
+            value if reached[index] == "1" else math.inf
+            for index, value in enumerate(lane_values)
+        ])
+
+    def shortest_path(
+        self,
+        start: int,
+        goal: int,
+    ) -> Optional[Tuple[List[int], int]]:
+        """
+        Find a path with the fewest moves between two cells.
+
+        Only some layers are kept while searching: a checkpoint every
+        `spacing` layers, where the spacing doubles whenever there are more
+        checkpoints than it, so both stay near the square root of the
+        distance. Walking back from the goal, the layers between two
+        checkpoints are grown again to find each cell's predecessor.
+
+        Parameters:
+        - start (int): The start cell index.
+        - goal (int): The goal cell index.
+
+        Returns:
+        - Optional[Tuple[List[int], int]]: The path from start to goal and
+        the number of cells in the layers before the goal's, or None if the
+        goal cannot be reached.
+        """
+        goal_bit = 1 << goal
+        if not (self.passable >> start & 1 and self.passable & goal_bit):
+            return None
+        frontier, previous = 1 << start, 0
+        # (frontier, previous) at layers 0, spacing, 2 * spacing, ...
+        checkpoints = [(frontier, previous)]
+        spacing = 1
+        expanded = 0
+        distance = 0
+        while not frontier & goal_bit:
+            if not frontier:
+                return None
+            expanded += frontier.bit_count()
+            frontier, previous = self.grow(frontier, previous), frontier
+            distance += 1
+            if distance % spacing == 0:
+                checkpoints.append((frontier, previous))
+                if len(checkpoints) > spacing:
+                    checkpoints = checkpoints[::2]
+                    spacing *= 2
+
+        path = [goal]
+        current = goal
+        while distance > 0:
+            base = (distance - 1) // spacing * spacing
+            frontier, previous = checkpoints[base // spacing]
+            layers = [frontier]
+            for _ in range(base, distance - 1):
+                frontier, previous = self.grow(frontier, previous), frontier
+                layers.append(frontier)
+            while distance > base:
+                previous = layers[distance - 1 - base]
+                current = next(
+                    neighbor for neighbor in self._neighbors(current)
+                    if previous >> neighbor & 1
+                )
+                path.append(current)
+                distance -= 1
+        path.reverse()
+        return path, expanded
+
+    def _neighbors(self, index: int) -> List[int]:
+        """List the in-grid 4-neighbors of a cell, down, up, right, left."""
+        row, col = divmod(index, self.cols)
+        neighbors = []
+        if row < self.rows - 1:
+            neighbors.append(index + self.cols)
+        if row > 0:
+            neighbors.append(index - self.cols)
+        if col < self.cols - 1:
+            neighbors.append(index + 1)
+        if col > 0:
+            neighbors.append(index - 1)
+        return neighbors
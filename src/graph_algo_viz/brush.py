@@ -0,0 +1,188 @@
+from collections import deque
+from typing import List, Tuple
+from gridmap import GridMap
+
+
+# painting modes, cycled with the B key
+BRUSH_MODES = ("brush", "rect", "fill")
+# the largest brush, in cells per side
+MAX_BRUSH_SIZE = 15
+
+Cell = Tuple[int, int]
+
+
+def line_cells(
+    start: Cell,
+    end: Cell,
+) -> List[Cell]:
+    """
+    Get the cells on a straight line between two cells (Bresenham), so a
+    fast drag that skips cells between two mouse samples still paints a
+    gapless stroke.
+
+    Parameters:
+    - start (Tuple[int, int]): (row, col) of the first cell.
+    - end (Tuple[int, int]): (row, col) of the last cell.
+
+    Returns:
+    - List[Tuple[int, int]]: The cells from start to end, both included.
+    """
+    (row, col), (end_row, end_col) = start, end
+    d_row, d_col = abs(end_row - row), -abs(end_col - col)
+    step_row = 1 if row < end_row else -1
+    step_col = 1 if col < end_col else -1
+    error = d_row + d_col
+    cells = [(row, col)]
+    while (row, col) != (end_row, end_col):
+        twice = 2 * error
+        if twice >= d_col:
+            error += d_col
+            row += step_row
+        if twice <= d_row:
+            error += d_row
+            col += step_col
+        cells.append((row, col))
+    return cells
+
+
+def stamp_cells(
+    center: Cell,
+    size: int,
+    rows: int,
+) -> List[Cell]:
+    """
+    Get the cells under a square brush.
+
+    Parameters:
+    - center (Tuple[int, int]): (row, col) of the cell under the mouse.
+    - size (int): The brush size in cells per side.
+    - rows (int): The number of rows (and columns) in the grid.
+
+    Returns:
+    - List[Tuple[int, int]]: The cells of the brush inside the grid.
+    """
+    row, col = center
+    low = (size - 1) // 2
+    return [
+        (r, c)
+        for r in range(max(0, row - low), min(rows, row - low + size))
+        for c in range(max(0, col - low), min(rows, col - low + size))
+    ]
+
+
+def rect_cells(
+    corner: Cell,
+    opposite: Cell,
+) -> List[Cell]:
+    """
+    Get the cells of a filled rectangle.
+
+    Parameters:
+    - corner (Tuple[int, int]): (row, col) of one corner.
+    - opposite (Tuple[int, int]): (row, col) of the opposite corner.
+
+    Returns:
+    - List[Tuple[int, int]]: The cells of the rectangle.
+    """
+    (row_a, col_a), (row_b, col_b) = corner, opposite
+    return [
+        (row, col)
+        for row in range(min(row_a, row_b), max(row_a, row_b) + 1)
+        for col in range(min(col_a, col_b), max(col_a, col_b) + 1)
+    ]
+
+
+def flood_cells(
+    gmap: GridMap,
+    row: int,
+    col: int,
+) -> List[Cell]:
+    """
+    Get the 4-connected region of cells that are all passable, or all
+    barriers, like the given cell.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - row (int): The row of the cell to fill from.
+    - col (int): The column of the cell to fill from.
+
+    Returns:
+    - List[Tuple[int, int]]: The cells of the region.
+    """
+    cells, cols = gmap.cells, gmap.cols
+    first = gmap.index(row, col)
+    value = cells[first]
+    seen = {first}
+    queue = deque([first])
+    while queue:
+        index = queue.popleft()
+        index_row, index_col = divmod(index, cols)
+        for neighbor, inside in (
+            (index - cols, index_row > 0),
+            (index + cols, index_row < gmap.rows - 1),
+            (index - 1, index_col > 0),
+            (index + 1, index_col < cols - 1),
+        ):
+            if inside and neighbor not in seen and cells[neighbor] == value:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return [divmod(index, cols) for index in seen]
+
+
+class EditHistory:
+    """
+    Undo stack of barrier edits, one entry per stroke.
+
+    Parameters:
+    - limit (int): The number of strokes kept; older ones are forgotten.
+    """
+    def __init__(self, limit: int = 100) -> None:
+        self.limit = limit
+        self._strokes: List[List[Tuple[int, int, bool]]] = []
+        self._stroke: List[Tuple[int, int, bool]] = []
+
+    def record(
+        self,
+        row: int,
+        col: int,
+        was_barrier: bool,
+    ) -> None:
+        """
+        Remember a cell's barrier state before the current stroke changed
+        it.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - col (int): The column of the cell.
+        - was_barrier (bool): Whether the cell was a barrier.
+        """
+        self._stroke.append((row, col, was_barrier))
+
+    def end_stroke(self) -> None:
+        """
+        Close the current stroke, so `undo` reverts it as a whole.
+        """
+        if self._stroke:
+            self._strokes.append(self._stroke)
+            del self._strokes[:-self.limit]
+        self._stroke = []
+
+    def undo(self) -> List[Tuple[int, int, bool]]:
+        """
+        Take the last stroke off the stack.
+
+        Returns:
+        - List[Tuple[int, int, bool]]: (row, col, barrier) states to restore,
+        empty if there is nothing to undo.
+        """
+        self.end_stroke()
+        if not self._strokes:
+            return []
+        return self._strokes.pop()
+
+    def clear(self) -> None:
+        """
+        Forget every stroke, e.g. after the whole map was replaced.
+        """
+        self._strokes = []
+        self._stroke = []
@@ -0,0 +1,290 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple
+import pygame
+from algorithms import ALGORITHMS
+from live import SearchCancelled
+from recorder import SearchRecorder, make_recording_grid
+from spot import Spot, colors
+
+
+STATE_COLORS = {
+    "open": colors["green"],
+    "closed": colors["red"],
+    "path": colors["purple"],
+}
+STATS_HEIGHT = 66
+
+
+def run_recorded(
+    algorithm: str,
+    grid: List[List[Spot]],
+    start: Spot,
+    end: Spot,
+    stop: Optional[threading.Event] = None,
+) -> SearchRecorder:
+    """
+    Run an algorithm on a private copy of the grid and record every step.
+
+    Parameters:
+    - algorithm (str): The name of the algorithm in `ALGORITHMS`.
+    - grid (List[List[Spot]]): The grid to search. It is not modified.
+    - start (Spot): The starting spot in `grid`.
+    - end (Spot): The end spot in `grid`.
+    - stop (Optional[threading.Event]): If given, the search ends at its
+    next step once the event is set.
+
+    Returns:
+    - SearchRecorder: The recording of the run, unfinished if it was
+    stopped.
+    """
+    recorder = SearchRecorder()
+    copy = make_recording_grid(grid, recorder)
+    start_row, start_col = start.get_pos()
+    end_row, end_col = end.get_pos()
+
+    def tick() -> None:
+        if stop is not None and stop.is_set():
+            raise SearchCancelled
+        recorder.tick()
+
+    recorder.start()
+    try:
+        found = ALGORITHMS[algorithm](
+            tick,
+            copy,
+            copy[start_row][start_col],
+            copy[end_row][end_col],
+        )
+    except SearchCancelled:
+        return recorder
+    recorder.finish(found)
+    return recorder
+
+
+class Panel:
+    """
+    One algorithm's view in comparison mode, replaying a recorded run.
+
+    Parameters:
+    - name (str): The algorithm name shown in the panel.
+    - grid (List[List[Spot]]): The grid the run was recorded on, used for
+    the initial colours.
+    - recorder (SearchRecorder): The recorded run.
+    - rect (Tuple[int, int, int]): The (x, y, size) of the panel's grid area
+    in the window.
+    """
+    def __init__(
+        self,
+        name: str,
+        grid: List[List[Spot]],
+        recorder: SearchRecorder,
+        rect: Tuple[int, int, int],
+    ) -> None:
+        self.name = name
+        self.recorder = recorder
+        self.x, self.y, self.size = rect
+        self.rows = len(grid)
+        self.gap = max(self.size // max(self.rows, 1), 1)
+        self.cells = [[spot.color for spot in row] for row in grid]
+        self.cursor = 0
+        self.step = 0
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the replay has reached the end of the recording.
+
+        Returns:
+        - bool: True once every recorded event has been shown.
+        """
+        return self.step > self.recorder.steps
+
+    def advance_to(self, step: int) -> None:
+        """
+        Apply every recorded event that happened before the given step.
+
+        Parameters:
+        - step (int): The number of completed search steps to show.
+        """
+        events = self.recorder.events
+        self.step = max(self.step, step)
+        while (
+            self.cursor < len(events)
+            and events[self.cursor][0] < self.step
+        ):
+            _, row, col, state = events[self.cursor]
+            self.cells[row][col] = STATE_COLORS[state]
+            self.cursor += 1
+
+    def draw(
+        self,
+        win: pygame.Surface,
+        font: pygame.font.Font,
+    ) -> None:
+        """
+        Draw the panel's grid and statistics.
+
+        Parameters:
+        - win (pygame.Surface): The pygame window surface to draw on.
+        - font (pygame.font.Font): The font used for the statistics.
+        """
+        gap = self.gap
+        for i, row in enumerate(self.cells):
+            for j, color in enumerate(row):
+                pygame.draw.rect(
+                    win, color, (self.x + i * gap, self.y + j * gap, gap, gap)
+                )
+        pygame.draw.rect(
+            win,
+            colors["grey"],
+            (self.x, self.y, gap * self.rows, gap * self.rows),
+            1,
+        )
+
+        recorder = self.recorder
+        expansions = min(self.step, recorder.expansions)
+        if not self.done:
+            cost = "..."
+        elif recorder.found:
+            cost = str(recorder.path_cost)
+        else:
+            cost = "no path"
+        lines = [
+            self.name,
+            f"Expansions: {expansions}",
+            f"CPU time: {recorder.compute_time * 1000:.1f} ms",
+            f"Path cost: {cost}",
+        ]
+        text_y = self.y + gap * self.rows + 2
+        for line in lines:
+            win.blit(font.render(line, True, colors["black"]),
+                     (self.x + 2, text_y))
+            text_y += font.get_linesize()
+
+
+def layout_panels(
+    count: int,
+    width: int,
+) -> List[Tuple[int, int, int]]:
+    """
+    Split a square window into one panel per algorithm, leaving room for the
+    statistics below each panel's grid.
+
+    Parameters:
+    - count (int): The number of panels.
+    - width (int): The width of the window in pixels.
+
+    Returns:
+    - List[Tuple[int, int, int]]: The (x, y, size) of each panel's grid area.
+    """
+    per_row = math.ceil(math.sqrt(count))
+    cell = width // per_row
+    size = max(cell - STATS_HEIGHT, cell // 2)
+    return [
+        ((i % per_row) * cell, (i // per_row) * cell, size)
+        for i in range(count)
+    ]
+
+
+def run_comparison(
+    grid: List[List[Spot]],
+    width: int,
+    win: pygame.Surface,
+    algorithms: List[str],
+    start: Spot,
+    end: Spot,
+    lockstep: str = "steps",
+    steps_per_frame: int = 1,
+    duration: float = 10.0,
+    fps: int = 60,
+) -> bool:
+    """
+    Run several algorithms on the same grid at once and replay them side by
+    side.
+
+    The searches run concurrently on a thread pool, each on its own copy of
+    the grid, and are recorded. The recordings are then replayed in one
+    panel per algorithm, advancing in lockstep either by step count or by
+    CPU time. Each search's CPU time is measured on its own thread, so the
+    searches sharing the pool and the GIL do not count each other's work,
+    which wall-clock time would.
+
+    Parameters:
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing the
+    grid. It is not modified.
+    - width (int): The width of the window in pixels.
+    - win (pygame.Surface): The pygame window surface to draw on.
+    - algorithms (List[str]): The names of the algorithms to compare.
+    - start (Spot): The starting spot.
+    - end (Spot): The end spot.
+    - lockstep (str): 'steps' to advance every panel by the same number of
+    search steps per frame, or 'time' to advance them by the same amount of
+    thread CPU time.
+    - steps_per_frame (int): Search steps shown per frame in 'steps' mode.
+    - duration (float): Seconds the run with the most CPU time takes to
+    replay in 'time' mode.
+    - fps (int): The replay frame rate.
+
+    Returns:
+    - bool: False if the user closed the window, True otherwise.
+    """
+    font = pygame.font.SysFont("Arial", 14)
+
+    # not a `with` block: leaving one waits for every search to finish
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=len(algorithms))
+    futures = [
+        pool.submit(run_recorded, algorithm, grid, start, end, stop)
+        for algorithm in algorithms
+    ]
+    while not all(future.done() for future in futures):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                stop.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                return False
+        wait(futures, timeout=1 / fps)
+    pool.shutdown()
+    recorders = [future.result() for future in futures]
+
+    panels = [
+        Panel(name, grid, recorder, rect)
+        for name, recorder, rect in zip(
+            algorithms, recorders, layout_panels(len(algorithms), width)
+        )
+    ]
+    slowest = max(recorder.compute_time for recorder in recorders)
+    time_scale = slowest / duration if slowest > 0 else 1.0
+
+    clock = pygame.time.Clock()
+    replay_start = time.perf_counter()
+    step = 0
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                return True
+
+        step += steps_per_frame
+        # wall-clock replay time mapped onto the searches' CPU time
+        compute_time = (time.perf_counter() - replay_start) * time_scale
+        for panel in panels:
+            if lockstep == "time":
+                if compute_time >= panel.recorder.compute_time:
+                    panel.advance_to(panel.recorder.steps + 1)
+                else:
+                    panel.advance_to(
+                        panel.recorder.step_at_time(compute_time)
+                    )
+            else:
+                panel.advance_to(step)
+
+        win.fill(colors["white"])
+        for panel in panels:
+            panel.draw(win, font)
+        pygame.display.update()
+        clock.tick(fps)
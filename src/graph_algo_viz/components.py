@@ -0,0 +1,324 @@
+import re
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+from gridmap import GridMap
+
+
+# runs of passable cells in a row of one-byte cells
+_PASSABLE_RUN = re.compile(b"\x00+")
+# batches changing more than this share of the cells are relabelled from
+# scratch, which costs about as much as updating one cell in a hundred
+REBUILD_SHARE = 0.01
+
+
+class ComponentIndex:
+    """
+    Connected-component labels for the passable cells of a GridMap, kept up
+    to date as barriers are painted or erased.
+
+    Every passable cell points at a node of a union-find forest and two
+    cells are connected exactly when their nodes share a root, so
+    `connected` answers in near-constant time. Erasing a barrier adds a
+    node and unions it with its neighbors. Painting a barrier may split a
+    component; searches started from the cell's neighbors run in lockstep
+    until at most one of them is still growing, and only the pieces that
+    closed off are relabelled, so the cost is bounded by the smaller side.
+
+    Components are 4-connected, which also holds for 8-connected searches
+    that may not cut corners.
+
+    Parameters:
+    - gmap (GridMap): The map to index. Use `set_barrier` on the index,
+    not on the map, to keep both in sync.
+    """
+    def __init__(self, gmap: GridMap) -> None:
+        self.gmap = gmap
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Label every passable cell from scratch.
+
+        Runs of passable cells are found row by row and unioned with the
+        overlapping runs of the row above, so the work grows with the number
+        of runs rather than the number of cells.
+        """
+        gmap = self.gmap
+        cells = bytes(gmap.cells)
+        cols = gmap.cols
+        self.labels = array("l", [-1]) * len(gmap)
+        self.parent: List[int] = []
+        labels = self.labels
+        parent = self.parent
+
+        previous_runs: List = []
+        for row in range(gmap.rows):
+            base = row * cols
+            runs = []
+            for match in _PASSABLE_RUN.finditer(cells, base, base + cols):
+                start, end = match.span()
+                node = len(parent)
+                parent.append(node)
+                labels[start:end] = array("l", [node]) * (end - start)
+                runs.append((start - base, end - base, node))
+
+            # union with overlapping runs of the previous row
+            i = 0
+            for start, end, node in runs:
+                while i < len(previous_runs) and previous_runs[i][1] <= start:
+                    i += 1
+                j = i
+                while j < len(previous_runs) and previous_runs[j][0] < end:
+                    self._union(node, previous_runs[j][2])
+                    j += 1
+            previous_runs = runs
+
+    @classmethod
+    def from_labels(
+        cls,
+        gmap: GridMap,
+        labels: Sequence[int],
+        count: int,
+    ) -> "ComponentIndex":
+        """
+        Wrap labels from `root_labels` without labelling the map again, e.g.
+        labels that other processes share.
+
+        Parameters:
+        - gmap (GridMap): The map the labels belong to.
+        - labels (Sequence[int]): The component of every cell, -1 for
+        barriers. Edits to the index write to it.
+        - count (int): The number of components.
+
+        Returns:
+        - ComponentIndex: The index.
+        """
+        index = cls.__new__(cls)
+        index.gmap = gmap
+        index.labels = labels
+        index.parent = list(range(count))
+        return index
+
+    def root_labels(self) -> Tuple[array, int]:
+        """
+        Number the components from 0 and label every cell with its
+        component, so that each label is its own union-find root.
+
+        Returns:
+        - Tuple[array, int]: The label per cell ('l' typecode, -1 for
+        barriers) and the number of components.
+        """
+        numbers: Dict[int, int] = {}
+        labels = array("l", [-1]) * len(self.gmap)
+        for index, label in enumerate(self.labels):
+            if label != -1:
+                labels[index] = numbers.setdefault(self._find(label),
+                                                   len(numbers))
+        return labels, len(numbers)
+
+    def _find(self, node: int) -> int:
+        """
+        Find the root of a union-find node, compressing the path.
+        """
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _union(self, a: int, b: int) -> None:
+        """
+        Join the sets of two union-find nodes.
+        """
+        root_a = self._find(a)
+        root_b = self._find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def _new_node(self) -> int:
+        """
+        Add a fresh union-find node in a set of its own.
+        """
+        node = len(self.parent)
+        self.parent.append(node)
+        return node
+
+    def component(self, index: int) -> int:
+        """
+        Get the component id of a cell.
+
+        Parameters:
+        - index (int): The cell index.
+
+        Returns:
+        - int: The component id, or -1 for a barrier. Ids change as the map
+        is edited; only compare ids taken between edits.
+        """
+        label = self.labels[index]
+        return -1 if label == -1 else self._find(label)
+
+    def connected(self, a: int, b: int) -> bool:
+        """
+        Check if two cells can reach each other.
+
+        Parameters:
+        - a (int): The first cell index.
+        - b (int): The second cell index.
+
+        Returns:
+        - bool: True if both cells are passable and in the same component.
+        """
+        label_a = self.labels[a]
+        label_b = self.labels[b]
+        if label_a == -1 or label_b == -1:
+            return False
+        return self._find(label_a) == self._find(label_b)
+
+    def _passable_neighbors(self, index: int) -> List[int]:
+        """
+        List the passable 4-neighbors of a cell.
+        """
+        gmap = self.gmap
+        cells = gmap.cells
+        cols = gmap.cols
+        col = index % cols
+        result = []
+        if index >= cols and not cells[index - cols]:
+            result.append(index - cols)
+        if index + cols < len(cells) and not cells[index + cols]:
+            result.append(index + cols)
+        if col > 0 and not cells[index - 1]:
+            result.append(index - 1)
+        if col < cols - 1 and not cells[index + 1]:
+            result.append(index + 1)
+        return result
+
+    def set_barrier(self, row: int, col: int, barrier: bool = True) -> None:
+        """
+        Make a cell a barrier or passable, updating the map and the labels.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - col (int): The column of the cell.
+        - barrier (bool): True to make a barrier, False to clear it.
+        """
+        index = self.gmap.index(row, col)
+        if bool(self.gmap.cells[index]) == barrier:
+            return
+        self.gmap.cells[index] = 1 if barrier else 0
+        if barrier:
+            self._remove(index)
+        else:
+            self._add(index)
+
+        if len(self.parent) > 2 * len(self.gmap) + 1024:
+            self.rebuild()
+
+    def set_barriers(
+        self,
+        cells: Iterable[Tuple[int, int]],
+        barrier: bool = True,
+    ) -> None:
+        """
+        Make many cells barriers or passable at once, e.g. a brush stroke.
+
+        Small batches update the labels cell by cell; large ones write the
+        map first and relabel it once.
+
+        Parameters:
+        - cells (Iterable[Tuple[int, int]]): (row, col) of the cells.
+        - barrier (bool): True to make barriers, False to clear them.
+        """
+        gmap = self.gmap
+        changed = [
+            (row, col) for row, col in cells
+            if bool(gmap.cells[gmap.index(row, col)]) != barrier
+        ]
+        if len(changed) <= REBUILD_SHARE * len(gmap):
+            for row, col in changed:
+                self.set_barrier(row, col, barrier)
+            return
+        for row, col in changed:
+            gmap.cells[gmap.index(row, col)] = 1 if barrier else 0
+        self.rebuild()
+
+    def _add(self, index: int) -> None:
+        """
+        Label a cell that just became passable, merging the components
+        around it.
+        """
+        node = self._new_node()
+        self.labels[index] = node
+        for neighbor in self._passable_neighbors(index):
+            self._union(node, self.labels[neighbor])
+
+    def _remove(self, index: int) -> None:
+        """
+        Unlabel a cell that just became a barrier and split its component if
+        the cell was the only link between its neighbors.
+        """
+        self.labels[index] = -1
+        starts = self._passable_neighbors(index)
+        if len(starts) < 2:
+            return
+
+        # one search per neighbor; searches that touch merge into a group
+        group = list(range(len(starts)))
+
+        def root(search: int) -> int:
+            while group[search] != search:
+                search = group[search]
+            return search
+
+        owner: Dict[int, int] = {}
+        visited: List[List[int]] = [[start] for start in starts]
+        frontiers = [deque([start]) for start in starts]
+        for search, start in enumerate(starts):
+            if start in owner:
+                group[root(search)] = root(owner[start])
+            else:
+                owner[start] = search
+
+        while True:
+            roots = {root(search) for search in range(len(starts))}
+            if len(roots) == 1:
+                return  # still one component
+            growing = {
+                root(search)
+                for search, frontier in enumerate(frontiers)
+                if frontier
+            }
+            if len(growing) <= 1:
+                break
+
+            for search, frontier in enumerate(frontiers):
+                if not frontier:
+                    continue
+                current = frontier.popleft()
+                for neighbor in self._passable_neighbors(current):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        visited[search].append(neighbor)
+                        frontier.append(neighbor)
+                    elif root(other) != root(search):
+                        group[root(search)] = root(other)
+
+        # relabel every closed-off piece, leaving the still-growing (or, if
+        # all closed, the largest) piece on the old labels
+        pieces: Dict[int, List[int]] = {}
+        for search in range(len(starts)):
+            pieces.setdefault(root(search), []).extend(visited[search])
+        if growing:
+            keep = growing.pop()
+        else:
+            keep = max(pieces, key=lambda piece: len(pieces[piece]))
+        for piece, piece_cells in pieces.items():
+            if piece == keep:
+                continue
+            node = self._new_node()
+            for cell in piece_cells:
+                self.labels[cell] = node
@@ -0,0 +1,248 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+from array import array
+from typing import Optional, Tuple
+from graph import SEARCHES, Graph
+
+
+CACHE_MAGIC = b"CSR1"
+# magic, node count, edge count, source size, source mtime, heuristic
+# scale, flags; padded so the arrays that follow stay 8-byte aligned
+CACHE_HEADER = struct.Struct("<4s4xQQQqdB7x")
+DIRECTED = 1
+HAS_COORDS = 2
+
+
+def read_dimacs_graph(
+    gr_path: str,
+    co_path: Optional[str] = None,
+) -> Graph:
+    """
+    Parse a DIMACS shortest-path graph, streaming it line by line.
+
+    '.gr' files hold a 'p sp <nodes> <arcs>' header and one 'a <u> <v> <w>'
+    line per directed arc, with nodes numbered from 1; '.co' files hold one
+    'v <id> <x> <y>' line per node. Lines are read one at a time straight
+    into typed arrays, so the text is never held in memory as a whole.
+
+    Parameters:
+    - gr_path (str): The '.gr' file.
+    - co_path (Optional[str]): The matching '.co' file, if any.
+
+    Returns:
+    - Graph: The directed graph, with nodes numbered from 0.
+    """
+    node_count = 0
+    sources = array("i")
+    targets = array("i")
+    weights = array("d")
+    with open(gr_path, "rb") as f:
+        for line in f:
+            tag = line[:1]
+            if tag == b"a":
+                _, u, v, w = line.split()
+                sources.append(int(u) - 1)
+                targets.append(int(v) - 1)
+                weights.append(float(w))
+            elif tag == b"p":
+                node_count = int(line.split()[2])
+
+    coords = None
+    if co_path is not None:
+        coords = array("d", [0.0]) * (2 * node_count)
+        with open(co_path, "rb") as f:
+            for line in f:
+                if line[:1] == b"v":
+                    _, node, x, y = line.split()
+                    index = 2 * (int(node) - 1)
+                    coords[index] = float(x)
+                    coords[index + 1] = float(y)
+
+    return Graph.from_edges(node_count, sources, targets, weights,
+                            directed=True, coords=coords)
+
+
+def cache_path(gr_path: str) -> str:
+    """
+    Get the path of the binary cache stored next to a DIMACS graph.
+
+    Parameters:
+    - gr_path (str): The '.gr' file.
+
+    Returns:
+    - str: The cache's file path.
+    """
+    return f"{gr_path}.csr"
+
+
+def source_stamp(*paths: Optional[str]) -> Tuple[int, int]:
+    """
+    Get the combined size and latest modification time of source files,
+    used to tell whether a cache is out of date.
+
+    Parameters:
+    - *paths (Optional[str]): The source files; None entries are skipped.
+
+    Returns:
+    - Tuple[int, int]: The total size in bytes and the latest mtime in
+    nanoseconds.
+    """
+    stats = [os.stat(path) for path in paths if path is not None]
+    return (sum(stat.st_size for stat in stats),
+            max(stat.st_mtime_ns for stat in stats))
+
+
+def _padded(size: int) -> int:
+    """
+    Round a byte count up to a multiple of 8.
+    """
+    return (size + 7) & ~7
+
+
+def save_graph_cache(
+    graph: Graph,
+    path: str,
+    stamp: Tuple[int, int] = (0, 0),
+) -> None:
+    """
+    Write a graph's adjacency arrays to a binary cache file.
+
+    Parameters:
+    - graph (Graph): The graph. Labels are not stored.
+    - path (str): The file path.
+    - stamp (Tuple[int, int]): The `source_stamp` of the files the graph was
+    read from.
+    """
+    flags = (DIRECTED if graph.directed else 0) | (
+        HAS_COORDS if graph.coords is not None else 0
+    )
+    targets = graph.targets.tobytes()
+    with open(path, "wb") as f:
+        f.write(CACHE_HEADER.pack(
+            CACHE_MAGIC, graph.node_count, graph.edge_count, stamp[0],
+            stamp[1], graph.heuristic_scale(), flags,
+        ))
+        f.write(graph.offsets.tobytes())
+        f.write(targets)
+        f.write(bytes(_padded(len(targets)) - len(targets)))
+        f.write(graph.weights.tobytes())
+        if graph.coords is not None:
+            f.write(graph.coords.tobytes())
+
+
+def load_graph_cache(
+    path: str,
+    stamp: Optional[Tuple[int, int]] = None,
+) -> Optional[Graph]:
+    """
+    Memory-map a cache written by `save_graph_cache`.
+
+    The graph's arrays are memoryviews of the mapped file, so loading costs
+    no parsing or copying and pages are read from disk only as searches
+    touch them.
+
+    Parameters:
+    - path (str): The file path.
+    - stamp (Optional[Tuple[int, int]]): If given, the `source_stamp` the
+    cache must have been written with.
+
+    Returns:
+    - Optional[Graph]: The graph, or None if the file is missing, malformed
+    or out of date.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) < CACHE_HEADER.size:
+        return None
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    (magic, node_count, edge_count, size, mtime, scale,
+     flags) = CACHE_HEADER.unpack_from(buffer)
+    if magic != CACHE_MAGIC or (stamp is not None and (size, mtime) != stamp):
+        buffer.close()
+        return None
+
+    sections = [("q", 8 * (node_count + 1)), ("i", 4 * edge_count),
+                ("d", 8 * edge_count)]
+    if flags & HAS_COORDS:
+        sections.append(("d", 16 * node_count))
+    expected = CACHE_HEADER.size + sum(_padded(n) for _, n in sections)
+    if expected != len(buffer):
+        buffer.close()
+        return None
+
+    view = memoryview(buffer)
+    arrays = []
+    position = CACHE_HEADER.size
+    for typecode, length in sections:
+        arrays.append(view[position:position + length].cast(typecode))
+        position += _padded(length)
+    coords = arrays[3] if flags & HAS_COORDS else None
+    return Graph(arrays[0], arrays[1], arrays[2], coords=coords,
+                 directed=bool(flags & DIRECTED), heuristic_scale=scale)
+
+
+def load_dimacs_cached(
+    gr_path: str,
+    co_path: Optional[str] = None,
+) -> Graph:
+    """
+    Load a DIMACS graph from its binary cache, parsing the text files and
+    writing the cache first when it is missing or older than them.
+
+    Parameters:
+    - gr_path (str): The '.gr' file; the cache lives in '<gr_path>.csr'.
+    - co_path (Optional[str]): The matching '.co' file, if any.
+
+    Returns:
+    - Graph: The graph.
+    """
+    stamp = source_stamp(gr_path, co_path)
+    path = cache_path(gr_path)
+    graph = load_graph_cache(path, stamp)
+    if graph is None:
+        save_graph_cache(read_dimacs_graph(gr_path, co_path), path, stamp)
+        graph = load_graph_cache(path, stamp)
+    return graph
+
+
+if __name__ == "__main__":
+    """
+    Load a DIMACS road network and time random queries, e.g.
+
+        python dimacs.py USA-road-d.NY.gr -co USA-road-d.NY.co -queries 20
+    """
+    parser = argparse.ArgumentParser(description="DIMACS road networks")
+    parser.add_argument("gr", help="DIMACS '.gr' file")
+    parser.add_argument("-co", default=None, help="DIMACS '.co' file")
+    parser.add_argument("-algo", nargs="+", choices=["dijkstra", "a_star"],
+                        default=["dijkstra", "a_star"], help="Algorithms")
+    parser.add_argument("-queries", type=int, default=10,
+                        help="Random queries per algorithm")
+    parser.add_argument("-seed", type=int, default=0, help="Query seed")
+    args = parser.parse_args()
+
+    cached = load_graph_cache(cache_path(args.gr),
+                              source_stamp(args.gr, args.co)) is not None
+    t0 = time.perf_counter()
+    graph = load_dimacs_cached(args.gr, args.co)
+    print(f"{graph.node_count} nodes, {graph.edge_count} arcs loaded in "
+          f"{time.perf_counter() - t0:.3f}s "
+          f"({'mapped cache' if cached else 'parsed, cache written'})")
+
+    rng = random.Random(args.seed)
+    queries = [(rng.randrange(graph.node_count),
+                rng.randrange(graph.node_count)) for _ in range(args.queries)]
+    for algorithm in args.algo:
+        if not queries:
+            break
+        expansions = 0
+        seconds = 0.0
+        for start, goal in queries:
+            result = SEARCHES[algorithm](graph, start, goal)
+            expansions += result.expansions
+            seconds += result.seconds
+        print(f"  {algorithm:>10}: {seconds / len(queries) * 1000:9.1f} ms "
+              f"per query, {expansions // len(queries)} expansions")
@@ -0,0 +1,498 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, List, Optional, Sequence, Tuple
+from algorithms import ALGORITHMS
+from benchmark import endpoints
+from compare import run_recorded
+from generators import GENERATORS, generate
+from gridmap import grid_from_map
+from recorder import SearchRecorder
+from spot import Spot, colors
+
+
+# the colour table shared by every exported image; cells are stored as
+# indices into it
+PALETTE = ["white", "black", "green", "red", "purple", "orange", "turquoise",
+           "grey"]
+PALETTE_BYTES = b"".join(bytes(colors[name]) for name in PALETTE)
+STATE_INDEX = {"open": 2, "closed": 3, "path": 4}
+GRID_LINE = PALETTE.index("grey")
+# the GIF colour table has a spare entry marking pixels a frame leaves as
+# they were
+TRANSPARENT = len(PALETTE)
+GIF_PALETTE_BYTES = PALETTE_BYTES + bytes(3 * (16 - len(PALETTE)))
+# cells narrower than this are drawn without grid lines
+MIN_LINE_CELL = 4
+# GIF frame delays are in hundredths of a second
+FINAL_FRAME_DELAY = 200
+# a frame: (row, col, palette index) per cell changed since the last one
+Frame = List[Tuple[int, int, int]]
+
+
+def initial_state(grid: List[List[Spot]]) -> bytearray:
+    """
+    Get the palette index of every cell of a grid before a search runs.
+
+    Cells are stored column by column, so that like `Spot`s the row runs
+    along x and each image line is one contiguous slice.
+
+    Parameters:
+    - grid (List[List[Spot]]): The square grid.
+
+    Returns:
+    - bytearray: The palette index of cell (row, col) at col * rows + row.
+    """
+    index = {colors[name]: i for i, name in enumerate(PALETTE)}
+    rows = len(grid)
+    state = bytearray(rows * rows)
+    for row in grid:
+        for spot in row:
+            state[spot.col * rows + spot.row] = index.get(spot.color, 0)
+    return state
+
+
+def split_frames(
+    recorder: SearchRecorder,
+    steps_per_frame: int,
+    keep: Collection[Tuple[int, int]] = (),
+) -> List[Frame]:
+    """
+    Group a recording's events into frames of `steps_per_frame` search
+    steps. The first frame is the grid before the search and holds no
+    changes; the last one holds everything left, including the path.
+
+    Parameters:
+    - recorder (SearchRecorder): The recorded run.
+    - steps_per_frame (int): Search steps per frame.
+    - keep (Collection[Tuple[int, int]]): (row, col) of cells whose colour
+    the search does not change, such as the start and end, like
+    `mark_ends` keeps them in the window.
+
+    Returns:
+    - List[Frame]: The changes shown by each frame.
+    """
+    events = recorder.events
+    steps = [event[0] for event in events]
+    frame_count = max(1, -(-recorder.steps // steps_per_frame))
+    bounds = [0]
+    for frame in range(1, frame_count):
+        bounds.append(bisect_left(steps, frame * steps_per_frame))
+    bounds.append(len(events))
+    return [[]] + [
+        [(row, col, STATE_INDEX[state])
+         for _, row, col, state in events[lo:hi] if (row, col) not in keep]
+        for lo, hi in zip(bounds, bounds[1:])
+    ]
+
+
+def rasterize(
+    state: Sequence[int],
+    rows: int,
+    cell: int,
+    box: Optional[Tuple[int, int, int, int]] = None,
+) -> bytes:
+    """
+    Draw cells into palette-indexed pixels, one byte per pixel, with grid
+    lines like `draw_grid` when cells are wide enough. `TRANSPARENT` cells
+    are drawn without grid lines.
+
+    Each distinct cell colour is drawn once as a pixel span, and each image
+    line is built once and repeated for the height of its cells.
+
+    Parameters:
+    - state (Sequence[int]): The cells, laid out as by `initial_state`.
+    - rows (int): The number of rows (and columns) of the grid.
+    - cell (int): The cell width in pixels.
+    - box (Optional[Tuple[int, int, int, int]]): The first and past-the-end
+    row and the first and past-the-end column to draw (default: all).
+
+    Returns:
+    - bytes: The pixels of the box, line by line.
+    """
+    row0, row1, col0, col1 = box or (0, rows, 0, rows)
+    lines = cell >= MIN_LINE_CELL
+    spans = [bytes((i,)) * cell for i in range(TRANSPARENT + 1)]
+    if lines:
+        rules = [bytes((GRID_LINE,)) * cell] * TRANSPARENT + [
+            spans[TRANSPARENT]
+        ]
+        spans = [bytes((GRID_LINE,)) + bytes((i,)) * (cell - 1)
+                 for i in range(TRANSPARENT)] + [spans[TRANSPARENT]]
+    out = []
+    for col in range(col0, col1):
+        base = col * rows
+        cells = state[base + row0:base + row1]
+        line = b"".join([spans[i] for i in cells])
+        if lines:
+            out.append(b"".join([rules[i] for i in cells]))
+            out.extend([line] * (cell - 1))
+        else:
+            out.extend([line] * cell)
+    return b"".join(out)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    """
+    Frame one PNG chunk with its length and CRC.
+    """
+    return (struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data)))
+
+
+def encode_png(
+    pixels: bytes,
+    width: int,
+    height: int,
+) -> bytes:
+    """
+    Encode palette-indexed pixels as an 8-bit paletted PNG.
+
+    Parameters:
+    - pixels (bytes): One `PALETTE` index per pixel, line by line.
+    - width (int): The image width in pixels.
+    - height (int): The image height in pixels.
+
+    Returns:
+    - bytes: The PNG file.
+    """
+    # every line gets filter type 0, i.e. stored as is
+    raw = b"".join(b"\x00" + pixels[y * width:(y + 1) * width]
+                   for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8,
+                                              3, 0, 0, 0))
+            + _png_chunk(b"PLTE", PALETTE_BYTES)
+            + _png_chunk(b"IDAT", zlib.compress(raw, 6))
+            + _png_chunk(b"IEND", b""))
+
+
+def lzw_encode(
+    pixels: bytes,
+    min_code_size: int = 3,
+) -> bytes:
+    """
+    Compress pixels with GIF's variable-width LZW and split the result into
+    data sub-blocks.
+
+    Parameters:
+    - pixels (bytes): Palette indices below 2 ** `min_code_size`; at least
+    one pixel.
+    - min_code_size (int): The LZW minimum code size.
+
+    Returns:
+    - bytes: The sub-blocks, ending with the empty block.
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    code_size = min_code_size + 1
+    limit = 1 << code_size
+    table = {bytes((i,)): i for i in range(clear)}
+    next_code = end + 1
+    out = bytearray()
+    bits = 0
+    bit_count = 0
+
+    def emit(code: int) -> None:
+        nonlocal bits, bit_count, code_size, limit
+        bits |= code << bit_count
+        bit_count += code_size
+        while bit_count >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            bit_count -= 8
+        # widen codes once the table has outgrown them
+        if next_code > limit - 1 and code_size < 12:
+            code_size += 1
+            limit <<= 1
+
+    emit(clear)
+    i = 0
+    n = len(pixels)
+    while i < n:
+        # every prefix of a table string is in the table too, so the
+        # longest match is found by doubling and then bisecting its length
+        # rather than by walking it one pixel at a time
+        found = 1
+        missing = 2
+        while i + missing <= n and pixels[i:i + missing] in table:
+            found = missing
+            missing *= 2
+        missing = min(missing, n - i + 1)
+        while missing - found > 1:
+            middle = (found + missing) // 2
+            if pixels[i:i + middle] in table:
+                found = middle
+            else:
+                missing = middle
+        emit(table[pixels[i:i + found]])
+        if i + found < n:
+            if next_code < 4096:
+                table[pixels[i:i + found + 1]] = next_code
+                next_code += 1
+            else:
+                # the table is full: start over with narrow codes
+                emit(clear)
+                table = {bytes((j,)): j for j in range(clear)}
+                next_code = end + 1
+                code_size = min_code_size + 1
+                limit = 1 << code_size
+        i += found
+    emit(end)
+    if bit_count:
+        out.append(bits & 0xFF)
+
+    blocks = bytearray()
+    for i in range(0, len(out), 255):
+        block = out[i:i + 255]
+        blocks.append(len(block))
+        blocks += block
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def gif_header(
+    width: int,
+    height: int,
+) -> bytes:
+    """
+    Get the start of an endlessly looping GIF using `PALETTE` and
+    `TRANSPARENT`.
+
+    Parameters:
+    - width (int): The image width in pixels.
+    - height (int): The image height in pixels.
+
+    Returns:
+    - bytes: The header, colour table and looping extension.
+    """
+    # global colour table of 2 ** (3 + 1) entries, 8 bits per channel
+    return (b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF3, 0, 0)
+            + GIF_PALETTE_BYTES
+            + b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+
+def gif_frame(
+    pixels: bytes,
+    left: int,
+    top: int,
+    width: int,
+    height: int,
+    delay: int,
+) -> bytes:
+    """
+    Encode one GIF frame covering part of the image. Frames are drawn over
+    the previous ones, so a frame only needs the area that changed, and
+    `TRANSPARENT` pixels within it keep the colour they had.
+
+    Parameters:
+    - pixels (bytes): The frame's palette indices, line by line.
+    - left (int): The frame's x offset in pixels.
+    - top (int): The frame's y offset in pixels.
+    - width (int): The frame width in pixels.
+    - height (int): The frame height in pixels.
+    - delay (int): How long the frame is shown, in hundredths of a second.
+
+    Returns:
+    - bytes: The control extension, image descriptor and image data.
+    """
+    # kept in place for the next frame, with a transparent colour
+    return (b"!\xf9\x04" + struct.pack("<BHB", 0x05, delay, TRANSPARENT)
+            + b"\x00" + b"," + struct.pack("<HHHHB", left, top, width, height,
+                                           0)
+            + b"\x04" + lzw_encode(pixels, 4))
+
+
+def _render_chunk(
+    state: bytes,
+    rows: int,
+    cell: int,
+    frames: List[Frame],
+    first: int,
+    fmt: str,
+    output: str,
+    delay: int,
+) -> List[bytes]:
+    """
+    Replay and encode a run of consecutive frames, starting from the cells
+    as they were before the first of them.
+    """
+    state = bytearray(state)
+    size = rows * cell
+    # the cells changed by the current GIF frame, the rest transparent
+    changes = bytearray((TRANSPARENT,)) * len(state)
+    encoded = []
+    for number, frame in enumerate(frames, first):
+        for row, col, index in frame:
+            state[col * rows + row] = index
+        if fmt == "png":
+            with open(os.path.join(output, f"frame_{number:05d}.png"),
+                      "wb") as f:
+                f.write(encode_png(rasterize(state, rows, cell), size, size))
+            continue
+        if number == 0:
+            encoded.append(gif_frame(rasterize(state, rows, cell), 0, 0, size,
+                                     size, delay))
+            continue
+        if not frame:
+            encoded.append(gif_frame(bytes((TRANSPARENT,)), 0, 0, 1, 1,
+                                     delay))
+            continue
+        # only the bounding box of the changed cells is stored
+        for row, col, index in frame:
+            changes[col * rows + row] = index
+        frame_rows = [row for row, _, _ in frame]
+        frame_cols = [col for _, col, _ in frame]
+        box = (min(frame_rows), max(frame_rows) + 1, min(frame_cols),
+               max(frame_cols) + 1)
+        encoded.append(gif_frame(rasterize(changes, rows, cell, box),
+                                 box[0] * cell, box[2] * cell,
+                                 (box[1] - box[0]) * cell,
+                                 (box[3] - box[2]) * cell, delay))
+        for row, col, _ in frame:
+            changes[col * rows + row] = TRANSPARENT
+    return encoded
+
+
+def export_run(
+    recorder: SearchRecorder,
+    grid: List[List[Spot]],
+    output: str,
+    fmt: str = "gif",
+    steps_per_frame: int = 100,
+    cell: int = 8,
+    fps: int = 25,
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Export a recorded run as an animated GIF or a numbered PNG sequence,
+    without opening a window.
+
+    The cell states at the start of every chunk of frames are computed up
+    front, so chunks are rasterized and encoded independently on a process
+    pool and only stitched together in order.
+
+    Parameters:
+    - recorder (SearchRecorder): The recorded run.
+    - grid (List[List[Spot]]): The grid the run was recorded on.
+    - output (str): The GIF file, or the directory for 'frame_00000.png'
+    onwards, which is created if needed.
+    - fmt (str): 'gif' or 'png'.
+    - steps_per_frame (int): Search steps per frame.
+    - cell (int): The cell width in pixels.
+    - fps (int): GIF frames per second.
+    - workers (Optional[int]): The number of processes (default: CPU
+    count); 1 encodes in this process.
+
+    Returns:
+    - int: The number of frames written.
+    """
+    if fmt not in ("gif", "png"):
+        raise ValueError(f"Unknown format '{fmt}', choose 'gif' or 'png'")
+    rows = len(grid)
+    state = initial_state(grid)
+    ends = {spot.get_pos() for row in grid for spot in row
+            if spot.is_start() or spot.is_end()}
+    frames = split_frames(recorder, steps_per_frame, ends)
+    delay = max(2, round(100 / fps))
+    if fmt == "png":
+        os.makedirs(output, exist_ok=True)
+
+    chunk_count = 1 if workers == 1 else 4 * (workers or os.cpu_count() or 1)
+    chunk_size = -(-len(frames) // chunk_count)
+    tasks = []
+    for first in range(0, len(frames), chunk_size):
+        chunk = frames[first:first + chunk_size]
+        tasks.append((bytes(state), rows, cell, chunk, first, fmt, output,
+                      delay))
+        for frame in chunk:
+            for row, col, index in frame:
+                state[col * rows + row] = index
+
+    if workers == 1:
+        blocks = [block for task in tasks for block in _render_chunk(*task)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_chunk, *task) for task in tasks]
+            blocks = [block for future in futures
+                      for block in future.result()]
+
+    if fmt == "gif":
+        # hold the final frame so the path can be seen before looping
+        last = blocks[-1]
+        blocks[-1] = (last[:4] + struct.pack("<H", FINAL_FRAME_DELAY)
+                      + last[6:])
+        with open(output, "wb") as f:
+            f.write(gif_header(rows * cell, rows * cell))
+            f.writelines(blocks)
+            f.write(b";")
+    return len(frames)
+
+
+def arg_parse():
+    """
+    Parse command-line arguments for the exporter.
+
+    Returns:
+    - argparse.Namespace: An object containing the parsed command-line
+    arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export a search run as a GIF or PNG frames"
+    )
+    parser.add_argument("output", help="'.gif' file, or a directory for PNG "
+                        "frames")
+    parser.add_argument("-rows", type=int, default=100, help="Grid size")
+    parser.add_argument("-gen", choices=list(GENERATORS), default="maze",
+                        help="Map generator")
+    parser.add_argument("-seed", type=int, default=0, help="Map seed")
+    parser.add_argument("-algo", choices=list(ALGORITHMS), default="a_star",
+                        help="Algorithm")
+    parser.add_argument("-steps-per-frame", type=int, default=100,
+                        help="Search steps per frame")
+    parser.add_argument("-cell", type=int, default=8,
+                        help="Cell width in pixels")
+    parser.add_argument("-fps", type=int, default=25, help="GIF frame rate")
+    parser.add_argument("-workers", type=int, default=None,
+                        help="Encoding processes (default: CPU count)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    """
+    Record a run on a generated map and export it, e.g.
+
+        python export.py run.gif -rows 200 -gen maze -steps-per-frame 100
+        python export.py frames -rows 200 -algo dijkstra
+
+    A PNG sequence can be turned into a video with e.g.
+    'ffmpeg -framerate 30 -i frames/frame_%05d.png run.mp4'.
+    """
+    args = arg_parse()
+    gmap = generate(args.gen, args.rows, seed=args.seed)
+    ends = endpoints(gmap)
+    if ends is None:
+        raise SystemExit("The map has no free cells to search between")
+    grid = grid_from_map(gmap)
+    (start_row, start_col), (end_row, end_col) = (
+        gmap.pos(ends[0]), gmap.pos(ends[1])
+    )
+    start = grid[start_row][start_col]
+    end = grid[end_row][end_col]
+    start.make_start()
+    end.make_end()
+
+    t0 = time.perf_counter()
+    recorder = run_recorded(args.algo, grid, start, end)
+    t1 = time.perf_counter()
+    fmt = "gif" if args.output.lower().endswith(".gif") else "png"
+    frames = export_run(recorder, grid, args.output, fmt,
+                        args.steps_per_frame, args.cell, args.fps,
+                        args.workers)
+    t2 = time.perf_counter()
+    print(f"{recorder.steps} steps recorded in {t1 - t0:.2f}s, "
+          f"{frames} frames exported to {args.output} in {t2 - t1:.2f}s")
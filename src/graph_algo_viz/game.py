@@ -1,8 +1,39 @@
+import time
 import pygame
 from spot import Spot, colors
-from algorithms import a_star, bfs, dfs, dijkstra
-import time
-from typing import List
+from compare import run_comparison
+from components import ComponentIndex
+from algorithms import ALGORITHMS, MULTI_GOAL_ALGORITHMS
+from brush import (
+    BRUSH_MODES,
+    MAX_BRUSH_SIZE,
+    EditHistory,
+    flood_cells,
+    line_cells,
+    rect_cells,
+    stamp_cells,
+)
+from generators import generate
+from hud import Hud, get_font
+from gridmap import apply_to_grid, grid_edited, map_from_grid
+from live import LiveSearch
+from mapf import SOLVERS, random_agents
+from mapf_view import animate_agents, draw_agent_markers
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# number keys that fill the grid with a generated map
+GENERATOR_KEYS = {
+    pygame.K_1: "maze",
+    pygame.K_2: "division",
+    pygame.K_3: "random",
+    pygame.K_4: "caves",
+    pygame.K_5: "rooms",
+}
+# frame rate of the main loop
+FPS = 60
+# search steps shown per frame outside comparison mode
+SEARCH_STEPS_PER_FRAME = 4
 
 
 def make_grid(
@@ -30,6 +61,31 @@ def make_grid(
     return grid
 
 
+def fill_grid(
+    grid: List[List[Spot]],
+    rows: int,
+    generator: str,
+    seed: Optional[int] = None,
+    **options,
+) -> None:
+    """
+    Replace the barriers of a grid with a generated map. Start and end spots
+    are kept.
+
+    Parameters:
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing the
+    grid.
+    - rows (int): The number of rows in the grid.
+    - generator (str): The generator name, e.g. 'maze' or 'caves'.
+    - seed (Optional[int]): Random seed for a reproducible map.
+    - **options: Extra generator options, e.g. density.
+
+    Returns:
+    - None: This function does not return a value but updates the grid.
+    """
+    apply_to_grid(generate(generator, rows, seed=seed, **options), grid)
+
+
 def draw_grid(
     win: pygame.Surface,
     rows: int,
@@ -50,9 +106,7 @@ def draw_grid(
     gap = width // rows
     for i in range(rows):
         pygame.draw.line(win, colors["grey"], (0, i * gap), (width, i * gap))
-        for j in range(rows):
-            pygame.draw.line(win, colors["grey"], (j * gap, 0), (j * gap,
-                                                                 width))
+        pygame.draw.line(win, colors["grey"], (i * gap, 0), (i * gap, width))
 
 
 def draw(
@@ -60,6 +114,9 @@ def draw(
     grid: list,
     rows: int,
     width: int,
+    agents: Optional[List[List[int]]] = None,
+    overlay: Optional[Callable[[pygame.Surface], None]] = None,
+    renderer: Optional["GridRenderer"] = None,
 ) -> None:
     """
     Draw the entire grid and its spots on the window.
@@ -69,19 +126,145 @@ def draw(
     - grid (list): A 2D list of 'Spot' objects representing the grid.
     - rows (int): The number of rows in the grid.
     - width (int): The width of the grid in pixels.
+    - agents (Optional[List[List[int]]]): Multi-agent start and goal cell
+    indices to mark on top of the grid.
+    - overlay (Optional[Callable[[pygame.Surface], None]]): Draws e.g.
+    messages on top of everything before the display is updated.
+    - renderer (Optional[GridRenderer]): If given, the grid is copied from
+    its cached frame instead of being drawn spot by spot.
 
     Returns:
     - None: This function does not return a value but updates the window
     display.
     """
-    win.fill(colors["white"])
+    if renderer is not None:
+        renderer.draw(win)
+    else:
+        win.fill(colors["white"])
+        for row in grid:
+            for spot in row:
+                spot.draw(win)
+        draw_grid(win, rows, width)
+
+    if agents:
+        draw_agent_markers(win, agents, rows, width // rows)
+    if overlay:
+        overlay(win)
+    pygame.display.update()
 
-    for row in grid:
-        for spot in row:
-            spot.draw(win)
 
-    draw_grid(win, rows, width)
-    pygame.display.update()
+class GridRenderer:
+    """
+    Draw a grid from two cached layers instead of spot by spot.
+
+    The static layer holds the background, barriers and grid lines and only
+    changes when the maze is edited. The frame is the static layer with
+    starts, goals and search colours drawn on top. Spots whose colour
+    changed are passed to `update`, which redraws only their cells, so a
+    frame costs one blit plus the changed cells, however large or complex
+    the maze.
+
+    Parameters:
+    - rows (int): The number of rows in the grid.
+    - width (int): The width of the grid in pixels.
+
+    Attributes:
+    - static (pygame.Surface): Background, barriers and grid lines.
+    - frame (pygame.Surface): The static layer with every other spot colour
+    on top, ready to be copied to the window.
+    """
+    def __init__(
+        self,
+        rows: int,
+        width: int,
+    ) -> None:
+        self.rows = rows
+        self.width = width
+        self.gap = width // rows
+        self.static = pygame.Surface((width, width))
+        self.frame = self.static.copy()
+        # (row, col) of the barriers drawn on the static layer
+        self._barriers: set = set()
+
+    def rebuild(
+        self,
+        grid: List[List[Spot]],
+    ) -> "GridRenderer":
+        """
+        Draw both layers again from every spot, e.g. after a map was
+        generated.
+
+        Parameters:
+        - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing
+        the grid.
+
+        Returns:
+        - GridRenderer: This renderer.
+        """
+        self.static.fill(colors["white"])
+        self._barriers = set()
+        for row in grid:
+            for spot in row:
+                if spot.is_barrier():
+                    self._barriers.add(spot.get_pos())
+                    self._fill(self.static, spot)
+        draw_grid(self.static, self.rows, self.width)
+
+        self.frame.blit(self.static, (0, 0))
+        for row in grid:
+            for spot in row:
+                if spot.color != colors["white"] and not spot.is_barrier():
+                    self._fill(self.frame, spot)
+        return self
+
+    def update(
+        self,
+        spots: Iterable[Spot],
+    ) -> None:
+        """
+        Redraw the cells of spots whose colour changed. Barriers that were
+        placed or removed also update the static layer.
+
+        Parameters:
+        - spots (Iterable[Spot]): The changed spots, in any order and with
+        repeats.
+        """
+        for spot in spots:
+            pos = spot.get_pos()
+            if spot.is_barrier():
+                if pos not in self._barriers:
+                    self._barriers.add(pos)
+                    self._fill(self.static, spot)
+            elif pos in self._barriers:
+                self._barriers.discard(pos)
+                self._fill(self.static, spot, colors["white"])
+            self._fill(self.frame, spot)
+
+    def draw(
+        self,
+        win: pygame.Surface,
+    ) -> None:
+        """
+        Copy the frame to a surface.
+
+        Parameters:
+        - win (pygame.Surface): The pygame window surface to draw on.
+        """
+        win.blit(self.frame, (0, 0))
+
+    def _fill(
+        self,
+        surface: pygame.Surface,
+        spot: Spot,
+        color: Optional[tuple] = None,
+    ) -> None:
+        """Fill a spot's cell inside its grid lines."""
+        x, y = spot.row * self.gap, spot.col * self.gap
+        # the grid lines cover each cell's top and left pixel
+        inset = 1 if self.gap > 1 else 0
+        surface.fill(color or spot.color,
+                     (x + inset, y + inset, self.gap - inset,
+                      self.gap - inset))
 
 
 def get_clicked_pos(
@@ -126,7 +309,7 @@ def draw_stats(
     - None: This function does not return a value but updates the window
     display.
     """
-    font = pygame.font.SysFont("Arial", 20)
+    font = get_font("Arial", 20)
     # Create text surfaces for the statistics
     nodes_text = font.render(
         f"Nodes traversed: {nodes_traversed}", True, colors["black"]
@@ -140,59 +323,25 @@ def draw_stats(
     win.blit(time_text, (10, 30))
 
 
-def count_nodes_traversed(
-    grid: List[List[Spot]]
-) -> int:
-    """
-    Count the number of nodes that were traversed during pathfinding.
-
-    Parameters:
-    - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing the
-    grid.
-
-    Returns:
-    - int: The number of nodes that were traversed.
-    """
-    count = 0
-    for row in grid:
-        for spot in row:
-            if spot.is_closed() or spot.is_open():
-                count += 1
-    return count
-
-
-def display_results(
-    start_time: float,
-    grid,
-    win
+def draw_message(
+    win: pygame.Surface,
+    message: str,
 ) -> None:
     """
-    Display the results of the pathfinding algorithm, including time taken and
-    nodes traversed.
+    Draw a message centred on the window over a white block the size of
+    the text.
 
     Parameters:
-    - start_time (float): The starting time of the pathfinding algorithm.
-    - grid: A 2D list of 'Spot' objects representing the grid.
-    - win (pygame.Surface): The pygame window surface to display the results
-    on.
-
-    Returns:
-    - None: This function does not return a value but displays results on the
-    window.
+    - win (pygame.Surface): The pygame window surface to draw on.
+    - message (str): The message to be displayed.
     """
-    global run, exit
-    end_time: float = time.time()
-    time_taken: float = end_time - start_time
-    node_traversed = count_nodes_traversed(grid)
-    draw_stats(win, node_traversed, time_taken)
-    pygame.display.update()
-    exit = False
-    while not exit:
-        for event2 in pygame.event.get():
-            if event2.type == pygame.KEYDOWN:
-                exit = True
-            if event2.type == pygame.QUIT:
-                pygame.quit()
+    font = pygame.font.Font(None, 36)
+    text = font.render(message, True, colors["black"])
+    text_rect = text.get_rect(center=(win.get_width() / 2,
+                                      win.get_height() / 2))
+    win.fill(colors["white"], text_rect)
+    win.blit(text, text_rect)
+
 
 def display_no_path_message(
     win,
@@ -201,9 +350,8 @@ def display_no_path_message(
     """
     Display a message on the window and wait for a key press to continue.
 
-    This function creates a white rectangular block that matches the size of the
-    message text, and overlays the text over this block. The display lasts until
-    the user provides a keyboard input.
+    If the window is closed while waiting, the quit event is put back on
+    the queue for the caller's loop to handle.
 
     Parameters:
     - win (pygame.Surface): The pygame window surface to display the message on.
@@ -213,30 +361,122 @@ def display_no_path_message(
     - None: This function does not return a value but displays a message on the
     window.
     """
-    font = pygame.font.Font(None, 36)  # Choose the font for the text
-    text = font.render(message, True, (0, 0, 0))  # Render the text
-    text_rect = text.get_rect(center=(win.get_width()/2, win.get_height()/2))  # Get the rectangle for positioning
-
-    # Create a new surface with the same size as the text
-    background = pygame.Surface(text.get_size())
-    # Fill the new surface with white color
-    background.fill((255, 255, 255))
-
-    # Draw the white background on the window
-    win.blit(background, text_rect)
-    # Draw the text on the window
-    win.blit(text, text_rect)
-
-    pygame.display.flip()  
+    draw_message(win, message)
+    pygame.display.flip()
 
     # Wait for a key press
+    clock = pygame.time.Clock()
     while True:
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
                 return
 
             if event.type == pygame.QUIT:
-                pygame.quit()
+                pygame.event.post(event)
+                return
+        clock.tick(FPS)
+
+
+def resize_grid(
+    grid: List[List[Spot]],
+    width: int,
+) -> None:
+    """
+    Lay the spots of a grid out again for a new grid width.
+
+    Parameters:
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing the
+    grid.
+    - width (int): The new width of the grid in pixels.
+    """
+    gap = width // len(grid)
+    for row in grid:
+        for spot in row:
+            spot.width = gap
+            spot.x = spot.row * gap
+            spot.y = spot.col * gap
+
+
+def clear_search(
+    touched: List[Spot],
+    start: Optional[Spot],
+    end: Optional[Spot],
+    starts: Sequence[Spot] = (),
+    goals: Sequence[Spot] = (),
+) -> None:
+    """
+    Clear the open, closed and path colours left behind by searches,
+    keeping barriers, starts and goals.
+
+    Only the spots the searches touched are visited, so clearing costs no
+    more than the searches did, however large the grid.
+
+    Parameters:
+    - touched (List[Spot]): The spots coloured by searches, as collected by
+    `apply_events`. It is emptied.
+    - start (Optional[Spot]): The start spot, if placed.
+    - end (Optional[Spot]): The end spot, if placed.
+    - starts (Sequence[Spot]): Extra start spots.
+    - goals (Sequence[Spot]): Extra goal spots.
+    """
+    for spot in touched:
+        if not spot.is_barrier():
+            spot.reset()
+    touched.clear()
+    mark_ends(start, end, starts, goals)
+
+
+def mark_ends(
+    start: Optional[Spot],
+    end: Optional[Spot],
+    starts: Sequence[Spot] = (),
+    goals: Sequence[Spot] = (),
+) -> None:
+    """
+    Colour the start and goal spots again, e.g. after a search painted over
+    them.
+
+    Parameters:
+    - start (Optional[Spot]): The start spot, if placed.
+    - end (Optional[Spot]): The end spot, if placed.
+    - starts (Sequence[Spot]): Extra start spots.
+    - goals (Sequence[Spot]): Extra goal spots.
+    """
+    for spot in (start, *starts):
+        if spot:
+            spot.make_start()
+    for spot in (end, *goals):
+        if spot:
+            spot.make_end()
+
+
+def apply_events(
+    grid: List[List[Spot]],
+    events: List[tuple],
+    touched: Optional[List[Spot]] = None,
+) -> None:
+    """
+    Show recorded search changes on a grid.
+
+    Parameters:
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects representing the
+    grid.
+    - events (List[tuple]): (step, row, col, state) events, as recorded by
+    `SearchRecorder`.
+    - touched (Optional[List[Spot]]): If given, each changed spot is
+    appended to it, for `clear_search`.
+    """
+    for _, row, col, state in events:
+        spot = grid[row][col]
+        if touched is not None:
+            touched.append(spot)
+        if state == "open":
+            spot.make_open()
+        elif state == "closed":
+            spot.make_closed()
+        else:
+            spot.make_path()
+
 
 def start_game(
     grid: list,
@@ -244,6 +484,12 @@ def start_game(
     width: int,
     win: pygame.Surface,
     algorithm: str,
+    compare: Optional[List[str]] = None,
+    lockstep: str = "steps",
+    steps_per_frame: Optional[int] = None,
+    seed: int = 0,
+    agent_count: int = 0,
+    mapf: str = "ca_star",
 ) -> None:
     """
     Start the pathfinding game loop, allowing the user to set up the grid and
@@ -256,6 +502,16 @@ def start_game(
     - win (pygame.Surface): The pygame window surface for the game.
     - algorithm (str): The name of the pathfinding algorithm to use ('a_star',
     'dfs', 'bfs', 'dijkstra').
+    - compare (Optional[List[str]]): If given, the algorithms to run side by
+    side in comparison mode instead of `algorithm`.
+    - lockstep (str): How comparison panels advance, 'steps' or 'time'.
+    - steps_per_frame (Optional[int]): Search steps shown per frame
+    (default: 1 in comparison mode, `SEARCH_STEPS_PER_FRAME` otherwise).
+    - seed (int): Seed for the first map generated with the number keys;
+    each further map uses the next seed.
+    - agent_count (int): The number of random agents to place for
+    multi-agent pathfinding.
+    - mapf (str): The multi-agent solver, 'ca_star' or 'cbs'.
 
     Returns:
     - None: This function does not return a value but initiates and manages
@@ -263,101 +519,443 @@ def start_game(
 
     Note:
     - The function includes interactions for setting start and end points,
-    creating barriers, and triggering the selected pathfinding algorithm.
+    creating barriers, generating maps with the number keys 1-5, and
+    triggering the selected pathfinding algorithm.
+    - Searches run on a worker thread while this loop keeps drawing at
+    `FPS` frames per second: P pauses and resumes a search, ESC cancels it
+    and clears its colours, R restarts it and TAB switches to the next
+    algorithm and runs it on the same maze. The window can be resized at
+    any time.
+    - Pressing S or G over a cell adds or removes an extra start or goal.
+    SPACE then finds the shortest path from any start to the nearest goal
+    in one search, with the algorithms in `MULTI_GOAL_ALGORITHMS`.
+    - Pressing A places an agent's start under the mouse, then its goal.
+    When agents are placed, SPACE plans and animates all of them instead of
+    the single start-end search.
     - The game loop continues until the user quits the application.
     """
     start = None
     end = None
+    # reachability of passable cells, kept in sync with every edit
+    components = ComponentIndex(map_from_grid(grid))
+    # [start, goal] cell indices per agent; the last may lack its goal
+    agents: List[List[int]] = [
+        list(agent) for agent in random_agents(components.gmap, agent_count,
+                                               seed, components)
+    ]
+    # the running or last finished search, and what to show over the grid.
+    # Every edit to the maze drops it, so a kept search can be reused.
+    search: Optional[LiveSearch] = None
+    message: Optional[str] = None
+    # spots coloured by searches since the last clear
+    touched: List[Spot] = []
+    # starts and goals besides `start` and `end`
+    extra_starts: List[Spot] = []
+    extra_goals: List[Spot] = []
+    # the grid is drawn from cached layers; spots whose colour changed are
+    # collected here and redrawn before the next frame
+    renderer = GridRenderer(rows, width).rebuild(grid)
+    dirty: List[Spot] = []
+    hud = Hud()
+    # painting: the mouse button of the stroke in progress (1 paints
+    # barriers, 3 erases), its first and last cell, and the cell edits
+    # waiting to be applied together at the end of the frame
+    brush_mode = BRUSH_MODES[0]
+    brush_size = 1
+    history = EditHistory()
+    stroke_button: Optional[int] = None
+    stroke_anchor = stroke_last = (0, 0)
+    pending: Dict[Tuple[int, int], bool] = {}
+    clock = pygame.time.Clock()
+
+    def stop_search() -> None:
+        nonlocal search, message
+        if search is not None and not search.finished:
+            search.cancel()
+        search = None
+        message = None
+
+    def clear() -> None:
+        dirty.extend(touched)
+        clear_search(touched, start, end, extra_starts, extra_goals)
+        dirty.extend(spot for spot in (start, end) if spot)
+        dirty.extend(extra_starts + extra_goals)
+        hud.reset()
+
+    def reachable() -> bool:
+        gmap = components.gmap
+        return any(
+            components.connected(gmap.index(*source.get_pos()),
+                                 gmap.index(*target.get_pos()))
+            for source in (start, *extra_starts)
+            for target in (end, *extra_goals)
+        )
+
+    def rerun() -> None:
+        nonlocal search, message, stroke_button
+        message = None
+        # a stroke held into the search would edit the maze under it
+        stroke_button = None
+        pending.clear()
+        clear()
+        if (extra_starts or extra_goals) and (
+            algorithm not in MULTI_GOAL_ALGORITHMS
+        ):
+            stop_search()
+            message = f"{algorithm} takes one start and goal"
+            return
+        # walled-off goals need no search, and would keep IDA* busy
+        if not reachable():
+            stop_search()
+            message = "No path found!"
+            return
+        search = LiveSearch(algorithm, grid, start, end, reuse=search,
+                            starts=extra_starts, goals=extra_goals).start()
+
+    def show_caption() -> None:
+        brush = f"brush {brush_size}" if brush_mode == "brush" else brush_mode
+        pygame.display.set_caption(
+            f"Graph Algorithm Visualizer ({algorithm}) - {brush}"
+        )
+
+    def paint(
+        edits: Dict[Tuple[int, int], bool],
+        record: bool = True,
+    ) -> None:
+        nonlocal start, end, agents
+        # cells whose barrier state flipped; repainting a cell as it was
+        # leaves the maze, and so the search, as they were
+        changed: Dict[bool, List[Tuple[int, int]]] = {True: [], False: []}
+        ends_removed = False
+        for (row, col), barrier in edits.items():
+            spot = grid[row][col]
+            if barrier and spot in (start, end):
+                continue
+            ends_removed |= spot in extra_starts or spot in extra_goals
+            forget_marker(spot)
+            if spot == start:
+                start = None
+                ends_removed = True
+            elif spot == end:
+                end = None
+                ends_removed = True
+            if spot.is_barrier() != barrier:
+                if record:
+                    history.record(row, col, spot.is_barrier())
+                changed[barrier].append((row, col))
+            if barrier:
+                spot.make_barrier()
+            else:
+                spot.reset()
+
+        # one update of the reachability index per frame, not per cell
+        for barrier, cells in changed.items():
+            if cells:
+                components.set_barriers(cells, barrier)
+        if changed[True] or changed[False]:
+            grid_edited()
+        if changed[True] or changed[False] or ends_removed:
+            # the search was made on the old maze or between old ends
+            stop_search()
+            clear()
+        # erased cells stay passable, so only new barriers drop agents
+        gmap = components.gmap
+        walled = {gmap.index(row, col) for row, col in changed[True]}
+        agents = [agent for agent in agents
+                  if not any(cell in walled for cell in agent)]
+
+    def forget_marker(spot: Spot) -> None:
+        dirty.append(spot)
+        if spot in extra_starts:
+            extra_starts.remove(spot)
+        if spot in extra_goals:
+            extra_goals.remove(spot)
+
+    def overlay(surface: pygame.Surface) -> None:
+        hud.draw(surface, search)
+        if stroke_button is not None and brush_mode == "rect":
+            gap = width // rows
+            (row_a, col_a), (row_b, col_b) = stroke_anchor, stroke_last
+            pygame.draw.rect(surface, colors["grey"], (
+                min(row_a, row_b) * gap, min(col_a, col_b) * gap,
+                (abs(row_a - row_b) + 1) * gap, (abs(col_a - col_b) + 1) * gap,
+            ), 2)
+        if search is not None and search.paused:
+            draw_message(surface, "Paused")
+        if message:
+            draw_message(surface, message)
 
     run = True
-    # started = False
     while run:
-        draw(win, grid, rows, width)
+        frame_start = time.perf_counter()
+        showing = search is not None and not search.done
+        if showing:
+            painted = len(touched)
+            events = search.advance(steps_per_frame or SEARCH_STEPS_PER_FRAME)
+            apply_events(grid, events, touched)
+            hud.track(events)
+            dirty.extend(touched[painted:])
+            if search.done:
+                mark_ends(start, end, extra_starts, extra_goals)
+                dirty.extend(spot for spot in (start, end) if spot)
+                dirty.extend(extra_starts + extra_goals)
+                if not search.result:
+                    message = "No path found!"
+        render_start = time.perf_counter()
+        renderer.update(dirty)
+        dirty.clear()
+        draw(win, grid, rows, width, agents, overlay, renderer)
+        hud.timed(frame_start, render_start, showing)
+        clock.tick(FPS)
+        searching = search is not None and not search.done
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
 
-            # if started:
-            #     continue
-
-            if pygame.mouse.get_pressed()[0]:  # left mouse button
-                pos = pygame.mouse.get_pos()
-                row, col = get_clicked_pos(pos, rows, width)
+            elif event.type == pygame.VIDEORESIZE:
+                win = pygame.display.get_surface()
+                width = max(rows, min(event.w, event.h))
+                resize_grid(grid, width)
+                renderer = GridRenderer(rows, width).rebuild(grid)
+
+            elif (
+                event.type == pygame.MOUSEBUTTONUP
+                and event.button == stroke_button
+            ):
+                if brush_mode == "rect":
+                    pending.update(dict.fromkeys(
+                        rect_cells(stroke_anchor, stroke_last),
+                        stroke_button == 1,
+                    ))
+                stroke_button = None
+
+            # the grid can't be edited while a search runs on it
+            if searching:
+                pass
+
+            elif (
+                event.type == pygame.MOUSEBUTTONDOWN
+                and event.button in (1, 3)
+            ):
+                row, col = get_clicked_pos(event.pos, rows, width)
+                if row >= rows or col >= rows:
+                    continue
                 spot = grid[row][col]
+                stop_search()
 
-                if not start and spot != end:
+                if event.button == 1 and not start and spot != end:
+                    forget_marker(spot)
+                    if spot.is_barrier():
+                        grid_edited()
                     start = spot
                     start.make_start()
+                    components.set_barrier(row, col, False)
 
-                elif not end and spot != start:
+                elif event.button == 1 and not end and spot != start:
+                    forget_marker(spot)
+                    if spot.is_barrier():
+                        grid_edited()
                     end = spot
                     end.make_end()
-
-                elif spot != end and spot != start:
-                    spot.make_barrier()
-
-            elif pygame.mouse.get_pressed()[2]:  # right mouse button
-                pos = pygame.mouse.get_pos()
-                row, col = get_clicked_pos(pos, rows, width)
-                spot = grid[row][col]
-                spot.reset()
-
-                if spot == start:
-                    start = None
-                elif spot == end:
-                    end = None
+                    components.set_barrier(row, col, False)
+
+                else:
+                    stroke_button = event.button
+                    stroke_anchor = stroke_last = (row, col)
+                    if brush_mode == "brush":
+                        cells = stamp_cells((row, col), brush_size, rows)
+                    elif brush_mode == "fill":
+                        cells = flood_cells(components.gmap, row, col)
+                    else:
+                        cells = []
+                    pending.update(dict.fromkeys(cells, event.button == 1))
+
+            elif event.type == pygame.MOUSEMOTION and stroke_button:
+                row, col = get_clicked_pos(event.pos, rows, width)
+                # keep painting along the edge when dragged off the grid
+                cell = (max(0, min(row, rows - 1)), max(0, min(col, rows - 1)))
+                if brush_mode == "brush":
+                    # fill the gap since the last mouse sample
+                    for point in line_cells(stroke_last, cell)[1:]:
+                        pending.update(dict.fromkeys(
+                            stamp_cells(point, brush_size, rows),
+                            stroke_button == 1,
+                        ))
+                stroke_last = cell
 
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and start and end:
-                    for row in grid:
-                        for spot in row:
-                            spot.update_neighbors(grid)
-
-                    start_time: float = time.time()
-                    if algorithm == "a_star":
-                        if a_star(
-                            lambda: draw(win, grid, rows, width),
-                            grid,
-                            start,
-                            end,
-                        ):
-                            display_results(start_time, grid, win)
+                if searching and event.key == pygame.K_p:
+                    if search.paused:
+                        search.resume()
+                    else:
+                        search.pause()
+                    continue
+
+                if event.key == pygame.K_ESCAPE:
+                    stop_search()
+                    clear()
+                    continue
+
+                if event.key == pygame.K_r and search is not None:
+                    rerun()
+                    continue
+
+                if event.key == pygame.K_h:
+                    hud.visible = not hud.visible
+                    continue
+
+                if event.key == pygame.K_b:
+                    brush_mode = BRUSH_MODES[
+                        (BRUSH_MODES.index(brush_mode) + 1) % len(BRUSH_MODES)
+                    ]
+                    show_caption()
+                    continue
+
+                if event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                    step = 1 if event.key == pygame.K_RIGHTBRACKET else -1
+                    brush_size = max(1, min(MAX_BRUSH_SIZE, brush_size + step))
+                    show_caption()
+                    continue
+
+                if event.key == pygame.K_TAB and not compare:
+                    names = list(ALGORITHMS)
+                    algorithm = names[
+                        (names.index(algorithm) + 1) % len(names)
+                    ]
+                    show_caption()
+                    if search is not None:
+                        rerun()
+                    continue
+
+                if searching:
+                    if event.key in GENERATOR_KEYS or event.key == pygame.K_c:
+                        stop_search()
+                    else:
+                        continue
+                # any other key dismisses a finished search's message
+                message = None
+
+                if event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                    stop_search()
+                    paint(pending)
+                    pending.clear()
+                    paint({(row, col): barrier
+                           for row, col, barrier in history.undo()},
+                          record=False)
+
+                if event.key == pygame.K_a:
+                    row, col = get_clicked_pos(pygame.mouse.get_pos(), rows,
+                                               width)
+                    if row >= rows or col >= rows:
+                        continue
+                    index = components.gmap.index(row, col)
+                    used = {cell for agent in agents for cell in agent}
+                    if not components.gmap.cells[index] and index not in used:
+                        if agents and len(agents[-1]) == 1:
+                            agents[-1].append(index)
                         else:
-                            display_no_path_message(win, "No path found!")
-                    elif algorithm == "dfs":
-                        if dfs(
-                            lambda: draw(win, grid, rows, width),
-                            grid,
-                            start,
-                            end,
-                        ):
-                            display_results(start_time, grid, win)
-                        else:
-                            display_no_path_message(win, "No path found!")
-                    elif algorithm == "bfs":
-                        if bfs(
-                            lambda: draw(win, grid, rows, width),
-                            grid,
-                            start,
-                            end,
-                        ):
-                            display_results(start_time, grid, win)
-                        else:
-                            display_no_path_message(win, "No path found!")
-                    elif algorithm == "dijkstra":
-                        if dijkstra(
-                            lambda: draw(win, grid, rows, width),
+                            agents.append([index])
+
+                if event.key in (pygame.K_s, pygame.K_g):
+                    row, col = get_clicked_pos(pygame.mouse.get_pos(), rows,
+                                               width)
+                    if row >= rows or col >= rows:
+                        continue
+                    spot = grid[row][col]
+                    if spot.is_barrier() or spot in (start, end):
+                        continue
+                    stop_search()
+                    clear()
+                    markers = (extra_starts if event.key == pygame.K_s
+                               else extra_goals)
+                    if spot in markers:
+                        forget_marker(spot)
+                        spot.reset()
+                    else:
+                        forget_marker(spot)
+                        markers.append(spot)
+                        mark_ends(start, end, extra_starts, extra_goals)
+
+                if event.key == pygame.K_SPACE and agents:
+                    placed = [agent for agent in agents if len(agent) == 2]
+                    if not placed:
+                        continue
+                    result = SOLVERS[mapf](components.gmap, placed)
+                    draw(win, grid, rows, width, renderer=renderer)
+                    run = animate_agents(win, win.copy(), placed, result,
+                                         rows, width // rows)
+                    if run:
+                        display_no_path_message(
+                            win,
+                            f"{result.solved} of {len(placed)} agents solved"
+                            f" in {result.seconds:.2f} seconds",
+                        )
+                    continue
+
+                if event.key == pygame.K_SPACE and start and end:
+                    # walled-off goals need no search
+                    if not reachable():
+                        stop_search()
+                        clear()
+                        message = "No path found!"
+                        continue
+
+                    # comparison panels only search from start to end
+                    if compare:
+                        stop_search()
+                        clear()
+                        run = run_comparison(
                             grid,
+                            width,
+                            win,
+                            compare,
                             start,
                             end,
-                        ):
-                            display_results(start_time, grid, win)
-                        else:
-                            display_no_path_message(win, "No path found!")
-                       
+                            lockstep=lockstep,
+                            steps_per_frame=steps_per_frame or 1,
+                        )
+                        continue
+
+                    rerun()
+                    continue
+
                 if event.key == pygame.K_c:
+                    stop_search()
                     start = None
                     end = None
+                    agents = []
+                    touched.clear()
+                    hud.reset()
+                    pending.clear()
+                    history.clear()
+                    extra_starts.clear()
+                    extra_goals.clear()
                     grid = make_grid(rows, width)
-
+                    components = ComponentIndex(map_from_grid(grid))
+                    renderer.rebuild(grid)
+                    dirty.clear()
+
+                if event.key in GENERATOR_KEYS:
+                    stop_search()
+                    clear()
+                    fill_grid(grid, rows, GENERATOR_KEYS[event.key], seed)
+                    seed += 1
+                    pending.clear()
+                    history.clear()
+                    renderer.rebuild(grid)
+                    dirty.clear()
+                    components = ComponentIndex(map_from_grid(grid))
+                    cells = components.gmap.cells
+                    agents = [agent for agent in agents
+                              if not any(cells[cell] for cell in agent)]
+
+        # the frame's edits reach the grid and the index in one batch
+        if pending:
+            paint(pending)
+            pending.clear()
+        if stroke_button is None:
+            history.end_stroke()
+
+    stop_search()
     pygame.quit()
@@ -0,0 +1,489 @@
+import argparse
+import random
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+from gridmap import GridMap
+
+
+# bytes.translate tables between one-byte cells and '0'/'1' digits
+_CELLS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_CELLS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _threshold_table(density: float) -> bytes:
+    """
+    Build a translation table mapping random bytes to barrier cells with the
+    given probability.
+
+    Parameters:
+    - density (float): The fraction of bytes mapped to 1.
+
+    Returns:
+    - bytes: A 256-byte table for bytes.translate.
+    """
+    threshold = round(min(max(density, 0.0), 1.0) * 256)
+    return bytes(1 if value < threshold else 0 for value in range(256))
+
+
+def _cells_to_int(cells: bytes) -> int:
+    """
+    Pack one-byte cells into a big-int bitboard, cell 0 in the lowest bit.
+
+    Parameters:
+    - cells (bytes): Cells holding 0 or 1.
+
+    Returns:
+    - int: The bitboard.
+    """
+    if not cells:
+        return 0
+    return int(cells.translate(_CELLS_TO_DIGITS)[::-1], 2)
+
+
+def _int_to_cells(board: int, size: int) -> bytearray:
+    """
+    Unpack a big-int bitboard into one-byte cells.
+
+    Parameters:
+    - board (int): The bitboard, cell 0 in the lowest bit.
+    - size (int): The number of cells.
+
+    Returns:
+    - bytearray: Cells holding 0 or 1.
+    """
+    digits = format(board, "b").zfill(size)[-size:] if size else ""
+    return bytearray(digits[::-1].encode().translate(_DIGITS_TO_CELLS))
+
+
+def random_obstacles(
+    rows: int,
+    cols: int,
+    seed: Optional[int] = None,
+    density: float = 0.3,
+) -> GridMap:
+    """
+    Scatter barriers uniformly at random.
+
+    Parameters:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - seed (Optional[int]): Random seed for reproducible maps.
+    - density (float): The probability of a cell being a barrier.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(
+        rng.randbytes(rows * cols).translate(_threshold_table(density))
+    )
+    return GridMap(rows, cols, cells)
+
+
+def recursive_backtracker(
+    rows: int,
+    cols: int,
+    seed: Optional[int] = None,
+) -> GridMap:
+    """
+    Carve a perfect maze with a randomised depth-first search.
+
+    Passages run through cells with even row and column; the cells between
+    them are walls unless carved. The result has exactly one path between
+    any two passage cells, with long winding corridors.
+
+    One search carves the whole map, at every size: earlier versions tiled
+    maps above 64x64 cells from a small pool of block mazes, which made
+    large maps repetitive and cut their corridors at block edges.
+
+    The search runs on an index stack over a copy of the cells padded with
+    two carved cells on every side, so a cell's four walled neighbors are
+    four lookups combined into an index of a table of moves, with no bounds
+    checks. Random bytes are drawn in one call, and the table already
+    holds the move each byte picks. A depth-first search still visits one
+    cell per step of a Python loop, so this is the one generator slower
+    than a second at 4096x4096: about 3.5 seconds.
+
+    Parameters:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - seed (Optional[int]): Random seed for reproducible maps.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    if not rows or not cols:
+        return GridMap(rows, cols, bytearray(b"\x01" * (rows * cols)))
+    width = cols + 4
+    work = bytearray(width * (rows + 4))
+    wall_row = b"\x00\x00" + b"\x01" * cols + b"\x00\x00"
+    for row in range(rows):
+        base = (row + 2) * width
+        work[base:base + width] = wall_row
+    step = 2 * width
+    # the move to take, indexed by a bit per neighbor that is still a wall
+    # (up, down, left, right) and a random byte; 0 at a dead end
+    moves: List[int] = []
+    for mask in range(16):
+        options = [move for bit, move in enumerate((-step, step, -2, 2))
+                   if mask >> bit & 1]
+        moves += ([options[byte * len(options) >> 8] for byte in range(256)]
+                  if options else [0] * 256)
+    # every passage cell is entered once and returned to once
+    passages = ((rows + 1) >> 1) * ((cols + 1) >> 1)
+    random_bytes = iter(random.Random(seed).randbytes(2 * passages))
+
+    current = 2 * width + 2
+    work[current] = 0
+    # the cells to return to once the current one is a dead end
+    stack: List[int] = []
+    push = stack.append
+    pop = stack.pop
+    while True:
+        move = moves[
+            (work[current - step] | work[current + step] << 1
+             | work[current - 2] << 2 | work[current + 2] << 3) << 8
+            | next(random_bytes)
+        ]
+        if move:
+            push(current)
+            work[current + (move >> 1)] = 0
+            current += move
+            work[current] = 0
+        elif stack:
+            current = pop()
+        else:
+            break
+
+    cells = bytearray()
+    for row in range(rows):
+        base = (row + 2) * width + 2
+        cells += work[base:base + cols]
+    return GridMap(rows, cols, cells)
+
+
+def recursive_division(
+    rows: int,
+    cols: int,
+    seed: Optional[int] = None,
+) -> GridMap:
+    """
+    Build a maze by recursively splitting chambers with walls that have a
+    single gap.
+
+    The whole map is divided, at every size: earlier versions ran the
+    first walls along the edges of 64x64 blocks filled from a small pool
+    of divided blocks, which made large maps repetitive.
+
+    Walls are placed on odd rows and columns and written as whole slices,
+    so large chambers cost one bulk write each, and chambers too small for
+    a wall are never stacked. Every wall still costs a step of a Python
+    loop, and a maze has a wall per few cells: about 3.5 seconds at
+    4096x4096.
+
+    Parameters:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - seed (Optional[int]): Random seed for reproducible maps.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    # random() scaled to an int is several times faster than randrange()
+    rng_random = random.Random(seed).random
+    cells = bytearray(rows * cols)
+    walls = [b"\x01" * length for length in range(max(rows, cols) + 1)]
+    # chambers as inclusive (top, left, bottom, right) cell bounds; only
+    # those that take a wall are kept: a one-cell-wide chamber would need
+    # a gap in every wall
+    chambers = []
+    push = chambers.append
+    pop = chambers.pop
+    if rows > 1 and cols > 1 and (rows > 2 or cols > 2):
+        push((0, 0, rows - 1, cols - 1))
+    while chambers:
+        top, left, bottom, right = pop()
+        height = bottom - top
+        width = right - left
+        if width < 2:
+            horizontal = True
+        elif height < 2:
+            horizontal = False
+        else:
+            horizontal = height > width or (
+                height == width and rng_random() < 0.5
+            )
+
+        if horizontal:
+            wall = top + 1 + 2 * int(rng_random() * (height >> 1))
+            gap = left + 2 * int(rng_random() * ((width >> 1) + 1))
+            base = wall * cols
+            cells[base + left:base + right + 1] = walls[width + 1]
+            cells[base + gap] = 0
+            above = wall - 1 - top
+            below = bottom - wall - 1
+            if above and (above > 1 or width > 1):
+                push((top, left, wall - 1, right))
+            if below and (below > 1 or width > 1):
+                push((wall + 1, left, bottom, right))
+        else:
+            wall = left + 1 + 2 * int(rng_random() * (width >> 1))
+            gap = top + 2 * int(rng_random() * ((height >> 1) + 1))
+            cells[top * cols + wall:bottom * cols + wall + 1:cols] = (
+                walls[height + 1]
+            )
+            cells[gap * cols + wall] = 0
+            before = wall - 1 - left
+            after = right - wall - 1
+            if before and (before > 1 or height > 1):
+                push((top, left, bottom, wall - 1))
+            if after and (after > 1 or height > 1):
+                push((top, wall + 1, bottom, right))
+
+    return GridMap(rows, cols, cells)
+
+
+def cellular_caves(
+    rows: int,
+    cols: int,
+    seed: Optional[int] = None,
+    density: float = 0.45,
+    iterations: int = 4,
+) -> GridMap:
+    """
+    Grow cave-like open areas with a cellular automaton.
+
+    Starting from random noise, a cell becomes a wall when at least 5 of the
+    9 cells in its 3x3 neighbourhood are walls, with cells outside the map
+    counting as walls. The whole map is updated at once as a big-int
+    bitboard, summing the 9 shifted boards with bitwise adders, so each
+    iteration is a few dozen bulk integer operations.
+
+    Parameters:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - seed (Optional[int]): Random seed for reproducible maps.
+    - density (float): The initial probability of a cell being a wall.
+    - iterations (int): The number of smoothing steps.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    noise = random_obstacles(rows, cols, seed, density).cells
+    if not rows or not cols:
+        return GridMap(rows, cols, noise)
+
+    # pad the map with a one-cell wall border so shifts never wrap into
+    # the wrong row
+    stride = cols + 2
+    size = (rows + 2) * stride
+    wall_row = b"\x01" * stride
+    padded = bytearray(wall_row)
+    for row in range(rows):
+        padded += b"\x01" + noise[row * cols:(row + 1) * cols] + b"\x01"
+    padded += wall_row
+
+    border = bytearray(wall_row)
+    border += (b"\x01" + b"\x00" * cols + b"\x01") * rows
+    border += wall_row
+
+    board = _cells_to_int(bytes(padded))
+    border_board = _cells_to_int(bytes(border))
+    full = (1 << size) - 1
+
+    for _ in range(iterations):
+        shifted = [
+            board,
+            board << 1,
+            board >> 1,
+            board << stride,
+            board >> stride,
+            board << (stride + 1),
+            board >> (stride + 1),
+            board << (stride - 1),
+            board >> (stride - 1),
+        ]
+        counter = [0, 0, 0, 0]
+        for layer in shifted:
+            carry = layer
+            for bit in range(4):
+                counter[bit], carry = counter[bit] ^ carry, counter[bit] & carry
+        # count >= 5 in binary
+        board = counter[3] | (counter[2] & (counter[1] | counter[0]))
+        board = (board & full) | border_board
+
+    padded = _int_to_cells(board, size)
+    cells = bytearray()
+    for row in range(1, rows + 1):
+        cells += padded[row * stride + 1:row * stride + 1 + cols]
+    return GridMap(rows, cols, cells)
+
+
+def rooms_and_corridors(
+    rows: int,
+    cols: int,
+    seed: Optional[int] = None,
+    min_room: int = 4,
+    max_room: int = 12,
+) -> GridMap:
+    """
+    Place non-overlapping rectangular rooms and join them with L-shaped
+    corridors.
+
+    Rooms are tried at random positions and kept when their area plus a
+    one-cell margin is still solid wall. Each room is connected to the room
+    placed before it, so every room is reachable.
+
+    Most tries on a large map land on a room already placed. The sizes and
+    positions of all tries are drawn as random bytes up front, and a try is
+    first checked at two cells of its middle row; only the rest are
+    scanned, row by row, with `bytearray.find`. About 0.5 seconds at
+    4096x4096.
+
+    Parameters:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - seed (Optional[int]): Random seed for reproducible maps.
+    - min_room (int): The smallest room side length.
+    - max_room (int): The largest room side length.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(b"\x01" * (rows * cols))
+    if rows < min_room + 2 or cols < min_room + 2:
+        return GridMap(rows, cols, cells)
+
+    max_room = max(min(max_room, rows - 2, cols - 2), min_room)
+    average = (min_room + max_room) // 2 + 1
+    attempts = max(rows * cols // (average * average), 1)
+    centres: List[Tuple[int, int]] = []
+
+    # a random byte to a side length, and 16-bit fractions to positions
+    side_of = bytes(min_room + (byte * (max_room - min_room + 1) >> 8)
+                    for byte in range(256))
+    heights = rng.randbytes(attempts).translate(side_of)
+    widths = rng.randbytes(attempts).translate(side_of)
+    tops = array("H", rng.randbytes(2 * attempts))
+    lefts = array("H", rng.randbytes(2 * attempts))
+    find = cells.find
+
+    for height, width, top, left in zip(heights, widths, tops, lefts):
+        top = 1 + (top * (rows - height - 1) >> 16)
+        left = 1 + (left * (cols - width - 1) >> 16)
+        middle = (top + (height >> 1)) * cols + left
+        if not (cells[middle] and cells[middle + width - 1]):
+            continue
+        span = width + 2
+        if any(
+            find(0, base, base + span) != -1
+            for base in range((top - 1) * cols + left - 1,
+                              (top + height + 1) * cols, cols)
+        ):
+            continue
+
+        empty = bytes(width)
+        for r in range(top, top + height):
+            cells[r * cols + left:r * cols + left + width] = empty
+
+        centre = (top + height // 2, left + width // 2)
+        if centres:
+            _carve_corridor(cells, cols, centres[-1], centre, rng)
+        centres.append(centre)
+
+    return GridMap(rows, cols, cells)
+
+
+def _carve_corridor(
+    cells: bytearray,
+    cols: int,
+    a: Tuple[int, int],
+    b: Tuple[int, int],
+    rng: random.Random,
+) -> None:
+    """
+    Carve an L-shaped corridor between two cells, turning at a random
+    corner.
+
+    Parameters:
+    - cells (bytearray): The cell storage to carve into.
+    - cols (int): The number of columns.
+    - a (Tuple[int, int]): The (row, col) of one end.
+    - b (Tuple[int, int]): The (row, col) of the other end.
+    - rng (random.Random): The generator's random source.
+    """
+    (r1, c1), (r2, c2) = a, b
+    if rng.random() < 0.5:
+        corner_row, corner_col = r1, c2
+    else:
+        corner_row, corner_col = r2, c1
+    for (ra, ca), (rb, cb) in (
+        ((r1, c1), (corner_row, corner_col)),
+        ((corner_row, corner_col), (r2, c2)),
+    ):
+        if ra == rb:
+            lo, hi = min(ca, cb), max(ca, cb)
+            cells[ra * cols + lo:ra * cols + hi + 1] = bytes(hi - lo + 1)
+        else:
+            lo, hi = min(ra, rb), max(ra, rb)
+            cells[lo * cols + ca:hi * cols + ca + 1:cols] = bytes(hi - lo + 1)
+
+
+GENERATORS: Dict[str, Callable[..., GridMap]] = {
+    "maze": recursive_backtracker,
+    "division": recursive_division,
+    "random": random_obstacles,
+    "caves": cellular_caves,
+    "rooms": rooms_and_corridors,
+}
+
+
+def generate(
+    name: str,
+    rows: int,
+    cols: Optional[int] = None,
+    seed: Optional[int] = None,
+    **options,
+) -> GridMap:
+    """
+    Generate a map with one of the registered generators.
+
+    Parameters:
+    - name (str): The generator name in `GENERATORS`.
+    - rows (int): The number of rows.
+    - cols (Optional[int]): The number of columns (default: same as rows).
+    - seed (Optional[int]): Random seed for reproducible maps.
+    - **options: Extra generator options, e.g. density.
+
+    Returns:
+    - GridMap: The generated map.
+    """
+    if name not in GENERATORS:
+        raise ValueError(
+            f"Unknown generator '{name}', choose from {list(GENERATORS)}"
+        )
+    return GENERATORS[name](
+        rows, rows if cols is None else cols, seed, **options
+    )
+
+
+if __name__ == "__main__":
+    """
+    Time a generator headless, e.g. `python generators.py caves -rows 4096`.
+    """
+    parser = argparse.ArgumentParser(description="Map generator timing")
+    parser.add_argument("generator", choices=list(GENERATORS))
+    parser.add_argument("-rows", type=int, default=4096)
+    parser.add_argument("-cols", type=int, default=None)
+    parser.add_argument("-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    gmap = generate(args.generator, args.rows, args.cols, args.seed)
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"{args.generator}: {gmap.rows}x{gmap.cols} in {elapsed:.3f}s, "
+        f"barrier density {gmap.density():.3f}"
+    )
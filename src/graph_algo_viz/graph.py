@@ -0,0 +1,841 @@
+import heapq
+import math
+import os
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections import deque
+from typing import Callable, Dict, Hashable, List, Optional
+from search import SearchResult
+
+
+LAYOUT_MAGIC = b"LAY1"
+# magic, node count, crc32 of the adjacency
+LAYOUT_HEADER = struct.Struct("<4sII")
+# pivots used by the layout's high-dimensional embedding
+LAYOUT_PIVOTS = 8
+
+
+class Graph:
+    """
+    A compact adjacency store for arbitrary graphs, used for searching large
+    graphs without per-node Python objects.
+
+    Nodes are numbered 0 to n - 1. The edges leaving node `v` are
+    `targets[offsets[v]:offsets[v + 1]]` with the matching `weights`, all
+    held in contiguous typed arrays (compressed sparse row). Undirected
+    edges are stored once in each direction.
+
+    Parameters:
+    - offsets (array): n + 1 edge offsets ('q' typecode).
+    - targets (array): The target node of each edge ('i' typecode).
+    - weights (array): The weight of each edge ('d' typecode).
+    - labels (Optional[List[Hashable]]): The original node names, in node
+    order (default: the node numbers).
+    - coords (Optional[array]): x, y coordinates per node, interleaved
+    ('d' typecode).
+    - directed (bool): True if the edges were read as directed.
+    - heuristic_scale (Optional[float]): A precomputed
+    `heuristic_scale`, e.g. read from a cache file.
+
+    The arrays may also be memoryviews of a memory-mapped file, as returned
+    by `dimacs.load_graph_cache`.
+    """
+    def __init__(
+        self,
+        offsets: array,
+        targets: array,
+        weights: array,
+        labels: Optional[List[Hashable]] = None,
+        coords: Optional[array] = None,
+        directed: bool = False,
+        heuristic_scale: Optional[float] = None,
+    ) -> None:
+        if len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("offsets, targets and weights do not match")
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = labels
+        self.coords = coords
+        self.directed = directed
+        self._index: Optional[Dict[Hashable, int]] = None
+        self._heuristic_scale = heuristic_scale
+        self._layout: Optional[array] = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        node_count: int,
+        sources: array,
+        targets: array,
+        weights: array,
+        directed: bool = False,
+        **kwargs,
+    ) -> "Graph":
+        """
+        Build the adjacency arrays from parallel edge arrays with a counting
+        sort, keeping the edge order within each node.
+
+        Parameters:
+        - node_count (int): The number of nodes.
+        - sources (array): The source node of each edge.
+        - targets (array): The target node of each edge.
+        - weights (array): The weight of each edge.
+        - directed (bool): If False, each edge is stored in both directions.
+        - **kwargs: Passed on to the constructor, e.g. labels and coords.
+
+        Returns:
+        - Graph: The graph.
+        """
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+        offsets = array("q", [0]) * (node_count + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+
+        edge_count = len(sources)
+        sorted_targets = array("i", [0]) * edge_count
+        sorted_weights = array("d", [0.0]) * edge_count
+        fill = offsets[:-1]
+        for source, target, weight in zip(sources, targets, weights):
+            slot = fill[source]
+            sorted_targets[slot] = target
+            sorted_weights[slot] = weight
+            fill[source] = slot + 1
+        return cls(offsets, sorted_targets, sorted_weights,
+                   directed=directed, **kwargs)
+
+    @property
+    def node_count(self) -> int:
+        """
+        Get the number of nodes.
+
+        Returns:
+        - int: The number of nodes.
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Get the number of stored edges; undirected edges count twice.
+
+        Returns:
+        - int: The number of stored edges.
+        """
+        return len(self.targets)
+
+    def __len__(self) -> int:
+        """
+        Get the number of nodes.
+
+        Returns:
+        - int: The number of nodes.
+        """
+        return self.node_count
+
+    def index(self, label: Hashable) -> int:
+        """
+        Get the node number of an original node name.
+
+        Parameters:
+        - label (Hashable): The node name.
+
+        Returns:
+        - int: The node number.
+        """
+        if self.labels is None:
+            return int(label)
+        if self._index is None:
+            self._index = {name: node for node, name in enumerate(self.labels)}
+        return self._index[label]
+
+    def label(self, node: int) -> Hashable:
+        """
+        Get the original name of a node.
+
+        Parameters:
+        - node (int): The node number.
+
+        Returns:
+        - Hashable: The node name.
+        """
+        return node if self.labels is None else self.labels[node]
+
+    def version(self) -> int:
+        """
+        Get a checksum identifying the graph's structure, used to tell
+        whether a stored layout still matches it.
+
+        Returns:
+        - int: The CRC-32 of the offsets and targets.
+        """
+        return zlib.crc32(self.targets, zlib.crc32(self.offsets))
+
+    def edge_weight(self, source: int, target: int) -> float:
+        """
+        Get the weight of the lightest edge between two nodes.
+
+        Parameters:
+        - source (int): The source node.
+        - target (int): The target node.
+
+        Returns:
+        - float: The weight, or math.inf if there is no such edge.
+        """
+        weights = self.weights
+        targets = self.targets
+        return min(
+            (weights[i]
+             for i in range(self.offsets[source], self.offsets[source + 1])
+             if targets[i] == target),
+            default=math.inf,
+        )
+
+    def heuristic_scale(self) -> float:
+        """
+        Get the largest factor by which straight-line distances between node
+        coordinates can be multiplied without exceeding any edge weight.
+
+        Scaling Euclidean distance by it gives an admissible and consistent
+        A* heuristic whatever the units of the weights and coordinates.
+
+        Returns:
+        - float: The scale, 0.0 if the graph has no coordinates.
+        """
+        if self._heuristic_scale is not None:
+            return self._heuristic_scale
+        coords = self.coords
+        scale = 0.0
+        if coords is not None:
+            scale = math.inf
+            offsets = self.offsets
+            targets = self.targets
+            weights = self.weights
+            for node in range(self.node_count):
+                x = coords[2 * node]
+                y = coords[2 * node + 1]
+                for i in range(offsets[node], offsets[node + 1]):
+                    target = targets[i]
+                    length = math.hypot(coords[2 * target] - x,
+                                        coords[2 * target + 1] - y)
+                    if length > 0 and weights[i] < scale * length:
+                        scale = weights[i] / length
+            if scale == math.inf:
+                scale = 0.0
+        self._heuristic_scale = scale
+        return scale
+
+    def layout(self, seed: int = 0) -> array:
+        """
+        Get node positions for drawing, computed once and cached.
+
+        Parameters:
+        - seed (int): Random seed used when the graph has no coordinates.
+
+        Returns:
+        - array: x, y per node, interleaved and scaled to [0, 1].
+        """
+        if self._layout is None:
+            self._layout = compute_layout(self, seed)
+        return self._layout
+
+
+def graph_from_networkx(
+    nx_graph,
+    weight: str = "weight",
+    pos: str = "pos",
+) -> Graph:
+    """
+    Convert a networkx graph into a compact Graph.
+
+    Coordinates are read from a `pos` node attribute holding an (x, y) pair,
+    or from separate 'x' and 'y' attributes as written to GraphML files. They
+    are only kept when every node has them.
+
+    Parameters:
+    - nx_graph (networkx.Graph): Any networkx graph or digraph.
+    - weight (str): The edge attribute holding the weight (default: 1.0
+    when missing).
+    - pos (str): The node attribute holding coordinates.
+
+    Returns:
+    - Graph: The graph, with the networkx node names as labels.
+    """
+    labels = list(nx_graph.nodes)
+    index = {label: node for node, label in enumerate(labels)}
+    sources = array("i")
+    targets = array("i")
+    weights = array("d")
+    for u, v, w in nx_graph.edges(data=weight, default=1.0):
+        sources.append(index[u])
+        targets.append(index[v])
+        weights.append(float(w))
+
+    coords: Optional[array] = array("d")
+    for _, data in nx_graph.nodes(data=True):
+        if pos in data:
+            x, y = data[pos][:2]
+        elif "x" in data and "y" in data:
+            x, y = data["x"], data["y"]
+        else:
+            coords = None
+            break
+        coords.extend((float(x), float(y)))
+
+    return Graph.from_edges(len(labels), sources, targets, weights,
+                            directed=nx_graph.is_directed(), labels=labels,
+                            coords=coords)
+
+
+def load_edge_list(
+    path: str,
+    directed: bool = False,
+) -> Graph:
+    """
+    Load a whitespace-separated edge list, one 'source target [weight]' line
+    per edge. A line holding a single name adds that node with no edges.
+    Lines starting with '#' or '%' are comments.
+
+    The file is read line by line straight into typed arrays, so large files
+    never become networkx objects.
+
+    Parameters:
+    - path (str): The file path.
+    - directed (bool): True to read edges as directed.
+
+    Returns:
+    - Graph: The graph, with the node names from the file as labels.
+    """
+    index: Dict[str, int] = {}
+    sources = array("i")
+    targets = array("i")
+    weights = array("d")
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0][0] in "#%":
+                continue
+            u = index.setdefault(fields[0], len(index))
+            if len(fields) == 1:
+                continue
+            v = index.setdefault(fields[1], len(index))
+            sources.append(u)
+            targets.append(v)
+            weights.append(float(fields[2]) if len(fields) > 2 else 1.0)
+    return Graph.from_edges(len(index), sources, targets, weights,
+                            directed=directed, labels=list(index))
+
+
+def load_graph(
+    path: str,
+    directed: bool = False,
+) -> Graph:
+    """
+    Load a graph file: GraphML ('.graphml') through networkx, DIMACS
+    shortest-path files ('.gr', with coordinates from a '.co' file of the
+    same name if present) through the binary cache of `dimacs`, anything
+    else as an edge list.
+
+    Parameters:
+    - path (str): The file path.
+    - directed (bool): True to read an edge list as directed. GraphML and
+    DIMACS files declare their own direction.
+
+    Returns:
+    - Graph: The graph.
+    """
+    if path.endswith(".gr"):
+        from dimacs import load_dimacs_cached
+
+        co_path = path[:-3] + ".co"
+        return load_dimacs_cached(
+            path, co_path if os.path.exists(co_path) else None
+        )
+    if path.endswith(".graphml"):
+        import networkx
+
+        return graph_from_networkx(networkx.read_graphml(path))
+    return load_edge_list(path, directed)
+
+
+def euclidean_heuristic(
+    graph: Graph,
+    goal: int,
+) -> Callable[[int], float]:
+    """
+    Build the straight-line distance heuristic to a goal node, scaled by
+    `Graph.heuristic_scale` so it never overestimates.
+
+    Parameters:
+    - graph (Graph): A graph with coordinates.
+    - goal (int): The goal node.
+
+    Returns:
+    - Callable[[int], float]: Maps a node to its estimated distance.
+    """
+    coords = graph.coords
+    scale = graph.heuristic_scale()
+    if coords is None or scale == 0.0:
+        return lambda _: 0.0
+    goal_x = coords[2 * goal]
+    goal_y = coords[2 * goal + 1]
+    hypot = math.hypot
+
+    def euclidean(node: int) -> float:
+        return scale * hypot(coords[2 * node] - goal_x,
+                             coords[2 * node + 1] - goal_y)
+    return euclidean
+
+
+def graph_path_cost(
+    graph: Graph,
+    path: List[int],
+) -> float:
+    """
+    Get the cost of a path, taking the lightest edge between each pair of
+    consecutive nodes.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - path (List[int]): Nodes from start to goal.
+
+    Returns:
+    - float: The path cost.
+    """
+    return sum(graph.edge_weight(a, b) for a, b in zip(path, path[1:]))
+
+
+def _walk_back(
+    parent: array,
+    goal: int,
+) -> List[int]:
+    """
+    Rebuild a path by following parent links from the goal.
+    """
+    path = [goal]
+    while parent[path[-1]] != -1:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def _unordered_search(
+    graph: Graph,
+    start: int,
+    goal: int,
+    trace: Optional[List[int]],
+    lifo: bool,
+) -> SearchResult:
+    """
+    Breadth-first (queue) or depth-first (stack) search shared by `bfs` and
+    `dfs`.
+    """
+    t0 = time.perf_counter()
+    offsets = graph.offsets
+    targets = graph.targets
+    parent = array("l", [-1]) * graph.node_count
+    seen = bytearray(graph.node_count)
+    seen[start] = 1
+    frontier = deque([start])
+    pop = frontier.pop if lifo else frontier.popleft
+    push = frontier.append
+    expansions = 0
+
+    while frontier:
+        current = pop()
+        expansions += 1
+        if trace is not None:
+            trace.append(current)
+        if current == goal:
+            path = _walk_back(parent, goal)
+            return SearchResult(True, path, graph_path_cost(graph, path),
+                                expansions, time.perf_counter() - t0)
+        for i in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            if not seen[neighbor]:
+                seen[neighbor] = 1
+                parent[neighbor] = current
+                push(neighbor)
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def bfs(
+    graph: Graph,
+    start: int,
+    goal: int,
+    trace: Optional[List[int]] = None,
+) -> SearchResult:
+    """
+    Breadth-first search, ignoring edge weights.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - start (int): The start node.
+    - goal (int): The goal node.
+    - trace (Optional[List[int]]): If given, expanded nodes are appended to
+    it in order.
+
+    Returns:
+    - SearchResult: The search outcome. The path has the fewest edges.
+    """
+    return _unordered_search(graph, start, goal, trace, lifo=False)
+
+
+def dfs(
+    graph: Graph,
+    start: int,
+    goal: int,
+    trace: Optional[List[int]] = None,
+) -> SearchResult:
+    """
+    Depth-first search. Finds a path, not necessarily a short one.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - start (int): The start node.
+    - goal (int): The goal node.
+    - trace (Optional[List[int]]): If given, expanded nodes are appended to
+    it in order.
+
+    Returns:
+    - SearchResult: The search outcome.
+    """
+    return _unordered_search(graph, start, goal, trace, lifo=True)
+
+
+def a_star(
+    graph: Graph,
+    start: int,
+    goal: int,
+    trace: Optional[List[int]] = None,
+    heuristic: Optional[Callable[[int], float]] = None,
+) -> SearchResult:
+    """
+    A* search with a binary heap and lazy deletion of stale entries.
+
+    Parameters:
+    - graph (Graph): The graph. Edge weights must not be negative.
+    - start (int): The start node.
+    - goal (int): The goal node.
+    - trace (Optional[List[int]]): If given, expanded nodes are appended to
+    it in order.
+    - heuristic (Optional[Callable[[int], float]]): Estimated distance from
+    a node to the goal. Defaults to the scaled straight-line distance when
+    the graph has coordinates and to zero otherwise.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal when the
+    heuristic is admissible.
+    """
+    t0 = time.perf_counter()
+    if heuristic is None:
+        heuristic = euclidean_heuristic(graph, goal)
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    g_score = array("d", [math.inf]) * graph.node_count
+    parent = array("l", [-1]) * graph.node_count
+    g_score[start] = 0.0
+    count = 0
+    open_set = [(heuristic(start), count, 0.0, start)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expansions = 0
+
+    while open_set:
+        _, _, current_g, current = heappop(open_set)
+        if current_g > g_score[current]:
+            continue
+        expansions += 1
+        if trace is not None:
+            trace.append(current)
+        if current == goal:
+            return SearchResult(True, _walk_back(parent, goal), current_g,
+                                expansions, time.perf_counter() - t0)
+
+        for i in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            temp_g_score = current_g + weights[i]
+            if temp_g_score < g_score[neighbor]:
+                g_score[neighbor] = temp_g_score
+                parent[neighbor] = current
+                count += 1
+                heappush(open_set, (temp_g_score + heuristic(neighbor),
+                                    count, temp_g_score, neighbor))
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def dijkstra(
+    graph: Graph,
+    start: int,
+    goal: int,
+    trace: Optional[List[int]] = None,
+) -> SearchResult:
+    """
+    Dijkstra's algorithm, i.e. A* with a zero heuristic.
+
+    Parameters:
+    - graph (Graph): The graph. Edge weights must not be negative.
+    - start (int): The start node.
+    - goal (int): The goal node.
+    - trace (Optional[List[int]]): If given, expanded nodes are appended to
+    it in order.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal.
+    """
+    return a_star(graph, start, goal, trace, heuristic=lambda _: 0.0)
+
+
+SEARCHES = {
+    "a_star": a_star,
+    "bfs": bfs,
+    "dfs": dfs,
+    "dijkstra": dijkstra,
+}
+
+
+def _hop_distances(
+    graph: Graph,
+    source: int,
+) -> array:
+    """
+    Get the number of edges from a node to every node, -1 where
+    unreachable.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    distance = array("l", [-1]) * graph.node_count
+    distance[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        next_distance = distance[current] + 1
+        for i in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            if distance[neighbor] == -1:
+                distance[neighbor] = next_distance
+                queue.append(neighbor)
+    return distance
+
+
+def _normalize(coords: array) -> array:
+    """
+    Scale interleaved x, y coordinates into [0, 1], keeping their aspect
+    ratio.
+    """
+    xs = coords[0::2]
+    ys = coords[1::2]
+    if not xs:
+        return coords
+    min_x, min_y = min(xs), min(ys)
+    span = max(max(xs) - min_x, max(ys) - min_y) or 1.0
+    result = array("d", coords)
+    for node in range(len(xs)):
+        result[2 * node] = (xs[node] - min_x) / span
+        result[2 * node + 1] = (ys[node] - min_y) / span
+    return result
+
+
+def _top_eigenvectors(
+    matrix: List[List[float]],
+    count: int,
+    iterations: int = 100,
+) -> List[List[float]]:
+    """
+    Find the leading eigenvectors of a small symmetric matrix by power
+    iteration with deflation.
+    """
+    size = len(matrix)
+    matrix = [row[:] for row in matrix]
+    vectors = []
+    for k in range(count):
+        vector = [1.0 / (i + k + 1) for i in range(size)]
+        value = 0.0
+        for _ in range(iterations):
+            product = [sum(a * b for a, b in zip(row, vector))
+                       for row in matrix]
+            value = math.sqrt(sum(p * p for p in product))
+            if value == 0.0:
+                break
+            vector = [p / value for p in product]
+        vectors.append(vector)
+        for i in range(size):
+            for j in range(size):
+                matrix[i][j] -= value * vector[i] * vector[j]
+    return vectors
+
+
+def compute_layout(
+    graph: Graph,
+    seed: int = 0,
+    pivots: int = LAYOUT_PIVOTS,
+) -> array:
+    """
+    Compute node positions for drawing.
+
+    Graphs with coordinates use them. Otherwise the layout is a
+    high-dimensional embedding: hop distances from a few far-apart pivot
+    nodes give every node a short vector, and projecting those vectors on
+    their two principal axes places nearby nodes together. It needs one
+    breadth-first search per pivot, so it stays fast on 100k-node graphs
+    where force-directed layouts do not.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - seed (int): Random seed for the first pivot.
+    - pivots (int): The number of pivots.
+
+    Returns:
+    - array: x, y per node, interleaved and scaled to [0, 1].
+    """
+    n = graph.node_count
+    if graph.coords is not None:
+        return _normalize(graph.coords)
+    if n == 0:
+        return array("d")
+
+    # farthest-first pivots inside the component of the best-connected
+    # node; nodes the pivots cannot reach get the mean distance, which
+    # places them at the centre instead of stretching the layout
+    offsets = graph.offsets
+    hub = max(range(n), key=lambda node: offsets[node + 1] - offsets[node])
+    reached = [node for node, d in enumerate(_hop_distances(graph, hub))
+               if d != -1]
+    pivot = random.Random(seed).choice(reached)
+    columns = []
+    closest = array("l", [-1]) * n
+    for node in reached:
+        closest[node] = n
+    for _ in range(min(pivots, len(reached))):
+        distance = _hop_distances(graph, pivot)
+        mean = sum(distance[node] for node in reached) / len(reached)
+        columns.append(array("d", (
+            0.0 if d == -1 else d - mean for d in distance
+        )))
+        for node in reached:
+            if distance[node] < closest[node]:
+                closest[node] = distance[node]
+        pivot = max(reached, key=closest.__getitem__)
+
+    size = len(columns)
+    covariance = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i, size):
+            value = sum(a * b for a, b in zip(columns[i], columns[j]))
+            covariance[i][j] = covariance[j][i] = value
+    axes = _top_eigenvectors(covariance, 2)
+    while len(axes) < 2:
+        axes.append([0.0] * size)
+
+    coords = array("d", [0.0]) * (2 * n)
+    for axis, vector in enumerate(axes):
+        for weight, column in zip(vector, columns):
+            if weight == 0.0:
+                continue
+            for node in range(n):
+                coords[2 * node + axis] += weight * column[node]
+    return _normalize(coords)
+
+
+def layout_path(graph_path: str) -> str:
+    """
+    Get the path of the layout stored next to a graph file.
+
+    Parameters:
+    - graph_path (str): The graph file.
+
+    Returns:
+    - str: The layout's file path.
+    """
+    return f"{graph_path}.layout"
+
+
+def save_layout(
+    graph: Graph,
+    layout: array,
+    path: str,
+) -> None:
+    """
+    Write a layout to a binary file.
+
+    Parameters:
+    - graph (Graph): The graph the layout belongs to.
+    - layout (array): x, y per node, interleaved.
+    - path (str): The file path.
+    """
+    with open(path, "wb") as f:
+        f.write(LAYOUT_HEADER.pack(LAYOUT_MAGIC, graph.node_count,
+                                   graph.version()))
+        f.write(layout.tobytes())
+
+
+def load_layout(
+    graph: Graph,
+    path: str,
+) -> Optional[array]:
+    """
+    Read a layout written by `save_layout`, if it matches the graph.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - path (str): The file path.
+
+    Returns:
+    - Optional[array]: The layout, or None if the file is missing or was
+    written for a different graph.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        header = f.read(LAYOUT_HEADER.size)
+        if len(header) != LAYOUT_HEADER.size:
+            return None
+        magic, node_count, version = LAYOUT_HEADER.unpack(header)
+        if (
+            magic != LAYOUT_MAGIC
+            or node_count != graph.node_count
+            or version != graph.version()
+        ):
+            return None
+        layout = array("d")
+        layout.frombytes(f.read(16 * node_count))
+    return layout if len(layout) == 2 * node_count else None
+
+
+def load_or_compute_layout(
+    graph_path: str,
+    graph: Graph,
+    seed: int = 0,
+) -> array:
+    """
+    Load the layout stored next to a graph file, computing and storing it
+    when missing or out of date. The result is also cached on the graph.
+
+    Parameters:
+    - graph_path (str): The graph file; the layout lives in
+    '<graph_path>.layout'.
+    - graph (Graph): The loaded graph.
+    - seed (int): Random seed used when the graph has no coordinates.
+
+    Returns:
+    - array: x, y per node, interleaved and scaled to [0, 1].
+    """
+    path = layout_path(graph_path)
+    layout = load_layout(graph, path)
+    if layout is None:
+        layout = graph.layout(seed)
+        save_layout(graph, layout, path)
+    graph._layout = layout
+    return layout
@@ -0,0 +1,289 @@
+from array import array
+from typing import List, Optional, Tuple
+import pygame
+from game import display_no_path_message, draw_stats
+from graph import SEARCHES, Graph
+from spot import colors
+
+
+MARGIN = 12
+# graphs above this size draw nodes as single pixels
+SMALL_GRAPH = 5000
+# animations are paced to finish in about this many seconds
+ANIMATION_SECONDS = 3.0
+
+
+def screen_positions(
+    layout: array,
+    width: int,
+    margin: int = MARGIN,
+) -> Tuple[array, array]:
+    """
+    Convert a layout in [0, 1] to pixel positions in a square window.
+
+    Parameters:
+    - layout (array): x, y per node, interleaved and scaled to [0, 1].
+    - width (int): The window width in pixels.
+    - margin (int): The empty border in pixels.
+
+    Returns:
+    - Tuple[array, array]: The x and y pixel position of each node.
+    """
+    span = width - 2 * margin - 1
+    xs = array("i", (margin + int(x * span) for x in layout[0::2]))
+    ys = array("i", (margin + int(y * span) for y in layout[1::2]))
+    return xs, ys
+
+
+def node_radius(graph: Graph) -> int:
+    """
+    Get the drawn radius of the nodes of a graph.
+
+    Parameters:
+    - graph (Graph): The graph.
+
+    Returns:
+    - int: The radius in pixels, 0 for single-pixel nodes.
+    """
+    return 3 if graph.node_count <= SMALL_GRAPH else 0
+
+
+def draw_nodes(
+    surface: pygame.Surface,
+    nodes,
+    xs: array,
+    ys: array,
+    color: Tuple[int, int, int],
+    radius: int,
+) -> None:
+    """
+    Draw a set of nodes in one colour.
+
+    Parameters:
+    - surface (pygame.Surface): The surface to draw on.
+    - nodes (Iterable[int]): The nodes to draw.
+    - xs (array): The x pixel position of each node.
+    - ys (array): The y pixel position of each node.
+    - color (Tuple[int, int, int]): The colour.
+    - radius (int): The node radius, 0 for single pixels.
+    """
+    if radius == 0:
+        set_at = surface.set_at
+        for node in nodes:
+            set_at((xs[node], ys[node]), color)
+        return
+    circle = pygame.draw.circle
+    for node in nodes:
+        circle(surface, color, (xs[node], ys[node]), radius)
+
+
+def render_background(
+    graph: Graph,
+    xs: array,
+    ys: array,
+    width: int,
+) -> pygame.Surface:
+    """
+    Draw every edge and node once onto a surface that is reused as the
+    background of each frame.
+
+    Parameters:
+    - graph (Graph): The graph.
+    - xs (array): The x pixel position of each node.
+    - ys (array): The y pixel position of each node.
+    - width (int): The window width in pixels.
+
+    Returns:
+    - pygame.Surface: The background surface.
+    """
+    surface = pygame.Surface((width, width))
+    surface.fill(colors["white"])
+    offsets = graph.offsets
+    targets = graph.targets
+    line = pygame.draw.line
+    grey = colors["grey"]
+    for node in range(graph.node_count):
+        start = (xs[node], ys[node])
+        for i in range(offsets[node], offsets[node + 1]):
+            target = targets[i]
+            # undirected edges are stored twice; draw them once
+            if graph.directed or target > node:
+                line(surface, grey, start, (xs[target], ys[target]))
+    draw_nodes(surface, range(graph.node_count), xs, ys, colors["black"],
+               node_radius(graph))
+    return surface
+
+
+def nearest_node(
+    xs: array,
+    ys: array,
+    pos: Tuple[int, int],
+) -> int:
+    """
+    Find the node drawn closest to a pixel position.
+
+    Parameters:
+    - xs (array): The x pixel position of each node.
+    - ys (array): The y pixel position of each node.
+    - pos (Tuple[int, int]): The pixel position, e.g. of a mouse click.
+
+    Returns:
+    - int: The closest node.
+    """
+    x, y = pos
+    return min(range(len(xs)),
+               key=lambda node: (xs[node] - x) ** 2 + (ys[node] - y) ** 2)
+
+
+def draw_path(
+    surface: pygame.Surface,
+    path: List[int],
+    xs: array,
+    ys: array,
+) -> None:
+    """
+    Draw a path as a thick polyline.
+
+    Parameters:
+    - surface (pygame.Surface): The surface to draw on.
+    - path (List[int]): Nodes from start to goal.
+    - xs (array): The x pixel position of each node.
+    - ys (array): The y pixel position of each node.
+    """
+    if len(path) > 1:
+        pygame.draw.lines(surface, colors["purple"], False,
+                          [(xs[node], ys[node]) for node in path], 3)
+
+
+def run_graph_view(
+    graph: Graph,
+    width: int,
+    win: pygame.Surface,
+    algorithm: str,
+    steps_per_frame: Optional[int] = None,
+    fps: int = 60,
+) -> None:
+    """
+    Run the interactive graph mode: pick a start node with the left mouse
+    button and a goal with the right one, press SPACE to search and C to
+    clear.
+
+    The search runs headless on the compact graph, then its expansions are
+    replayed onto a copy of the cached background, so each frame only draws
+    the nodes expanded since the last one.
+
+    Parameters:
+    - graph (Graph): The graph, with its layout cached by
+    `Graph.layout` or `load_or_compute_layout`.
+    - width (int): The window width in pixels.
+    - win (pygame.Surface): The pygame window surface.
+    - algorithm (str): The algorithm name in `graph.SEARCHES`.
+    - steps_per_frame (Optional[int]): Expansions shown per frame (default:
+    enough to finish in about `ANIMATION_SECONDS`).
+    - fps (int): The frame rate cap.
+    """
+    xs, ys = screen_positions(graph.layout(), width)
+    background = render_background(graph, xs, ys, width)
+    radius = max(node_radius(graph), 2)
+    clock = pygame.time.Clock()
+
+    start: Optional[int] = None
+    goal: Optional[int] = None
+    canvas = background.copy()
+    run = True
+    while run:
+        win.blit(canvas, (0, 0))
+        if start is not None:
+            draw_nodes(win, [start], xs, ys, colors["orange"], radius + 2)
+        if goal is not None:
+            draw_nodes(win, [goal], xs, ys, colors["turquoise"], radius + 2)
+        pygame.display.update()
+        clock.tick(fps)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (
+                1, 3
+            ):
+                node = nearest_node(xs, ys, event.pos)
+                if event.button == 1:
+                    start = node
+                else:
+                    goal = node
+                canvas = background.copy()
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_c:
+                    start = goal = None
+                    canvas = background.copy()
+
+                elif (
+                    event.key == pygame.K_SPACE
+                    and start is not None
+                    and goal is not None
+                ):
+                    canvas = background.copy()
+                    trace: List[int] = []
+                    result = SEARCHES[algorithm](graph, start, goal, trace)
+                    run = animate_search(win, canvas, trace, result.path, xs,
+                                         ys, node_radius(graph),
+                                         steps_per_frame, fps)
+                    if not run:
+                        break
+                    if result.found:
+                        # on the canvas, so the stats stay until cleared
+                        draw_stats(canvas, result.expansions, result.seconds)
+                    else:
+                        display_no_path_message(win, "No path found!")
+
+
+def animate_search(
+    win: pygame.Surface,
+    canvas: pygame.Surface,
+    trace: List[int],
+    path: List[int],
+    xs: array,
+    ys: array,
+    radius: int,
+    steps_per_frame: Optional[int] = None,
+    fps: int = 60,
+) -> bool:
+    """
+    Replay a search's expansions onto a canvas, then draw its path.
+
+    Parameters:
+    - win (pygame.Surface): The pygame window surface.
+    - canvas (pygame.Surface): The background copy the expansions are
+    drawn onto; it keeps them for later frames.
+    - trace (List[int]): Expanded nodes in order.
+    - path (List[int]): The path found, empty if none.
+    - xs (array): The x pixel position of each node.
+    - ys (array): The y pixel position of each node.
+    - radius (int): The node radius, 0 for single pixels.
+    - steps_per_frame (Optional[int]): Expansions shown per frame.
+    - fps (int): The frame rate cap.
+
+    Returns:
+    - bool: False if the window was closed during the animation.
+    """
+    if steps_per_frame is None:
+        steps_per_frame = max(1, int(len(trace) / (ANIMATION_SECONDS * fps)))
+    clock = pygame.time.Clock()
+    shown = 0
+    while shown < len(trace):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        draw_nodes(canvas, trace[shown:shown + steps_per_frame], xs, ys,
+                   colors["red"], radius)
+        shown += steps_per_frame
+        win.blit(canvas, (0, 0))
+        pygame.display.update()
+        clock.tick(fps)
+
+    draw_path(canvas, path, xs, ys)
+    win.blit(canvas, (0, 0))
+    pygame.display.update()
+    return True
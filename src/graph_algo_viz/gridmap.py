@@ -0,0 +1,279 @@
+from typing import List, Optional, Tuple
+from spot import Spot
+
+
+class GridMap:
+    """
+    Array-backed storage for a grid's barriers, used for building and
+    searching maps without per-cell Python objects.
+
+    Cells are stored row-major in a bytearray, one byte per cell: 1 for a
+    barrier and 0 for a passable cell. Cell (row, col) corresponds to
+    `grid[row][col]` in a grid of 'Spot' objects.
+
+    Parameters:
+    - rows (int): The number of rows in the grid.
+    - cols (Optional[int]): The number of columns (default: same as rows).
+    - cells (Optional[bytearray]): Existing cell storage of size rows * cols.
+
+    Attributes:
+    - rows (int): The number of rows.
+    - cols (int): The number of columns.
+    - cells (bytearray): The cell storage.
+    """
+    def __init__(
+        self,
+        rows: int,
+        cols: Optional[int] = None,
+        cells: Optional[bytearray] = None,
+    ) -> None:
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        if cells is None:
+            cells = bytearray(self.rows * self.cols)
+        if len(cells) != self.rows * self.cols:
+            raise ValueError(
+                f"Expected {self.rows * self.cols} cells, got {len(cells)}"
+            )
+        self.cells = cells
+
+    def __len__(self) -> int:
+        """
+        Get the number of cells in the grid.
+
+        Returns:
+        - int: rows * cols.
+        """
+        return self.rows * self.cols
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Get the row-major index of a cell.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - col (int): The column of the cell.
+
+        Returns:
+        - int: The index of the cell in `cells`.
+        """
+        return row * self.cols + col
+
+    def pos(self, index: int) -> Tuple[int, int]:
+        """
+        Get the (row, col) position of a cell index.
+
+        Parameters:
+        - index (int): The index of the cell in `cells`.
+
+        Returns:
+        - Tuple[int, int]: The (row, col) coordinates of the cell.
+        """
+        return divmod(index, self.cols)
+
+    def is_barrier(self, row: int, col: int) -> bool:
+        """
+        Check if a cell is a barrier.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - col (int): The column of the cell.
+
+        Returns:
+        - bool: True if the cell is a barrier, False otherwise.
+        """
+        return self.cells[row * self.cols + col] == 1
+
+    def set_barrier(self, row: int, col: int, barrier: bool = True) -> None:
+        """
+        Make a cell a barrier or passable.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - col (int): The column of the cell.
+        - barrier (bool): True to make a barrier, False to clear it.
+        """
+        self.cells[row * self.cols + col] = 1 if barrier else 0
+
+    def density(self) -> float:
+        """
+        Get the fraction of cells that are barriers.
+
+        Returns:
+        - float: The barrier density between 0 and 1.
+        """
+        if not self.cells:
+            return 0.0
+        return self.cells.count(1) / len(self.cells)
+
+    def copy(self) -> "GridMap":
+        """
+        Get an independent copy of the map.
+
+        Returns:
+        - GridMap: A copy with its own cell storage.
+        """
+        return GridMap(self.rows, self.cols, bytearray(self.cells))
+
+
+# barrier edits made in place to grids of 'Spot' objects, bumped by
+# `grid_edited`
+_grid_edits = {"count": 0}
+
+
+def grid_edited() -> None:
+    """
+    Note that the barriers of a grid of 'Spot' objects were changed in
+    place, so that data cached for a grid, such as landmark tables, is
+    checked against it again.
+    """
+    _grid_edits["count"] += 1
+
+
+def grid_edit_count() -> int:
+    """
+    Get the number of in-place barrier edits noted with `grid_edited`.
+
+    Returns:
+    - int: The edit count, which only grows.
+    """
+    return _grid_edits["count"]
+
+
+def map_from_grid(grid: List[List[Spot]]) -> GridMap:
+    """
+    Build a GridMap from the barriers of a grid of 'Spot' objects.
+
+    Parameters:
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects.
+
+    Returns:
+    - GridMap: The barriers of the grid.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    cells = bytearray(
+        1 if spot.is_barrier() else 0 for row in grid for spot in row
+    )
+    return GridMap(rows, cols, cells)
+
+
+def apply_to_grid(
+    gmap: GridMap,
+    grid: List[List[Spot]],
+) -> None:
+    """
+    Copy the barriers of a GridMap onto a grid of 'Spot' objects of the same
+    size. Start and end spots are kept and become passable, and every other
+    spot is either a barrier or reset.
+
+    Parameters:
+    - gmap (GridMap): The map to copy from.
+    - grid (List[List[Spot]]): A 2D list of 'Spot' objects to update.
+    """
+    grid_edited()
+    cells = gmap.cells
+    cols = gmap.cols
+    for i, row in enumerate(grid):
+        base = i * cols
+        for j, spot in enumerate(row):
+            if spot.is_start() or spot.is_end():
+                continue
+            if cells[base + j]:
+                spot.make_barrier()
+            else:
+                spot.reset()
+
+
+def grid_from_map(
+    gmap: GridMap,
+    width: int = 1,
+) -> List[List[Spot]]:
+    """
+    Build a grid of 'Spot' objects with the barriers of a square GridMap and
+    up-to-date neighbors, e.g. for running the algorithms headless.
+
+    Parameters:
+    - gmap (GridMap): The map to build from. It must be square.
+    - width (int): The width of each cell in pixels.
+
+    Returns:
+    - List[List[Spot]]: A 2D list of 'Spot' objects.
+    """
+    if gmap.rows != gmap.cols:
+        raise ValueError("Spot grids must be square")
+    rows = gmap.rows
+    grid = [
+        [Spot(i, j, width, rows) for j in range(rows)] for i in range(rows)
+    ]
+    apply_to_grid(gmap, grid)
+    for row in grid:
+        for spot in row:
+            spot.update_neighbors(grid)
+    return grid
+
+
+# MovingAI terrain characters that can be walked on
+PASSABLE_TERRAIN = frozenset(".GS")
+
+
+def load_movingai_map(path: str) -> GridMap:
+    """
+    Load a map in the MovingAI benchmark '.map' format.
+
+    The file has a 'type', 'height' and 'width' header followed by 'map' and
+    one line of terrain characters per row. '.', 'G' and 'S' are passable;
+    every other character is a barrier. Cell (row, col) is (y, x) in the
+    file.
+
+    Parameters:
+    - path (str): The path of the '.map' file.
+
+    Returns:
+    - GridMap: The loaded map.
+    """
+    header = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line == "map":
+                break
+            if line:
+                key, value = line.split(maxsplit=1)
+                header[key] = value
+        rows = int(header["height"])
+        cols = int(header["width"])
+        table = bytes(
+            0 if chr(value) in PASSABLE_TERRAIN else 1 for value in range(256)
+        )
+        cells = bytearray()
+        for _ in range(rows):
+            line = f.readline().rstrip("\r\n")
+            if len(line) != cols:
+                raise ValueError(
+                    f"{path}: expected rows of width {cols}, got {len(line)}"
+                )
+            cells += line.encode("latin-1").translate(table)
+    return GridMap(rows, cols, cells)
+
+
+def save_movingai_map(
+    gmap: GridMap,
+    path: str,
+) -> None:
+    """
+    Save a map in the MovingAI benchmark '.map' format, with '.' for passable
+    cells and '@' for barriers.
+
+    Parameters:
+    - gmap (GridMap): The map to save.
+    - path (str): The path of the '.map' file.
+    """
+    table = bytes.maketrans(b"\x00\x01", b".@")
+    with open(path, "w") as f:
+        f.write(
+            f"type octile\nheight {gmap.rows}\nwidth {gmap.cols}\nmap\n"
+        )
+        for row in range(gmap.rows):
+            line = gmap.cells[row * gmap.cols:(row + 1) * gmap.cols]
+            f.write(bytes(line).translate(table).decode() + "\n")
@@ -0,0 +1,220 @@
+import time
+from typing import Dict, Iterable, Optional, Tuple
+import pygame
+from live import LiveSearch
+from spot import colors
+
+
+# fonts by (name, size); looking a system font up takes milliseconds
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+
+def get_font(
+    name: Optional[str],
+    size: int,
+) -> pygame.font.Font:
+    """
+    Get a font, loading it only on first use.
+
+    Parameters:
+    - name (Optional[str]): A system font name, e.g. 'Arial', or None for
+    pygame's default font.
+    - size (int): The font size.
+
+    Returns:
+    - pygame.font.Font: The font.
+    """
+    font = _fonts.get((name, size))
+    if font is None:
+        font = (pygame.font.SysFont(name, size) if name
+                else pygame.font.Font(None, size))
+        _fonts[(name, size)] = font
+    return font
+
+
+class GlyphCache:
+    """
+    Draw text from surfaces rendered once.
+
+    Labels are rendered whole the first time they are drawn. Values change
+    every frame, so they are drawn character by character from glyphs, and
+    a number never renders text again after its digits were first seen.
+
+    Parameters:
+    - font (pygame.font.Font): The font to render with.
+    - color (tuple): The text colour.
+    """
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        color: tuple,
+    ) -> None:
+        self.font = font
+        self.color = color
+        self._labels: Dict[str, pygame.Surface] = {}
+        self._glyphs: Dict[str, pygame.Surface] = {
+            char: font.render(char, True, color) for char in "0123456789.,-"
+        }
+
+    def draw_label(
+        self,
+        win: pygame.Surface,
+        text: str,
+        pos: Tuple[int, int],
+    ) -> int:
+        """
+        Draw a label, rendering it on first use.
+
+        Parameters:
+        - win (pygame.Surface): The surface to draw on.
+        - text (str): The label.
+        - pos (Tuple[int, int]): The top left corner.
+
+        Returns:
+        - int: The x coordinate right of the label.
+        """
+        surface = self._labels.get(text)
+        if surface is None:
+            surface = self._labels[text] = self.font.render(text, True,
+                                                            self.color)
+        win.blit(surface, pos)
+        return pos[0] + surface.get_width()
+
+    def draw_value(
+        self,
+        win: pygame.Surface,
+        text: str,
+        pos: Tuple[int, int],
+    ) -> int:
+        """
+        Draw a value glyph by glyph.
+
+        Parameters:
+        - win (pygame.Surface): The surface to draw on.
+        - text (str): The value, e.g. '1,024' or '3.25'.
+        - pos (Tuple[int, int]): The top left corner.
+
+        Returns:
+        - int: The x coordinate right of the value.
+        """
+        x, y = pos
+        for char in text:
+            glyph = self._glyphs.get(char)
+            if glyph is None:
+                glyph = self._glyphs[char] = self.font.render(char, True,
+                                                              self.color)
+            win.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x
+
+
+class Hud:
+    """
+    Live statistics of the running search, drawn over the grid every frame.
+
+    Shows the expansions shown so far, the search's expansions per second
+    of CPU time, the size of the open set on screen, the last frame's time,
+    the search thread's CPU time and the wall-clock time spent drawing
+    frames.
+
+    Attributes:
+    - visible (bool): Whether `draw` draws anything.
+    - frame_time (float): The last frame's time in seconds, without the
+    wait for the next frame.
+    - render_time (float): Time spent drawing frames since `reset`.
+    """
+    LABELS = ("Expansions", "Exp/s", "Open", "Frame ms", "CPU ms",
+              "Render ms")
+
+    def __init__(
+        self,
+        font: Optional[pygame.font.Font] = None,
+    ) -> None:
+        self.glyphs = GlyphCache(font or get_font(None, 22), colors["black"])
+        self.visible = True
+        self.frame_time = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Start counting for a new search.
+        """
+        self.render_time = 0.0
+        self._open: set = set()
+
+    def track(
+        self,
+        events: Iterable[Tuple[int, int, int, str]],
+    ) -> None:
+        """
+        Follow the open set through the changes shown on the grid.
+
+        Parameters:
+        - events (Iterable[Tuple[int, int, int, str]]): (step, row, col,
+        state) events, as recorded by `SearchRecorder`.
+        """
+        for _, row, col, state in events:
+            if state == "open":
+                self._open.add((row, col))
+            else:
+                self._open.discard((row, col))
+
+    def timed(
+        self,
+        frame_start: float,
+        render_start: float,
+        searching: bool,
+    ) -> None:
+        """
+        Record the time of a frame that just finished drawing.
+
+        Parameters:
+        - frame_start (float): `time.perf_counter()` when the frame began.
+        - render_start (float): `time.perf_counter()` when drawing began.
+        - searching (bool): Whether a search was being shown, so the time
+        counts as render time.
+        """
+        now = time.perf_counter()
+        self.frame_time = now - frame_start
+        if searching:
+            self.render_time += now - render_start
+
+    def draw(
+        self,
+        win: pygame.Surface,
+        search: Optional[LiveSearch] = None,
+    ) -> None:
+        """
+        Draw the statistics in the top left corner.
+
+        Parameters:
+        - win (pygame.Surface): The surface to draw on.
+        - search (Optional[LiveSearch]): The running or last search, if any.
+        """
+        if not self.visible:
+            return
+        expansions, rate, compute = 0, 0.0, 0.0
+        if search is not None:
+            recorder = search.recorder
+            compute = (recorder.compute_time if search.finished
+                       else recorder.step_times[-1])
+            expansions = min(search.shown_steps, recorder.expansions)
+            if search.done:
+                expansions = recorder.expansions
+            if compute > 0:
+                rate = recorder.steps / compute
+        values = (
+            f"{expansions:,}",
+            f"{rate:,.0f}",
+            f"{len(self._open):,}",
+            f"{self.frame_time * 1000:.2f}",
+            f"{compute * 1000:,.1f}",
+            f"{self.render_time * 1000:,.1f}",
+        )
+
+        height = self.glyphs.font.get_linesize()
+        win.fill(colors["white"], (0, 0, 210, height * len(values) + 8))
+        for i, (label, value) in enumerate(zip(self.LABELS, values)):
+            y = 4 + i * height
+            self.glyphs.draw_label(win, label, (6, y))
+            self.glyphs.draw_value(win, value, (110, y))
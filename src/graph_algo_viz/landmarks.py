@@ -0,0 +1,486 @@
+import argparse
+import math
+import os
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from components import ComponentIndex
+from gridmap import GridMap, load_movingai_map
+from search import a_star, distance_field, make_heuristic
+
+
+MAGIC = b"ALT2"
+# magic, rows, cols, crc32 of the cells, landmark count, requested count,
+# selection, connectivity, distance scale, table typecode
+HEADER = struct.Struct("<4sIIIII8sIIc")
+UNREACHABLE = {"H": 0xFFFF, "I": 0xFFFFFFFF}
+# fixed-point scale for the non-integer distances of 8-connected grids
+OCTILE_SCALE = 1024
+
+
+def map_version(gmap: GridMap) -> int:
+    """
+    Get a checksum identifying the current barriers of a map, used to tell
+    whether stored landmark tables still match it.
+
+    Parameters:
+    - gmap (GridMap): The map.
+
+    Returns:
+    - int: The CRC-32 of the map's cells.
+    """
+    return zlib.crc32(gmap.cells)
+
+
+def _typecode(table) -> str:
+    """Get the item type of a table, an array or a memoryview cast to one."""
+    return table.typecode if isinstance(table, array) else table.format
+
+
+def _largest_component(gmap: GridMap) -> List[int]:
+    """
+    List the cells of the largest connected component of a map.
+
+    Parameters:
+    - gmap (GridMap): The map.
+
+    Returns:
+    - List[int]: The cell indices of the component.
+    """
+    index = ComponentIndex(gmap)
+    components = [index.component(cell) for cell in range(len(gmap))]
+    sizes = Counter(component for component in components if component != -1)
+    if not sizes:
+        return []
+    largest = sizes.most_common(1)[0][0]
+    return [cell for cell, component in enumerate(components)
+            if component == largest]
+
+
+def select_farthest(
+    gmap: GridMap,
+    count: int,
+    connectivity: int = 4,
+    seed: int = 0,
+) -> List[int]:
+    """
+    Pick landmarks by farthest-point selection: the first is the cell
+    farthest from a random cell, and each next one is the cell farthest from
+    every landmark chosen so far. Landmarks are placed in the largest
+    component.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - count (int): The number of landmarks.
+    - connectivity (int): 4 or 8.
+    - seed (int): Random seed for the initial cell.
+
+    Returns:
+    - List[int]: The landmark cell indices.
+    """
+    component = _largest_component(gmap)
+    if not component:
+        return []
+    first = random.Random(seed).choice(component)
+    nearest = distance_field(gmap, first, connectivity)
+    landmarks: List[int] = []
+    for _ in range(min(count, len(component))):
+        landmark = max(component, key=nearest.__getitem__)
+        if landmarks and nearest[landmark] == 0:
+            break
+        landmarks.append(landmark)
+        field = distance_field(gmap, landmark, connectivity)
+        if len(landmarks) == 1:
+            nearest = field
+        else:
+            nearest = array("d", map(min, nearest, field))
+    return landmarks
+
+
+def select_planar(
+    gmap: GridMap,
+    count: int,
+    connectivity: int = 4,
+    seed: int = 0,
+) -> List[int]:
+    """
+    Pick landmarks by planar selection: split the largest component into
+    `count` equal angular sectors around its centre and take the cell
+    farthest from the centre in each sector, which spreads landmarks around
+    the map's border.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - count (int): The number of landmarks.
+    - connectivity (int): Unused, kept for a common signature.
+    - seed (int): Unused, kept for a common signature.
+
+    Returns:
+    - List[int]: The landmark cell indices.
+    """
+    component = _largest_component(gmap)
+    if not component or count <= 0:
+        return []
+    cols = gmap.cols
+    centre_row = sum(cell // cols for cell in component) / len(component)
+    centre_col = sum(cell % cols for cell in component) / len(component)
+
+    best: Dict[int, Tuple[float, int]] = {}
+    for cell in component:
+        dr = cell // cols - centre_row
+        dc = cell % cols - centre_col
+        sector = int((math.atan2(dr, dc) + math.pi) / (2 * math.pi) * count)
+        sector = min(sector, count - 1)
+        radius = dr * dr + dc * dc
+        if sector not in best or radius > best[sector][0]:
+            best[sector] = (radius, cell)
+    return [cell for _, cell in best.values()]
+
+
+SELECTIONS = {
+    "farthest": select_farthest,
+    "planar": select_planar,
+}
+
+
+class Landmarks:
+    """
+    Exact distance tables from a few landmark cells, used for the ALT
+    (A*, Landmarks, Triangle inequality) heuristic.
+
+    For any landmark L, |d(L, goal) - d(L, n)| never exceeds the distance
+    from n to the goal, so the largest such difference is an admissible
+    heuristic that is far tighter than Manhattan distance on maze-like
+    maps. Distances are stored as unsigned 16-bit integers where they fit
+    and 32-bit otherwise; 8-connected distances are stored in fixed point.
+
+    Parameters:
+    - gmap (GridMap): The map the tables were built for.
+    - indices (List[int]): The landmark cell indices.
+    - tables (List[array]): One distance table per landmark, or
+    memoryviews cast to the same typecode.
+    - connectivity (int): 4 or 8.
+    - scale (int): Fixed-point scale of the stored distances.
+    - version (int): The map version the tables were built for.
+    - selection (str): How the landmarks were selected.
+    - requested (Optional[int]): The number of landmarks asked for, which
+    can exceed the number found (default: the number found).
+    """
+    def __init__(
+        self,
+        gmap: GridMap,
+        indices: List[int],
+        tables: List[array],
+        connectivity: int,
+        scale: int,
+        version: int,
+        selection: str = "farthest",
+        requested: Optional[int] = None,
+    ) -> None:
+        self.gmap = gmap
+        self.indices = indices
+        self.tables = tables
+        self.connectivity = connectivity
+        self.scale = scale
+        self.version = version
+        self.selection = selection
+        self.requested = len(indices) if requested is None else requested
+
+    @classmethod
+    def build(
+        cls,
+        gmap: GridMap,
+        count: int = 8,
+        selection: str = "farthest",
+        connectivity: int = 4,
+        seed: int = 0,
+    ) -> "Landmarks":
+        """
+        Select landmarks and precompute their distance tables.
+
+        Parameters:
+        - gmap (GridMap): The map.
+        - count (int): The number of landmarks.
+        - selection (str): 'farthest' or 'planar'.
+        - connectivity (int): 4 or 8.
+        - seed (int): Random seed for the selection.
+
+        Returns:
+        - Landmarks: The landmark tables.
+        """
+        indices = SELECTIONS[selection](gmap, count, connectivity, seed)
+        scale = 1 if connectivity == 4 else OCTILE_SCALE
+        fields = [distance_field(gmap, index, connectivity)
+                  for index in indices]
+        scaled = [
+            [-1 if d == math.inf else round(d * scale) for d in field]
+            for field in fields
+        ]
+        # the rounded distances must stay below the unreachable sentinel
+        longest = max((max(field) for field in scaled), default=0)
+        typecode = "H" if longest < UNREACHABLE["H"] else "I"
+        unreachable = UNREACHABLE[typecode]
+        tables = [
+            array(typecode, (unreachable if d == -1 else d for d in field))
+            for field in scaled
+        ]
+        return cls(gmap, indices, tables, connectivity, scale,
+                   map_version(gmap), selection, count)
+
+    def memory_bytes(self) -> int:
+        """
+        Get the memory used by the distance tables.
+
+        Returns:
+        - int: The size of the tables in bytes.
+        """
+        return sum(table.itemsize * len(table) for table in self.tables)
+
+    def is_current(self, gmap: GridMap) -> bool:
+        """
+        Check if the tables were built for the map's current barriers.
+
+        Parameters:
+        - gmap (GridMap): The map.
+
+        Returns:
+        - bool: True if the tables match the map.
+        """
+        return (
+            (gmap.rows, gmap.cols) == (self.gmap.rows, self.gmap.cols)
+            and map_version(gmap) == self.version
+        )
+
+    def heuristic(self, goal: int) -> Callable[[int], float]:
+        """
+        Build the ALT heuristic to a goal cell, never weaker than the
+        Manhattan or octile distance.
+
+        Parameters:
+        - goal (int): The goal cell index.
+
+        Returns:
+        - Callable[[int], float]: Maps a cell index to its estimated
+        distance.
+        """
+        base = make_heuristic(self.gmap, goal, self.connectivity)
+        if not self.tables:
+            return base
+        unreachable = UNREACHABLE[_typecode(self.tables[0])]
+        pairs = [(table, table[goal]) for table in self.tables
+                 if table[goal] != unreachable]
+        scale = self.scale
+        # rounding to fixed point can overstate a difference by one unit
+        margin = 0 if scale == 1 else 1
+
+        def alt(index: int) -> float:
+            best = 0
+            for table, to_goal in pairs:
+                to_node = table[index]
+                if to_node == unreachable:
+                    continue
+                diff = to_node - to_goal if to_node > to_goal else \
+                    to_goal - to_node
+                if diff > best:
+                    best = diff
+            estimate = (best - margin) / scale
+            fallback = base(index)
+            return estimate if estimate > fallback else fallback
+
+        return alt
+
+    def save(self, path: str) -> None:
+        """
+        Write the tables to a binary file.
+
+        Parameters:
+        - path (str): The file path.
+        """
+        typecode = _typecode(self.tables[0]) if self.tables else "H"
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(
+                MAGIC, self.gmap.rows, self.gmap.cols, self.version,
+                len(self.indices), self.requested, self.selection.encode(),
+                self.connectivity, self.scale, typecode.encode(),
+            ))
+            f.write(array("I", self.indices).tobytes())
+            for table in self.tables:
+                f.write(table.tobytes())
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        gmap: GridMap,
+        connectivity: int = 4,
+    ) -> Optional["Landmarks"]:
+        """
+        Read tables written by `save`, if they match the map.
+
+        Parameters:
+        - path (str): The file path.
+        - gmap (GridMap): The map the tables should belong to.
+        - connectivity (int): The connectivity the tables should use.
+
+        Returns:
+        - Optional[Landmarks]: The tables, or None if the file is missing
+        or was built for a different map or connectivity.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return None
+            (magic, rows, cols, version, count, requested, selection,
+             stored_connectivity, scale, typecode) = HEADER.unpack(header)
+            if (
+                magic != MAGIC
+                or (rows, cols) != (gmap.rows, gmap.cols)
+                or version != map_version(gmap)
+                or stored_connectivity != connectivity
+            ):
+                return None
+            indices = array("I")
+            indices.frombytes(f.read(4 * count))
+            tables = []
+            for _ in range(count):
+                table = array(typecode.decode())
+                table.frombytes(f.read(table.itemsize * len(gmap)))
+                tables.append(table)
+        return cls(gmap, list(indices), tables, connectivity, scale, version,
+                   selection.rstrip(b"\0").decode(), requested)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        map_path: str,
+        gmap: GridMap,
+        count: int = 8,
+        selection: str = "farthest",
+        connectivity: int = 4,
+    ) -> "Landmarks":
+        """
+        Load the tables stored next to a map file, building and storing them
+        when missing or out of date.
+
+        Parameters:
+        - map_path (str): The map file; tables live in '<map_path>.alt'.
+        - gmap (GridMap): The loaded map.
+        - count (int): The number of landmarks to build.
+        - selection (str): 'farthest' or 'planar'.
+        - connectivity (int): 4 or 8.
+
+        Returns:
+        - Landmarks: The landmark tables.
+        """
+        path = landmark_path(map_path)
+        landmarks = cls.load(path, gmap, connectivity)
+        # compare with what was asked for: fewer landmarks may be found
+        if (
+            landmarks is None
+            or landmarks.requested != count
+            or landmarks.selection != selection
+        ):
+            landmarks = cls.build(gmap, count, selection, connectivity)
+            landmarks.save(path)
+        return landmarks
+
+
+def landmark_path(map_path: str) -> str:
+    """
+    Get the path of the landmark tables stored next to a map file.
+
+    Parameters:
+    - map_path (str): The map file.
+
+    Returns:
+    - str: The tables' file path.
+    """
+    return f"{map_path}.alt"
+
+
+def evaluate(
+    gmap: GridMap,
+    landmarks: Landmarks,
+    queries: List[Tuple[int, int]],
+) -> Dict:
+    """
+    Compare plain A* with ALT on a set of queries.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - landmarks (Landmarks): The landmark tables.
+    - queries (List[Tuple[int, int]]): (start, goal) cell index pairs.
+
+    Returns:
+    - Dict: Total expansions and seconds for both, the expansion reduction,
+    and the tables' memory use.
+    """
+    connectivity = landmarks.connectivity
+    plain = [a_star(gmap, start, goal, connectivity)
+             for start, goal in queries]
+    alt = [a_star(gmap, start, goal, connectivity,
+                  landmarks.heuristic(goal))
+           for start, goal in queries]
+    plain_expansions = sum(result.expansions for result in plain)
+    alt_expansions = sum(result.expansions for result in alt)
+    return {
+        "queries": len(queries),
+        "plain_expansions": plain_expansions,
+        "alt_expansions": alt_expansions,
+        "reduction": 1 - alt_expansions / plain_expansions
+        if plain_expansions else 0.0,
+        "plain_seconds": sum(result.seconds for result in plain),
+        "alt_seconds": sum(result.seconds for result in alt),
+        "memory_bytes": landmarks.memory_bytes(),
+        "costs_match": all(
+            math.isclose(a.cost, b.cost) or a.cost == b.cost
+            for a, b in zip(plain, alt)
+        ),
+    }
+
+
+if __name__ == "__main__":
+    """
+    Build (or load) the landmark tables of a MovingAI map and report their
+    memory cost and expansion reduction, e.g.
+
+        python landmarks.py arena.map -k 8 -queries 200
+    """
+    parser = argparse.ArgumentParser(description="ALT landmark tables")
+    parser.add_argument("map", help="MovingAI '.map' file")
+    parser.add_argument("-k", type=int, default=8, help="Landmark count")
+    parser.add_argument("-select", choices=list(SELECTIONS),
+                        default="farthest", help="Landmark selection")
+    parser.add_argument("-connectivity", type=int, choices=[4, 8],
+                        default=8, help="Grid connectivity")
+    parser.add_argument("-queries", type=int, default=100,
+                        help="Random queries used for the report")
+    parser.add_argument("-seed", type=int, default=0, help="Query seed")
+    args = parser.parse_args()
+
+    gmap = load_movingai_map(args.map)
+    t0 = time.perf_counter()
+    landmarks = Landmarks.load_or_build(args.map, gmap, args.k, args.select,
+                                        args.connectivity)
+    print(f"{len(landmarks.indices)} landmarks ready in "
+          f"{time.perf_counter() - t0:.2f}s "
+          f"({landmarks.memory_bytes() / 1024:.0f} KiB, "
+          f"{landmark_path(args.map)})")
+
+    component = _largest_component(gmap)
+    rng = random.Random(args.seed)
+    queries = [(rng.choice(component), rng.choice(component))
+               for _ in range(args.queries)]
+    report = evaluate(gmap, landmarks, queries)
+    print(f"A*:  {report['plain_expansions']} expansions, "
+          f"{report['plain_seconds']:.2f}s")
+    print(f"ALT: {report['alt_expansions']} expansions, "
+          f"{report['alt_seconds']:.2f}s "
+          f"({report['reduction']:.0%} fewer expansions, costs "
+          f"{'match' if report['costs_match'] else 'DIFFER'})")
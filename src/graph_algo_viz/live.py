@@ -0,0 +1,229 @@
+import threading
+from typing import List, Optional, Sequence, Tuple
+from algorithms import ALGORITHMS
+from recorder import SearchRecorder, make_recording_grid
+from spot import Spot
+
+
+class SearchCancelled(Exception):
+    """
+    Raised inside a search's `draw` callback to stop a cancelled search.
+    """
+
+
+class LiveSearch:
+    """
+    Run one search on a worker thread while the UI thread shows its
+    progress.
+
+    The worker searches a private `RecordingSpot` copy of the grid, so the
+    UI's grid is never touched from two threads. Its recorder's event list
+    is the channel between them: the worker only appends immutable event
+    tuples and the UI only reads entries below a length it sampled, so the
+    hand-over needs no lock. The UI takes a bounded number of steps per
+    frame with `advance` and stays free to render and handle events while
+    the search runs.
+
+    Pausing blocks the worker at its next step and cancelling ends it
+    there, so both take effect within one search step.
+
+    A search that raises is finished without a result, and its exception
+    is raised again on the UI thread by the next `advance`.
+
+    Searching the same maze again can `reuse` a previous search's copy
+    instead of copying the grid afresh, so a re-run costs no more than the
+    search itself. The previous search is cancelled and waited for first.
+
+    Parameters:
+    - algorithm (str): The algorithm name in `ALGORITHMS`.
+    - grid (List[List[Spot]]): The grid to search, with up-to-date
+    neighbors. It is copied and not modified.
+    - start (Spot): The starting spot in `grid`.
+    - end (Spot): The end spot in `grid`.
+    - reuse (Optional[LiveSearch]): An earlier search on the same maze,
+    whose copy and recorder are taken over. Its barriers must not have
+    changed since it was created.
+    - starts (Sequence[Spot]): More starting spots in `grid`, for the
+    algorithms in `MULTI_GOAL_ALGORITHMS`.
+    - goals (Sequence[Spot]): More goal spots in `grid`; the search stops
+    at the nearest.
+
+    Attributes:
+    - recorder (SearchRecorder): The recording the worker writes to.
+    - shown_steps (int): The number of steps handed to the UI so far.
+    - error (Optional[Exception]): What the search raised, if it failed.
+    """
+    def __init__(
+        self,
+        algorithm: str,
+        grid: List[List[Spot]],
+        start: Spot,
+        end: Spot,
+        reuse: Optional["LiveSearch"] = None,
+        starts: Sequence[Spot] = (),
+        goals: Sequence[Spot] = (),
+    ) -> None:
+        self.algorithm = algorithm
+        self.shown_steps = 0
+        self.error: Optional[Exception] = None
+        if reuse is None:
+            self.recorder = SearchRecorder()
+            self._copy = make_recording_grid(grid, self.recorder)
+        else:
+            # the copy's spots report to this recorder, so it is kept
+            reuse.cancel()
+            if reuse._thread.ident is not None:
+                reuse._thread.join()
+            self.recorder = reuse.recorder
+            self.recorder.reset()
+            self._copy = reuse._copy
+        self._start = self._copy[start.row][start.col]
+        self._end = self._copy[end.row][end.col]
+        # only passed when given, so single-goal algorithms work unchanged
+        self._options = {}
+        if starts or goals:
+            self._options = {
+                "starts": [self._copy[s.row][s.col] for s in starts],
+                "goals": [self._copy[g.row][g.col] for g in goals],
+            }
+        self._cursor = 0
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "LiveSearch":
+        """
+        Start the worker thread.
+
+        Returns:
+        - LiveSearch: The search itself, for chaining.
+        """
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        """
+        Run the search on the worker thread.
+        """
+        self.recorder.start()
+        try:
+            found = ALGORITHMS[self.algorithm](
+                self._tick, self._copy, self._start, self._end,
+                **self._options
+            )
+        except SearchCancelled:
+            return
+        except Exception as error:
+            # kept for the UI thread; raising here would only end the thread
+            self.error = error
+            return
+        self.recorder.finish(found)
+
+    def _tick(self) -> None:
+        """
+        End one search step, waiting while paused.
+        """
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise SearchCancelled
+        self.recorder.tick()
+
+    @property
+    def paused(self) -> bool:
+        """
+        Whether the search is paused.
+
+        Returns:
+        - bool: True while paused.
+        """
+        return not self._running.is_set()
+
+    def pause(self) -> None:
+        """
+        Pause the search at its next step.
+        """
+        self._running.clear()
+
+    def resume(self) -> None:
+        """
+        Let a paused search continue.
+        """
+        self._running.set()
+
+    def cancel(self) -> None:
+        """
+        Stop the search at its next step. The worker is not waited for;
+        it only ever touches its own copy of the grid.
+        """
+        self._cancelled.set()
+        self._running.set()
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the worker has completed or failed the search.
+
+        Returns:
+        - bool: True once the result is known or the search raised.
+        """
+        return self.recorder.found is not None or self.error is not None
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the search has completed and every change has been shown.
+        A failed search is never done, so its error reaches `advance`.
+
+        Returns:
+        - bool: True once `advance` has nothing more to return.
+        """
+        return (self.error is None and self.finished
+                and self._cursor == len(self.recorder.events))
+
+    def advance(self, steps: int) -> List[Tuple[int, int, int, str]]:
+        """
+        Take the changes of up to `steps` more search steps, as far as the
+        worker has got. Nothing is taken while paused.
+
+        Raises:
+        - Exception: Whatever the search raised, once it has failed.
+
+        Parameters:
+        - steps (int): The maximum number of steps to take.
+
+        Returns:
+        - List[Tuple[int, int, int, str]]: (step, row, col, state) events
+        in order, as recorded by `SearchRecorder`.
+        """
+        if self.error is not None:
+            raise self.error
+        if self.paused:
+            return []
+        self.shown_steps += steps
+        # events appended after this are picked up by a later call
+        events = self.recorder.events
+        available = len(events)
+        finished = self.finished
+        end = self._cursor
+        while end < available and events[end][0] < self.shown_steps:
+            end += 1
+        if finished and end == available:
+            # whatever is left, e.g. the path, after the last step
+            end = len(events)
+        taken = events[self._cursor:end]
+        self._cursor = end
+        # keep the shown step count from running ahead of the worker
+        self.shown_steps = min(self.shown_steps, self.recorder.steps)
+        return taken
+
+    @property
+    def result(self) -> Optional[bool]:
+        """
+        The search result, once finished.
+
+        Returns:
+        - Optional[bool]: Whether a path was found, or None if still
+        running, cancelled or failed.
+        """
+        return self.recorder.found
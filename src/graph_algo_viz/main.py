@@ -1,6 +1,13 @@
 import argparse
 import pygame
-from game import make_grid, start_game
+from algorithms import ALGORITHMS, ANYTIME_OPTIONS, TIE_BREAK_OPTIONS
+from game import fill_grid, make_grid, start_game
+from generators import GENERATORS
+from graph import SEARCHES as GRAPH_SEARCHES
+from graph import load_graph, load_or_compute_layout
+from graph_view import run_graph_view
+from mapf import SOLVERS as MAPF_SOLVERS
+from search import TIE_BREAKING
 
 
 def arg_parse():
@@ -14,7 +21,33 @@ def arg_parse():
     - '-rows' (int): Number of rows in the grid (default: 50).
     - '-width' (int): Width of each cell in the grid in pixels (default: 800).
     - '-algo' or '--algorithm' (str): Algorithm to use for pathfinding.
-    Choices are 'dijkstra', 'a_star', 'bfs', 'dfs' (default: 'dijkstra').
+    Choices are 'dijkstra', 'a_star', 'alt', 'ara_star', 'bfs', 'dfs',
+    'fringe_search', 'ida_star', 'weighted_a_star' (default: 'dijkstra').
+    - '-weight' (float): Heuristic weight of 'weighted_a_star' and the
+    initial weight of 'ara_star' (default: 2.0).
+    - '-deadline-ms' (float): Time budget of 'ara_star' in milliseconds
+    (default: none, i.e. improve until optimal).
+    - '-tie-break' (str): How 'a_star' and 'dijkstra' order open nodes of
+    equal cost. Choices are 'fifo', 'lifo', 'high_g', 'low_h', 'cross'
+    (default: 'fifo').
+    - '-compare' (str, multiple): Algorithms to run side by side in
+    comparison mode instead of '-algo'.
+    - '-lockstep' (str): How comparison panels advance, 'steps' or 'time'
+    (default: 'steps').
+    - '-steps-per-frame' (int): Search steps shown per frame (default: 1 in
+    comparison mode, 4 otherwise).
+    - '-gen' (str): Generator used to fill the grid at startup. Choices are
+    'maze', 'division', 'random', 'caves', 'rooms' (default: none).
+    - '-seed' (int): Random seed for generated maps (default: 0).
+    - '-density' (float): Barrier density for the 'random' and 'caves'
+    generators (default: the generator's own).
+    - '-graph' (str): A GraphML or edge-list file to explore in graph mode
+    instead of the grid (default: none).
+    - '-directed' (flag): Read the '-graph' edge list as directed.
+    - '-agents' (int): The number of random agents to place for multi-agent
+    pathfinding (default: 0).
+    - '-mapf' (str): The multi-agent solver, 'ca_star' (cooperative A*) or
+    'cbs' (conflict-based search) (default: 'ca_star').
 
     Returns:
     - argparse.Namespace: An object containing the parsed command-line
@@ -36,13 +69,102 @@ def arg_parse():
     parser.add_argument(
         "-algo",
         "--algorithm",
-        choices=["dijkstra", "a_star", "bfs", "dfs"],
+        choices=list(ALGORITHMS),
         type=str,
         default="dijkstra",
         help="Algorithm to use for pathfinding",
     )
+    parser.add_argument(
+        "-weight",
+        type=float,
+        default=2.0,
+        help="Heuristic weight of weighted_a_star and ara_star",
+    )
+    parser.add_argument(
+        "-deadline-ms",
+        type=float,
+        default=None,
+        help="Time budget of ara_star in milliseconds",
+    )
+    parser.add_argument(
+        "-tie-break",
+        choices=TIE_BREAKING,
+        type=str,
+        default="fifo",
+        help="Order of open nodes of equal cost in a_star and dijkstra",
+    )
+    parser.add_argument(
+        "-compare",
+        nargs="+",
+        choices=list(ALGORITHMS),
+        type=str,
+        default=None,
+        help="Algorithms to run side by side on the same grid",
+    )
+    parser.add_argument(
+        "-lockstep",
+        choices=["steps", "time"],
+        type=str,
+        default="steps",
+        help="Advance comparison panels by step count or by CPU time",
+    )
+    parser.add_argument(
+        "-steps-per-frame",
+        type=int,
+        default=None,
+        help="Search steps shown per frame",
+    )
+    parser.add_argument(
+        "-gen",
+        choices=list(GENERATORS),
+        type=str,
+        default=None,
+        help="Generator used to fill the grid at startup",
+    )
+    parser.add_argument(
+        "-seed",
+        type=int,
+        default=0,
+        help="Random seed for generated maps",
+    )
+    parser.add_argument(
+        "-density",
+        type=float,
+        default=None,
+        help="Barrier density for the 'random' and 'caves' generators",
+    )
+    parser.add_argument(
+        "-graph",
+        type=str,
+        default=None,
+        help="GraphML or edge-list file to explore instead of the grid",
+    )
+    parser.add_argument(
+        "-directed",
+        action="store_true",
+        help="Read the -graph edge list as directed",
+    )
+
+    parser.add_argument(
+        "-agents",
+        type=int,
+        default=0,
+        help="Random agents to place for multi-agent pathfinding",
+    )
+    parser.add_argument(
+        "-mapf",
+        choices=list(MAPF_SOLVERS),
+        type=str,
+        default="ca_star",
+        help="Multi-agent solver",
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.weight < 1:
+        parser.error("-weight must be at least 1")
+    if args.graph and args.algorithm not in GRAPH_SEARCHES:
+        parser.error(f"graph mode supports {', '.join(GRAPH_SEARCHES)}")
+    return args
 
 
 if __name__ == "__main__":
@@ -60,11 +182,37 @@ if __name__ == "__main__":
     """
     pygame.init()
     args = arg_parse()
+    ANYTIME_OPTIONS["weight"] = args.weight
+    if args.deadline_ms is not None:
+        ANYTIME_OPTIONS["deadline"] = args.deadline_ms / 1000
+    TIE_BREAK_OPTIONS["policy"] = args.tie_break
     font = pygame.font.SysFont("Arial", 20)
 
-    win = pygame.display.set_mode((args.width, args.width))
+    win = pygame.display.set_mode((args.width, args.width), pygame.RESIZABLE)
     pygame.display.set_caption("Graph Algorithm Visualizer")
 
-    grid = make_grid(args.rows, args.width)
+    if args.graph:
+        graph = load_graph(args.graph, args.directed)
+        load_or_compute_layout(args.graph, graph, args.seed)
+        run_graph_view(graph, args.width, win, args.algorithm)
+    else:
+        grid = make_grid(args.rows, args.width)
+        if args.gen:
+            options = {}
+            if args.density is not None and args.gen in ("random", "caves"):
+                options["density"] = args.density
+            fill_grid(grid, args.rows, args.gen, args.seed, **options)
 
-    start_game(grid, args.rows, args.width, win, args.algorithm)
+        start_game(
+            grid,
+            args.rows,
+            args.width,
+            win,
+            args.algorithm,
+            compare=args.compare,
+            lockstep=args.lockstep,
+            steps_per_frame=args.steps_per_frame,
+            seed=args.seed + 1 if args.gen else args.seed,
+            agent_count=args.agents,
+            mapf=args.mapf,
+        )
@@ -0,0 +1,660 @@
+import argparse
+import heapq
+import random
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from components import ComponentIndex
+from generators import generate
+from gridmap import GridMap
+from search import make_expander, make_heuristic
+
+
+# an agent's (start, goal) cell indices
+Agent = Tuple[int, int]
+
+
+class MAPFResult(NamedTuple):
+    """
+    The outcome of a multi-agent search on a GridMap.
+
+    Attributes:
+    - paths (List[Optional[List[int]]]): Per agent, the cell occupied at each
+    time step from 0 until it reaches its goal, or None if it was not
+    solved. Agents wait on their goal once they arrive.
+    - solved (int): The number of agents with a path.
+    - expansions (int): Low-level search expansions over all agents.
+    - seconds (float): Wall-clock time spent searching.
+    """
+    paths: List[Optional[List[int]]]
+    solved: int
+    expansions: int
+    seconds: float
+
+    @property
+    def sum_of_costs(self) -> int:
+        """
+        Get the total number of time steps the solved agents take.
+
+        Returns:
+        - int: The sum of path lengths, excluding start cells.
+        """
+        return sum(len(path) - 1 for path in self.paths if path is not None)
+
+    @property
+    def makespan(self) -> int:
+        """
+        Get the time step at which the last solved agent arrives.
+
+        Returns:
+        - int: The longest path length, excluding start cells.
+        """
+        return max((len(path) - 1 for path in self.paths if path is not None),
+                   default=0)
+
+
+class ReservationTable:
+    """
+    Space-time cells claimed by agents that were already planned.
+
+    A cell is reserved at each time step an agent occupies it, and each
+    move reserves the swap in the opposite direction, so agents can neither
+    share a cell nor pass through each other. An agent that has arrived
+    keeps its goal reserved for all later time steps.
+
+    Parameters:
+    - size (int): The number of cells of the map.
+    """
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.vertices: Set[int] = set()
+        self.edges: Set[int] = set()
+        # cell -> time from which an arrived agent rests there
+        self.resting: Dict[int, int] = {}
+        # cell -> last time step any agent passes through it
+        self.last_use: Dict[int, int] = {}
+
+    def vertex_blocked(self, t: int, cell: int) -> bool:
+        """
+        Check if a cell is taken at a time step.
+
+        Parameters:
+        - t (int): The time step.
+        - cell (int): The cell index.
+
+        Returns:
+        - bool: True if another agent is there.
+        """
+        if t * self.size + cell in self.vertices:
+            return True
+        rest = self.resting.get(cell)
+        return rest is not None and t >= rest
+
+    def edge_blocked(self, t: int, a: int, b: int) -> bool:
+        """
+        Check if moving from one cell to another, arriving at a time step,
+        would swap places with another agent.
+
+        Parameters:
+        - t (int): The arrival time step.
+        - a (int): The cell moved from.
+        - b (int): The cell moved to.
+
+        Returns:
+        - bool: True if the move is blocked.
+        """
+        return (t * self.size + a) * self.size + b in self.edges
+
+    def earliest_rest(self, cell: int) -> int:
+        """
+        Get the first time step from which an agent may stay on a cell for
+        good without blocking an agent that passes through later.
+
+        Parameters:
+        - cell (int): The goal cell.
+
+        Returns:
+        - int: The time step.
+        """
+        return self.last_use.get(cell, -1) + 1
+
+    def reserve(self, path: List[int]) -> None:
+        """
+        Reserve the cells and moves of a planned path.
+
+        Parameters:
+        - path (List[int]): The cell at each time step, ending on the goal.
+        """
+        size = self.size
+        for t, cell in enumerate(path):
+            self.vertices.add(t * size + cell)
+            if self.last_use.get(cell, -1) < t:
+                self.last_use[cell] = t
+            if t > 0:
+                # block the opposite move at the same time step
+                self.edges.add((t * size + cell) * size + path[t - 1])
+        self.resting[path[-1]] = len(path) - 1
+
+
+class ReverseResumableAStar:
+    """
+    Exact distances to an agent's goal, computed lazily by an A* search
+    running backwards from the goal towards the agent's start and resumed
+    whenever a distance it has not settled yet is asked for.
+
+    This is the true-distance heuristic of cooperative A* (Silver, 2005):
+    it ignores other agents, so it is admissible for the space-time search,
+    and it only explores the part of the map the space-time search visits.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The agent's start cell, which guides the search.
+    - goal (int): The agent's goal cell.
+    """
+    def __init__(self, gmap: GridMap, start: int, goal: int) -> None:
+        self.expand = make_expander(gmap, 4)
+        self.guide = make_heuristic(gmap, start, 4)
+        self.g: Dict[int, int] = {goal: 0}
+        self.closed: Dict[int, int] = {}
+        self.open = [(self.guide(goal), 0, goal)]
+        self.expansions = 0
+
+    def distance(self, cell: int) -> float:
+        """
+        Get the distance from a cell to the goal.
+
+        Parameters:
+        - cell (int): The cell index.
+
+        Returns:
+        - float: The number of moves, or math.inf if unreachable.
+        """
+        closed = self.closed
+        if cell in closed:
+            return closed[cell]
+        g = self.g
+        open_set = self.open
+        while open_set:
+            _, current_g, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed[current] = current_g
+            self.expansions += 1
+            for neighbor, _ in self.expand(current):
+                new_g = current_g + 1
+                if new_g < g.get(neighbor, new_g + 1):
+                    g[neighbor] = new_g
+                    # the guide heuristic is consistent, so a cell's g is
+                    # exact once it is closed
+                    heapq.heappush(open_set, (new_g + self.guide(neighbor),
+                                              new_g, neighbor))
+            if current == cell:
+                return current_g
+        return float("inf")
+
+
+def space_time_a_star(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    table,
+    heuristic: ReverseResumableAStar,
+    max_time: int,
+) -> Tuple[Optional[List[int]], int]:
+    """
+    Plan one agent through space and time, avoiding reserved cells and
+    moves. Each step moves to a 4-neighbor or waits in place, at cost 1.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell.
+    - goal (int): The goal cell.
+    - table: Anything with the `vertex_blocked`, `edge_blocked` and
+    `earliest_rest` methods of `ReservationTable`, e.g. CBS constraints.
+    - heuristic (ReverseResumableAStar): Distances to the goal.
+    - max_time (int): The last time step the path may reach.
+
+    Returns:
+    - Tuple[Optional[List[int]], int]: The cell at each time step (None if
+    no path within `max_time`) and the number of expansions.
+    """
+    size = len(gmap)
+    expand = make_expander(gmap, 4)
+    distance = heuristic.distance
+    vertex_blocked = table.vertex_blocked
+    edge_blocked = table.edge_blocked
+    rest = table.earliest_rest(goal)
+    if distance(start) == float("inf"):
+        return None, 0
+
+    parent: Dict[int, int] = {start: -1}
+    count = 0
+    # no path can end before the goal is free to rest on, which keeps the
+    # search from flooding the map while it waits; ties go to the later
+    # state, which is closer to the goal
+    open_set = [(max(distance(start), rest), 0, count, start)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expansions = 0
+
+    while open_set:
+        _, negative_t, _, state = heappop(open_set)
+        t = -negative_t
+        cell = state - t * size
+        expansions += 1
+        if cell == goal and t >= rest:
+            path = []
+            while state != -1:
+                path.append(state % size)
+                state = parent[state]
+            path.reverse()
+            return path, expansions
+        if t >= max_time:
+            continue
+
+        next_t = t + 1
+        moves = [neighbor for neighbor, _ in expand(cell)]
+        moves.append(cell)
+        for neighbor in moves:
+            next_state = next_t * size + neighbor
+            if next_state in parent:
+                continue
+            if vertex_blocked(next_t, neighbor) or (
+                neighbor != cell and edge_blocked(next_t, cell, neighbor)
+            ):
+                continue
+            h = distance(neighbor)
+            if h == float("inf"):
+                continue
+            parent[next_state] = state
+            count += 1
+            f = next_t + h
+            heappush(open_set, (f if f > rest else rest, -next_t, count,
+                                next_state))
+
+    return None, expansions
+
+
+def _default_horizon(gmap: GridMap, agent_count: int) -> int:
+    """
+    Get the default number of time steps an agent may take.
+    """
+    return 2 * (gmap.rows + gmap.cols) + agent_count
+
+
+def _check_agents(gmap: GridMap, agents: List[Agent]) -> None:
+    """
+    Reject agents that start or end on a barrier or share a start or goal.
+    """
+    for start, goal in agents:
+        if gmap.cells[start] or gmap.cells[goal]:
+            raise ValueError("agents must start and end on passable cells")
+    if len({start for start, _ in agents}) != len(agents) or len(
+        {goal for _, goal in agents}
+    ) != len(agents):
+        raise ValueError("agents must have distinct starts and goals")
+
+
+def cooperative_a_star(
+    gmap: GridMap,
+    agents: List[Agent],
+    max_time: Optional[int] = None,
+    components: Optional[ComponentIndex] = None,
+) -> MAPFResult:
+    """
+    Plan agents one after another with cooperative A*: each agent searches
+    through space and time around the reservations of the agents planned
+    before it, then reserves its own path.
+
+    It is fast and scales to hundreds of agents, but it is neither optimal
+    nor complete: an agent can fail when earlier agents wall it in.
+
+    Parameters:
+    - gmap (GridMap): The map, 4-connected.
+    - agents (List[Agent]): (start, goal) cell indices, in planning order.
+    - max_time (Optional[int]): The last time step a path may reach
+    (default: twice the map's perimeter plus the agent count).
+    - components (Optional[ComponentIndex]): A component index of the map,
+    used to skip agents whose goal is unreachable.
+
+    Returns:
+    - MAPFResult: The collision-free paths of the solved agents.
+    """
+    t0 = time.perf_counter()
+    _check_agents(gmap, agents)
+    if max_time is None:
+        max_time = _default_horizon(gmap, len(agents))
+    if components is None:
+        components = ComponentIndex(gmap)
+
+    table = ReservationTable(len(gmap))
+    # agents wait on their starts until they are planned
+    for start, _ in agents:
+        table.vertices.add(start)
+
+    paths: List[Optional[List[int]]] = []
+    expansions = 0
+    for start, goal in agents:
+        table.vertices.discard(start)
+        path = None
+        if components.connected(start, goal):
+            heuristic = ReverseResumableAStar(gmap, start, goal)
+            path, count = space_time_a_star(gmap, start, goal, table,
+                                            heuristic, max_time)
+            expansions += count + heuristic.expansions
+        # an unsolved agent stays on its start
+        table.reserve([start] if path is None else path)
+        paths.append(path)
+
+    solved = sum(1 for path in paths if path is not None)
+    return MAPFResult(paths, solved, expansions, time.perf_counter() - t0)
+
+
+class Constraints:
+    """
+    The constraints of one agent in a conflict-based search node, with the
+    same interface as `ReservationTable`.
+
+    Parameters:
+    - size (int): The number of cells of the map.
+    - vertices (Set[Tuple[int, int]]): Forbidden (time, cell) pairs.
+    - edges (Set[Tuple[int, int, int]]): Forbidden (arrival time, from,
+    to) moves.
+    """
+    def __init__(
+        self,
+        size: int,
+        vertices: Set[Tuple[int, int]],
+        edges: Set[Tuple[int, int, int]],
+    ) -> None:
+        self.size = size
+        self.vertices = vertices
+        self.edges = edges
+
+    def vertex_blocked(self, t: int, cell: int) -> bool:
+        return (t, cell) in self.vertices
+
+    def edge_blocked(self, t: int, a: int, b: int) -> bool:
+        return (t, a, b) in self.edges
+
+    def earliest_rest(self, cell: int) -> int:
+        return max((t for t, c in self.vertices if c == cell),
+                   default=-1) + 1
+
+
+def _position(path: List[int], t: int) -> int:
+    """
+    Get where an agent is at a time step, resting on its goal after
+    arriving.
+    """
+    return path[t] if t < len(path) else path[-1]
+
+
+def conflicts(
+    paths: List[List[int]],
+) -> Iterator[Tuple]:
+    """
+    List the collisions between agents in time order.
+
+    Parameters:
+    - paths (List[List[int]]): The cell at each time step, per agent.
+
+    Returns:
+    - Iterator[Tuple]: ('vertex', a, b, t, cell) when agents a and b share a
+    cell at time t, and ('edge', a, b, t, from, to) when agent a moves from
+    one cell to the other while agent b moves the opposite way, arriving at
+    time t.
+    """
+    horizon = max((len(path) for path in paths), default=0)
+    for t in range(horizon):
+        seen: Dict[int, int] = {}
+        for agent, path in enumerate(paths):
+            cell = _position(path, t)
+            if cell in seen:
+                yield ("vertex", seen[cell], agent, t, cell)
+            else:
+                seen[cell] = agent
+        if t == 0:
+            continue
+        moves: Dict[Tuple[int, int], int] = {}
+        for agent, path in enumerate(paths):
+            a, b = _position(path, t - 1), _position(path, t)
+            if a != b:
+                other = moves.get((b, a))
+                if other is not None:
+                    yield ("edge", other, agent, t, b, a)
+                moves[(a, b)] = agent
+
+
+def first_conflict(
+    paths: List[List[int]],
+) -> Optional[Tuple]:
+    """
+    Find the earliest collision between two agents.
+
+    Parameters:
+    - paths (List[List[int]]): The cell at each time step, per agent.
+
+    Returns:
+    - Optional[Tuple]: The first item of `conflicts`, or None if the paths
+    are collision-free.
+    """
+    return next(conflicts(paths), None)
+
+
+def is_collision_free(paths: List[Optional[List[int]]]) -> bool:
+    """
+    Check that no two solved agents share a cell or swap cells.
+
+    Parameters:
+    - paths (List[Optional[List[int]]]): Per agent, the cell at each time
+    step, or None if unsolved.
+
+    Returns:
+    - bool: True if the paths are collision-free.
+    """
+    solved = [path for path in paths if path is not None]
+    return first_conflict(solved) is None
+
+
+def conflict_based_search(
+    gmap: GridMap,
+    agents: List[Agent],
+    max_time: Optional[int] = None,
+    max_nodes: int = 2000,
+) -> MAPFResult:
+    """
+    Conflict-based search: plan every agent on its own, then repeatedly
+    take the cheapest set of plans, find its first collision and branch on
+    which of the two agents must avoid it. Among equally cheap sets of
+    plans, the one with the fewest collisions is tried first.
+
+    It finds paths with the least sum of costs, but the number of branches
+    grows quickly with the number of interacting agents, so it suits tens of
+    agents rather than hundreds.
+
+    Parameters:
+    - gmap (GridMap): The map, 4-connected.
+    - agents (List[Agent]): (start, goal) cell indices.
+    - max_time (Optional[int]): The last time step a path may reach.
+    - max_nodes (int): The number of branches to try before giving up.
+
+    Returns:
+    - MAPFResult: Optimal collision-free paths, or no solved agents if none
+    were found within `max_nodes`.
+    """
+    t0 = time.perf_counter()
+    _check_agents(gmap, agents)
+    if max_time is None:
+        max_time = _default_horizon(gmap, len(agents))
+    size = len(gmap)
+    heuristics = [ReverseResumableAStar(gmap, start, goal)
+                  for start, goal in agents]
+    expansions = 0
+
+    def plan(agent: int, constraints: Constraints) -> Optional[List[int]]:
+        nonlocal expansions
+        start, goal = agents[agent]
+        path, count = space_time_a_star(gmap, start, goal, constraints,
+                                        heuristics[agent], max_time)
+        expansions += count
+        return path
+
+    root_constraints = [Constraints(size, set(), set()) for _ in agents]
+    root_paths = [plan(agent, root_constraints[agent])
+                  for agent in range(len(agents))]
+    failed = MAPFResult([None] * len(agents), 0, 0, 0.0)
+    if any(path is None for path in root_paths):
+        return failed._replace(expansions=expansions,
+                               seconds=time.perf_counter() - t0)
+
+    count = 0
+
+    def node(paths: List[List[int]], constraints: List[Constraints]):
+        nonlocal count
+        count += 1
+        return (sum(len(path) - 1 for path in paths),
+                sum(1 for _ in conflicts(paths)), count, paths, constraints)
+
+    open_set = [node(root_paths, root_constraints)]
+    while open_set and count < max_nodes:
+        paths, constraints = heapq.heappop(open_set)[3:]
+        conflict = first_conflict(paths)
+        if conflict is None:
+            return MAPFResult(paths, len(paths), expansions,
+                              time.perf_counter() - t0)
+
+        kind, a, b, t = conflict[:4]
+        for agent in (a, b):
+            old = constraints[agent]
+            vertices, edges = set(old.vertices), set(old.edges)
+            if kind == "vertex":
+                vertices.add((t, conflict[4]))
+            elif agent == a:
+                edges.add((t, conflict[4], conflict[5]))
+            else:
+                edges.add((t, conflict[5], conflict[4]))
+            child = list(constraints)
+            child[agent] = Constraints(size, vertices, edges)
+            path = plan(agent, child[agent])
+            if path is None:
+                continue
+            child_paths = list(paths)
+            child_paths[agent] = path
+            heapq.heappush(open_set, node(child_paths, child))
+
+    return failed._replace(expansions=expansions,
+                           seconds=time.perf_counter() - t0)
+
+
+SOLVERS = {
+    "ca_star": cooperative_a_star,
+    "cbs": conflict_based_search,
+}
+
+
+def random_agents(
+    gmap: GridMap,
+    count: int,
+    seed: int = 0,
+    components: Optional[ComponentIndex] = None,
+) -> List[Agent]:
+    """
+    Pick agents with distinct random starts and goals in the map's largest
+    connected component.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - count (int): The number of agents.
+    - seed (int): Random seed.
+    - components (Optional[ComponentIndex]): A component index of the map.
+
+    Returns:
+    - List[Agent]: (start, goal) cell indices.
+    """
+    if components is None:
+        components = ComponentIndex(gmap)
+    labels = [components.component(cell) for cell in range(len(gmap))]
+    sizes = Counter(label for label in labels if label != -1)
+    if not sizes:
+        return []
+    largest = sizes.most_common(1)[0][0]
+    cells = [cell for cell, label in enumerate(labels) if label == largest]
+    count = min(count, len(cells))
+    rng = random.Random(seed)
+    return list(zip(rng.sample(cells, count), rng.sample(cells, count)))
+
+
+def run_benchmark(
+    size: int,
+    agent_counts: List[int],
+    map_type: str = "random",
+    seed: int = 0,
+    solver: str = "ca_star",
+    **options,
+) -> List[Dict]:
+    """
+    Measure multi-agent throughput for growing numbers of agents.
+
+    Parameters:
+    - size (int): Map rows and columns.
+    - agent_counts (List[int]): The numbers of agents to plan.
+    - map_type (str): The generator name.
+    - seed (int): Seed for the map and the agents.
+    - solver (str): A name in `SOLVERS`.
+    - **options: Extra generator options, e.g. density.
+
+    Returns:
+    - List[Dict]: One result per agent count.
+    """
+    gmap = generate(map_type, size, seed=seed, **options)
+    components = ComponentIndex(gmap)
+    results = []
+    for count in agent_counts:
+        agents = random_agents(gmap, count, seed, components)
+        kwargs = {"components": components} if solver == "ca_star" else {}
+        result = SOLVERS[solver](gmap, agents, **kwargs)
+        results.append({
+            "agents": len(agents),
+            "solved": result.solved,
+            "seconds": result.seconds,
+            "agents_per_s": result.solved / result.seconds
+            if result.seconds > 0 else 0.0,
+            "expansions": result.expansions,
+            "sum_of_costs": result.sum_of_costs,
+            "makespan": result.makespan,
+            "collision_free": is_collision_free(result.paths),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    """
+    Benchmark multi-agent throughput on generated maps, e.g.
+
+        python mapf.py -size 256 -agents 100 250 500 1000
+    """
+    parser = argparse.ArgumentParser(
+        description="Multi-agent pathfinding throughput"
+    )
+    parser.add_argument("-size", type=int, default=256, help="Map size")
+    parser.add_argument("-agents", nargs="+", type=int,
+                        default=[100, 250, 500, 1000], help="Agent counts")
+    parser.add_argument("-map", default="random", help="Map generator")
+    parser.add_argument("-density", type=float, default=0.1,
+                        help="Barrier density for 'random' and 'caves'")
+    parser.add_argument("-solver", choices=list(SOLVERS), default="ca_star",
+                        help="Multi-agent solver")
+    parser.add_argument("-seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    options = {}
+    if args.map in ("random", "caves"):
+        options["density"] = args.density
+    for row in run_benchmark(args.size, args.agents, args.map, args.seed,
+                             args.solver, **options):
+        print(f"{row['agents']:>5} agents: {row['solved']:>5} solved in "
+              f"{row['seconds']:7.2f}s ({row['agents_per_s']:8.1f} agents/s)"
+              f" | {row['expansions']:>9} exp | sum of costs "
+              f"{row['sum_of_costs']:>7} | makespan {row['makespan']:>4} | "
+              f"{'ok' if row['collision_free'] else 'COLLISION'}")
@@ -0,0 +1,154 @@
+from typing import List, Optional, Sequence, Tuple
+import pygame
+from mapf import MAPFResult
+
+
+def agent_colors(count: int) -> List[pygame.Color]:
+    """
+    Pick a distinct colour per agent by spreading hues around the colour
+    wheel.
+
+    Parameters:
+    - count (int): The number of agents.
+
+    Returns:
+    - List[pygame.Color]: One colour per agent.
+    """
+    result = []
+    for agent in range(count):
+        color = pygame.Color(0)
+        # golden-ratio steps keep neighbouring agents far apart in hue
+        color.hsva = ((agent * 137.508) % 360, 85, 85, 100)
+        result.append(color)
+    return result
+
+
+def cell_center(
+    index: float,
+    cols: int,
+    gap: int,
+) -> Tuple[float, float]:
+    """
+    Get the pixel centre of a cell, laid out like `Spot`s: row along x and
+    column along y.
+
+    Parameters:
+    - index (float): The cell index.
+    - cols (int): The number of columns of the grid.
+    - gap (int): The cell width in pixels.
+
+    Returns:
+    - Tuple[float, float]: The x and y pixel position.
+    """
+    row, col = divmod(index, cols)
+    return row * gap + gap / 2, col * gap + gap / 2
+
+
+def draw_agent_markers(
+    win: pygame.Surface,
+    agents: Sequence[Sequence[int]],
+    cols: int,
+    gap: int,
+) -> None:
+    """
+    Draw each agent's start as a disc and its goal as a hollow square, in
+    the agent's colour. Agents still waiting for a goal only show a disc.
+
+    Parameters:
+    - win (pygame.Surface): The surface to draw on.
+    - agents (Sequence[Sequence[int]]): Per agent, its start cell index and
+    optionally its goal cell index.
+    - cols (int): The number of columns of the grid.
+    - gap (int): The cell width in pixels.
+    """
+    radius = max(gap * 0.35, 2)
+    for color, agent in zip(agent_colors(len(agents)), agents):
+        pygame.draw.circle(win, color, cell_center(agent[0], cols, gap),
+                           radius)
+        if len(agent) > 1:
+            x, y = cell_center(agent[1], cols, gap)
+            pygame.draw.rect(win, color, (x - radius, y - radius, 2 * radius,
+                                          2 * radius), 2)
+
+
+def agent_position(
+    path: Optional[List[int]],
+    start: int,
+    t: float,
+    cols: int,
+    gap: int,
+) -> Tuple[float, float]:
+    """
+    Get an agent's pixel position at a fractional time step, moving in a
+    straight line between the cells of consecutive steps.
+
+    Parameters:
+    - path (Optional[List[int]]): The cell at each time step, or None if the
+    agent was not solved and stays on its start.
+    - start (int): The agent's start cell.
+    - t (float): The time step.
+    - cols (int): The number of columns of the grid.
+    - gap (int): The cell width in pixels.
+
+    Returns:
+    - Tuple[float, float]: The x and y pixel position.
+    """
+    if path is None:
+        return cell_center(start, cols, gap)
+    step = int(t)
+    if step >= len(path) - 1:
+        return cell_center(path[-1], cols, gap)
+    x0, y0 = cell_center(path[step], cols, gap)
+    x1, y1 = cell_center(path[step + 1], cols, gap)
+    fraction = t - step
+    return x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction
+
+
+def animate_agents(
+    win: pygame.Surface,
+    background: pygame.Surface,
+    agents: Sequence[Sequence[int]],
+    result: MAPFResult,
+    cols: int,
+    gap: int,
+    frames_per_step: int = 6,
+    fps: int = 60,
+) -> bool:
+    """
+    Move every agent along its path at the same time, one time step per
+    `frames_per_step` frames.
+
+    Parameters:
+    - win (pygame.Surface): The pygame window surface.
+    - background (pygame.Surface): The grid drawn behind the agents.
+    - agents (Sequence[Sequence[int]]): Per agent, its start and goal cell
+    indices.
+    - result (MAPFResult): The solved paths.
+    - cols (int): The number of columns of the grid.
+    - gap (int): The cell width in pixels.
+    - frames_per_step (int): Frames per time step.
+    - fps (int): The frame rate cap.
+
+    Returns:
+    - bool: False if the window was closed during the animation.
+    """
+    colors = agent_colors(len(agents))
+    radius = max(gap * 0.35, 2)
+    clock = pygame.time.Clock()
+    frames = result.makespan * frames_per_step
+    for frame in range(frames + 1):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        t = frame / frames_per_step
+        win.blit(background, (0, 0))
+        for color, agent, path in zip(colors, agents, result.paths):
+            x, y = cell_center(agent[1], cols, gap)
+            pygame.draw.rect(win, color, (x - radius, y - radius, 2 * radius,
+                                          2 * radius), 2)
+            pygame.draw.circle(win, color,
+                               agent_position(path, agent[0], t, cols, gap),
+                               radius)
+        pygame.display.update()
+        clock.tick(fps)
+    return True
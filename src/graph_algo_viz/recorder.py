@@ -0,0 +1,200 @@
+import time
+from typing import List, Optional, Tuple
+from spot import Spot
+
+
+class SearchRecorder:
+    """
+    Record the state changes a search makes to a grid, step by step.
+
+    A recorder is passed to a search as its `draw` callback: every call to
+    `tick` marks the end of one search step. `RecordingSpot` objects report
+    their colour changes to the recorder, so a finished run can be replayed
+    later at any speed.
+
+    Attributes:
+    - events (List[Tuple[int, int, int, str]]): (step, row, col, state)
+    tuples in the order they happened, where state is 'open', 'closed' or
+    'path'.
+    - step_times (List[float]): Thread CPU time in seconds at the end of each
+    step, relative to `start`. `step_times[0]` is 0.0.
+    - steps (int): The number of steps recorded so far.
+    - compute_time (float): Thread CPU time spent in the search.
+    - found (Optional[bool]): The search result, once finished.
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded, ready to record another search.
+        """
+        self.events: List[Tuple[int, int, int, str]] = []
+        self.step_times: List[float] = [0.0]
+        self.steps = 0
+        self.compute_time = 0.0
+        self.found: Optional[bool] = None
+        self._t0 = 0.0
+        self._path_step: Optional[int] = None
+
+    def start(self) -> None:
+        """
+        Start the compute clock. Uses the calling thread's CPU time, so
+        searches running side by side on a thread pool do not count the time
+        spent waiting for the GIL.
+        """
+        self._t0 = time.thread_time()
+
+    def finish(self, found: bool) -> None:
+        """
+        Stop the compute clock and store the search result.
+
+        Parameters:
+        - found (bool): Whether the search found a path.
+        """
+        self.compute_time = time.thread_time() - self._t0
+        self.found = found
+
+    def tick(self) -> None:
+        """
+        Mark the end of a search step. Used as the search's `draw` callback.
+        """
+        self.steps += 1
+        self.step_times.append(time.thread_time() - self._t0)
+
+    def record(self, spot: Spot, state: str) -> None:
+        """
+        Record a colour change of a spot at the current step.
+
+        Parameters:
+        - spot (Spot): The spot that changed.
+        - state (str): The new state ('open', 'closed' or 'path').
+        """
+        if state != "path":
+            # the search went on after showing a path, e.g. an anytime
+            # search improving it
+            self._path_step = None
+        elif self._path_step is None:
+            self._path_step = self.steps
+        self.events.append((self.steps, spot.row, spot.col, state))
+
+    @property
+    def expansions(self) -> int:
+        """
+        The number of nodes expanded before path reconstruction started.
+
+        Returns:
+        - int: The number of search steps spent exploring.
+        """
+        if self._path_step is None:
+            return self.steps
+        return self._path_step
+
+    @property
+    def path_cost(self) -> Optional[int]:
+        """
+        The cost of the path found, counted in unit-cost moves.
+
+        Returns:
+        - Optional[int]: The path cost, or None if no path was found.
+        """
+        if not self.found:
+            return None
+        # an anytime search may show several paths, so count the cells
+        # whose last change put them on one
+        last_state = {(row, col): state for _, row, col, state in self.events}
+        return sum(1 for state in last_state.values() if state == "path")
+
+    def step_at_time(self, compute_time: float) -> int:
+        """
+        Get the last step completed by a given point in compute time.
+
+        Parameters:
+        - compute_time (float): Compute time in seconds since `start`.
+
+        Returns:
+        - int: The number of steps completed at that time.
+        """
+        lo, hi = 0, len(self.step_times)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.step_times[mid] <= compute_time:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(lo - 1, 0)
+
+
+class RecordingSpot(Spot):
+    """
+    A Spot that reports its search state changes to a `SearchRecorder`.
+
+    Parameters:
+    - row (int): The row index of the spot in the grid.
+    - col (int): The column index of the spot in the grid.
+    - width (int): The width of each cell in the grid.
+    - total_rows (int): The total number of rows in the grid.
+    - recorder (SearchRecorder): The recorder receiving the changes.
+    """
+    def __init__(
+        self,
+        row: int,
+        col: int,
+        width: int,
+        total_rows: int,
+        recorder: SearchRecorder,
+    ) -> None:
+        super().__init__(row, col, width, total_rows)
+        self.recorder = recorder
+
+    def make_open(self):
+        """
+        Mark the spot as open and record the change.
+        """
+        super().make_open()
+        self.recorder.record(self, "open")
+
+    def make_closed(self):
+        """
+        Mark the spot as closed and record the change.
+        """
+        super().make_closed()
+        self.recorder.record(self, "closed")
+
+    def make_path(self):
+        """
+        Mark the spot as part of the path and record the change.
+        """
+        super().make_path()
+        self.recorder.record(self, "path")
+
+
+def make_recording_grid(
+    grid: List[List[Spot]],
+    recorder: SearchRecorder,
+) -> List[List[RecordingSpot]]:
+    """
+    Copy a grid into `RecordingSpot`s with up-to-date neighbors.
+
+    Parameters:
+    - grid (List[List[Spot]]): The grid to copy.
+    - recorder (SearchRecorder): The recorder receiving the copy's changes.
+
+    Returns:
+    - List[List[RecordingSpot]]: A copy of the grid with the same colours.
+    """
+    copy: List[List[RecordingSpot]] = []
+    for row in grid:
+        copy.append([])
+        for spot in row:
+            new_spot = RecordingSpot(
+                spot.row, spot.col, spot.width, spot.total_rows, recorder
+            )
+            new_spot.color = spot.color
+            copy[-1].append(new_spot)
+
+    for row in copy:
+        for spot in row:
+            spot.update_neighbors(copy)
+
+    return copy
@@ -0,0 +1,341 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+from components import ComponentIndex
+from gridmap import GridMap, load_movingai_map
+from landmarks import Landmarks, landmark_path
+from search import SEARCHES, find_path
+
+
+CSV_FIELDS = [
+    "query",
+    "bucket",
+    "algorithm",
+    "start_x",
+    "start_y",
+    "goal_x",
+    "goal_y",
+    "found",
+    "cost",
+    "optimal",
+    "optimal_ok",
+    "expansions",
+    "time_ms",
+]
+
+# algorithms accepted by the runner: the headless searches plus A* with the
+# ALT landmark heuristic
+ALGORITHMS = list(SEARCHES) + ["alt"]
+
+# relative tolerance when comparing costs against the scenario file, which
+# rounds optimal lengths to 8 decimals
+COST_TOLERANCE = 1e-6
+
+
+class Query(NamedTuple):
+    """
+    One query of a MovingAI scenario file.
+
+    Attributes:
+    - query (int): The query's position in the file.
+    - bucket (int): The difficulty bucket.
+    - start_x (int): The start column.
+    - start_y (int): The start row.
+    - goal_x (int): The goal column.
+    - goal_y (int): The goal row.
+    - optimal (float): The optimal 8-connected path length.
+    """
+    query: int
+    bucket: int
+    start_x: int
+    start_y: int
+    goal_x: int
+    goal_y: int
+    optimal: float
+
+
+def load_scenario(path: str) -> List[Query]:
+    """
+    Load the queries of a MovingAI '.scen' file.
+
+    Each line after the 'version' header holds the bucket, map name, map
+    width and height, start x and y, goal x and y, and optimal length,
+    separated by tabs. Map names may contain spaces.
+
+    Parameters:
+    - path (str): The path of the '.scen' file.
+
+    Returns:
+    - List[Query]: The queries in file order.
+    """
+    queries = []
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip("\r\n").split("\t")
+            if len(fields) < 9 or fields[0].startswith("version"):
+                continue
+            bucket = int(fields[0])
+            start_x, start_y, goal_x, goal_y = map(int, fields[4:8])
+            queries.append(Query(len(queries), bucket, start_x, start_y,
+                                 goal_x, goal_y, float(fields[8])))
+    return queries
+
+
+def is_optimal(cost: float, optimal: float) -> bool:
+    """
+    Check a path cost against the scenario's optimal length.
+
+    Parameters:
+    - cost (float): The cost found.
+    - optimal (float): The optimal length from the scenario file.
+
+    Returns:
+    - bool: True if the costs match within rounding.
+    """
+    return abs(cost - optimal) <= COST_TOLERANCE * max(1.0, optimal) + 1e-7
+
+
+_worker_map: Optional[GridMap] = None
+_worker_components: Optional[ComponentIndex] = None
+_worker_landmarks: Optional[Landmarks] = None
+
+
+def _init_worker(
+    map_path: str,
+    connectivity: int,
+    use_landmarks: bool,
+) -> None:
+    """
+    Load the map, index its components and load its landmark tables once
+    per worker process.
+
+    Parameters:
+    - map_path (str): The path of the '.map' file.
+    - connectivity (int): 4 or 8.
+    - use_landmarks (bool): Load the tables stored next to the map.
+    """
+    global _worker_map, _worker_components, _worker_landmarks
+    _worker_map = load_movingai_map(map_path)
+    _worker_components = ComponentIndex(_worker_map)
+    if use_landmarks:
+        _worker_landmarks = Landmarks.load(landmark_path(map_path),
+                                           _worker_map, connectivity)
+
+
+def run_queries(
+    gmap: GridMap,
+    algorithm: str,
+    queries: List[Query],
+    connectivity: int,
+    components: Optional[ComponentIndex] = None,
+    landmarks: Optional[Landmarks] = None,
+) -> List[Dict]:
+    """
+    Run a batch of queries with one algorithm.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - algorithm (str): The algorithm name in `ALGORITHMS`.
+    - queries (List[Query]): The queries to run.
+    - connectivity (int): 4 or 8.
+    - components (Optional[ComponentIndex]): A component index of the map,
+    used to answer unreachable queries without searching.
+    - landmarks (Optional[Landmarks]): Landmark tables of the map, required
+    by 'alt'.
+
+    Returns:
+    - List[Dict]: One CSV row per query.
+    """
+    if algorithm == "alt":
+        if landmarks is None:
+            raise ValueError("'alt' needs landmark tables")
+        search, search_landmarks = "a_star", landmarks
+    else:
+        search, search_landmarks = algorithm, None
+
+    rows = []
+    for query in queries:
+        result = find_path(
+            gmap,
+            (query.start_y, query.start_x),
+            (query.goal_y, query.goal_x),
+            search,
+            connectivity,
+            components,
+            search_landmarks,
+        )
+        rows.append({
+            "query": query.query,
+            "bucket": query.bucket,
+            "algorithm": algorithm,
+            "start_x": query.start_x,
+            "start_y": query.start_y,
+            "goal_x": query.goal_x,
+            "goal_y": query.goal_y,
+            "found": result.found,
+            "cost": f"{result.cost:.8f}" if result.found else "",
+            "optimal": f"{query.optimal:.8f}",
+            "optimal_ok": result.found and is_optimal(result.cost,
+                                                      query.optimal),
+            "expansions": result.expansions,
+            "time_ms": f"{result.seconds * 1000:.3f}",
+        })
+    return rows
+
+
+def _run_chunk(
+    algorithm: str,
+    queries: List[Query],
+    connectivity: int,
+) -> List[Dict]:
+    """
+    Run a batch of queries on the worker's map.
+    """
+    return run_queries(_worker_map, algorithm, queries, connectivity,
+                       _worker_components, _worker_landmarks)
+
+
+def run_scenario(
+    map_path: str,
+    queries: List[Query],
+    algorithms: List[str],
+    connectivity: int = 8,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    landmark_count: int = 8,
+) -> List[Dict]:
+    """
+    Run every query with every algorithm on a process pool.
+
+    Each worker loads the map once; tasks carry only a chunk of queries, so
+    the map is never sent per task. For 'alt', landmark tables are loaded
+    from next to the map, or built and stored there first.
+
+    Parameters:
+    - map_path (str): The path of the '.map' file.
+    - queries (List[Query]): The queries to run.
+    - algorithms (List[str]): Algorithm names in `ALGORITHMS`.
+    - connectivity (int): 4 or 8.
+    - workers (Optional[int]): The number of processes (default: CPU count).
+    - chunk_size (int): Queries per task.
+    - landmark_count (int): Landmarks to build for 'alt'.
+
+    Returns:
+    - List[Dict]: One CSV row per query and algorithm, in query order.
+    """
+    use_landmarks = "alt" in algorithms
+    if use_landmarks:
+        Landmarks.load_or_build(map_path, load_movingai_map(map_path),
+                                landmark_count, connectivity=connectivity)
+
+    chunks = [
+        queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(map_path, connectivity, use_landmarks),
+    ) as pool:
+        futures = [
+            pool.submit(_run_chunk, algorithm, chunk, connectivity)
+            for algorithm in algorithms
+            for chunk in chunks
+        ]
+        rows = [row for future in futures for row in future.result()]
+
+    rows.sort(key=lambda row: (row["query"], algorithms.index(
+        row["algorithm"])))
+    return rows
+
+
+def write_csv(
+    rows: List[Dict],
+    path: str,
+) -> None:
+    """
+    Write result rows to a CSV file.
+
+    Parameters:
+    - rows (List[Dict]): The result rows.
+    - path (str): The path of the CSV file.
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def arg_parse():
+    """
+    Parse command-line arguments for the scenario runner.
+
+    Returns:
+    - argparse.Namespace: An object containing the parsed command-line
+    arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a MovingAI scenario headless"
+    )
+    parser.add_argument("map", help="MovingAI '.map' file")
+    parser.add_argument("scen", help="MovingAI '.scen' file")
+    parser.add_argument(
+        "-algo",
+        "--algorithms",
+        nargs="+",
+        choices=ALGORITHMS,
+        default=["a_star"],
+        help="Algorithms to run; 'alt' is A* with landmark tables stored "
+        "next to the map",
+    )
+    parser.add_argument(
+        "-landmarks", type=int, default=8, help="Landmark count for 'alt'"
+    )
+    parser.add_argument(
+        "-connectivity",
+        type=int,
+        choices=[4, 8],
+        default=8,
+        help="Grid connectivity; MovingAI optimal lengths assume 8",
+    )
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes",
+    )
+    parser.add_argument(
+        "-chunk", type=int, default=64, help="Queries per task"
+    )
+    parser.add_argument(
+        "-o", "--output", default="results.csv", help="CSV output path"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    """
+    Run every query of a scenario, e.g.
+
+        python scenarios.py arena.map arena.map.scen -algo a_star dijkstra
+    """
+    args = arg_parse()
+    queries = load_scenario(args.scen)
+
+    t0 = time.perf_counter()
+    rows = run_scenario(args.map, queries, args.algorithms,
+                        args.connectivity, args.workers, args.chunk,
+                        args.landmarks)
+    elapsed = time.perf_counter() - t0
+    write_csv(rows, args.output)
+
+    print(f"{len(queries)} queries x {len(args.algorithms)} algorithms in "
+          f"{elapsed:.2f}s with {args.workers} workers -> {args.output}")
+    for algorithm in args.algorithms:
+        results = [row for row in rows if row["algorithm"] == algorithm]
+        mismatches = sum(1 for row in results if not row["optimal_ok"])
+        expansions = sum(row["expansions"] for row in results)
+        print(f"  {algorithm:>10}: {mismatches} of {len(results)} costs "
+              f"differ from optimal, {expansions} expansions")
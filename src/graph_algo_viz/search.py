@@ -0,0 +1,1155 @@
+import bisect
+import heapq
+import math
+import time
+from array import array
+from collections import deque
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from bitboard import BitGrid
+from components import ComponentIndex
+from gridmap import GridMap
+from workspace import SearchWorkspace
+
+
+SQRT2 = math.sqrt(2)
+# default cap on the cells in IDA*'s transposition table
+TABLE_SIZE = 1 << 20
+# orders for open-set entries of equal f (see `make_tie_breaker`)
+TIE_BREAKING = ("fifo", "lifo", "high_g", "low_h", "cross")
+# breadth-first search engines: a queue of cells, or whole layers of cells
+# grown at once on a bitboard (see `bitboard.BitGrid`)
+BFS_BACKENDS = ("deque", "bitboard")
+
+
+class SearchResult(NamedTuple):
+    """
+    The outcome of a headless search on a GridMap.
+
+    Attributes:
+    - found (bool): True if a path was found.
+    - path (List[int]): Cell indices from start to goal, empty if not found.
+    - cost (float): The path cost, math.inf if not found.
+    - expansions (int): The number of nodes expanded.
+    - seconds (float): Wall-clock time spent searching.
+    """
+    found: bool
+    path: List[int]
+    cost: float
+    expansions: int
+    seconds: float
+
+
+def make_expander(
+    gmap: GridMap,
+    connectivity: int = 4,
+) -> Callable[[int], List[Tuple[int, float]]]:
+    """
+    Build a function listing the passable neighbors of a cell.
+
+    With 4-connectivity moves are up, down, left and right at cost 1. With
+    8-connectivity diagonal moves cost sqrt(2) and may not cut corners: both
+    orthogonal cells next to a diagonal move must be passable, as in the
+    MovingAI benchmarks.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - connectivity (int): 4 or 8.
+
+    Returns:
+    - Callable[[int], List[Tuple[int, float]]]: Maps a cell index to a list
+    of (neighbor index, move cost) pairs.
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity must be 4 or 8, not {connectivity}")
+    cells = gmap.cells
+    cols = gmap.cols
+    last_row = (gmap.rows - 1) * cols
+    last_col = cols - 1
+    diagonal = connectivity == 8
+
+    def expand(index: int) -> List[Tuple[int, float]]:
+        col = index % cols
+        up = index >= cols and not cells[index - cols]
+        down = index < last_row and not cells[index + cols]
+        left = col > 0 and not cells[index - 1]
+        right = col < last_col and not cells[index + 1]
+
+        result = []
+        if down:
+            result.append((index + cols, 1.0))
+        if up:
+            result.append((index - cols, 1.0))
+        if right:
+            result.append((index + 1, 1.0))
+        if left:
+            result.append((index - 1, 1.0))
+        if diagonal:
+            if up and left and not cells[index - cols - 1]:
+                result.append((index - cols - 1, SQRT2))
+            if up and right and not cells[index - cols + 1]:
+                result.append((index - cols + 1, SQRT2))
+            if down and left and not cells[index + cols - 1]:
+                result.append((index + cols - 1, SQRT2))
+            if down and right and not cells[index + cols + 1]:
+                result.append((index + cols + 1, SQRT2))
+        return result
+
+    return expand
+
+
+def make_heuristic(
+    gmap: GridMap,
+    goal: int,
+    connectivity: int = 4,
+) -> Callable[[int], float]:
+    """
+    Build the distance heuristic to a goal cell: Manhattan distance for
+    4-connected grids and octile distance for 8-connected grids.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+
+    Returns:
+    - Callable[[int], float]: Maps a cell index to its estimated distance.
+    """
+    cols = gmap.cols
+    goal_row, goal_col = divmod(goal, cols)
+
+    if connectivity == 8:
+        def octile(index: int) -> float:
+            row, col = divmod(index, cols)
+            dr = abs(row - goal_row)
+            dc = abs(col - goal_col)
+            if dr < dc:
+                dr, dc = dc, dr
+            return dr + (SQRT2 - 1) * dc
+        return octile
+
+    def manhattan(index: int) -> float:
+        row, col = divmod(index, cols)
+        return abs(row - goal_row) + abs(col - goal_col)
+    return manhattan
+
+
+def nearest_distance(
+    points: List[Tuple[int, int]],
+    connectivity: int = 4,
+) -> Callable[[int, int], float]:
+    """
+    Build a function giving the Manhattan (4-connected) or octile
+    (8-connected) distance from a cell to the nearest of some points.
+
+    The points are sorted by row, and a lookup walks outwards from the
+    cell's row in order of row distance, stopping as soon as the row
+    distance alone is no shorter than the best distance found. Only points
+    in nearby rows are looked at, so many points cost little more than one.
+
+    Parameters:
+    - points (List[Tuple[int, int]]): The (row, col) of each point.
+    - connectivity (int): 4 or 8.
+
+    Returns:
+    - Callable[[int, int], float]: Maps a row and column to the distance to
+    the nearest point, math.inf if there are none.
+    """
+    points = sorted(points)
+    rows = [row for row, _ in points]
+    count = len(points)
+    octile = connectivity == 8
+
+    def distance(row: int, col: int) -> float:
+        above = bisect.bisect_left(rows, row) - 1
+        below = above + 1
+        best = math.inf
+        while above >= 0 or below < count:
+            if below < count and (
+                above < 0 or rows[below] - row <= row - rows[above]
+            ):
+                point_col = points[below][1]
+                dr = rows[below] - row
+                below += 1
+            else:
+                point_col = points[above][1]
+                dr = row - rows[above]
+                above -= 1
+            if dr >= best:
+                break
+            dc = abs(point_col - col)
+            if octile:
+                d = max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+            else:
+                d = dr + dc
+            if d < best:
+                best = d
+        return best
+    return distance
+
+
+def make_nearest_heuristic(
+    gmap: GridMap,
+    goals: List[int],
+    connectivity: int = 4,
+) -> Callable[[int], float]:
+    """
+    Build the heuristic for several goal cells: the Manhattan or octile
+    distance to the nearest of them (see `nearest_distance`).
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - goals (List[int]): The goal cell indices.
+    - connectivity (int): 4 or 8.
+
+    Returns:
+    - Callable[[int], float]: Maps a cell index to its estimated distance.
+    """
+    if len(goals) == 1:
+        return make_heuristic(gmap, goals[0], connectivity)
+    cols = gmap.cols
+    distance = nearest_distance([divmod(goal, cols) for goal in goals],
+                                connectivity)
+
+    def nearest(index: int) -> float:
+        return distance(*divmod(index, cols))
+    return nearest
+
+
+def make_tie_breaker(
+    policy: str,
+    cols: int,
+    start: int,
+    goal: int,
+) -> Optional[Callable[[int, float, int], float]]:
+    """
+    Build the key that orders open-set entries of equal f; the lowest key
+    is expanded first.
+
+    On open maps a whole plateau of cells can share the lowest f, and
+    expanding them in insertion order ('fifo') spreads the search across
+    the plateau. The other policies head for the goal instead:
+
+    - 'lifo': the entry queued last.
+    - 'high_g': the entry with the highest cost so far.
+    - 'low_h': the entry with the lowest Manhattan distance to the goal,
+    which also guides Dijkstra's algorithm.
+    - 'cross': the entry closest to the straight line from start to goal,
+    by the cross product of the vectors from the goal to the cell and to
+    the start.
+
+    Parameters:
+    - policy (str): One of `TIE_BREAKING`.
+    - cols (int): The number of columns of the grid.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+
+    Returns:
+    - Optional[Callable[[int, float, int], float]]: Maps an entry's insertion
+    count, g and cell index to its key, or None for 'fifo', whose key is
+    the insertion count itself.
+    """
+    if policy not in TIE_BREAKING:
+        raise ValueError(f"Unknown tie-breaking policy: {policy}")
+    goal_row, goal_col = divmod(goal, cols)
+    start_row, start_col = divmod(start, cols)
+    d_row, d_col = start_row - goal_row, start_col - goal_col
+
+    if policy == "lifo":
+        return lambda count, g, cell: -count
+    if policy == "high_g":
+        return lambda count, g, cell: -g
+    if policy == "low_h":
+        def low_h(count: int, g: float, cell: int) -> float:
+            row, col = divmod(cell, cols)
+            return abs(row - goal_row) + abs(col - goal_col)
+        return low_h
+    if policy == "cross":
+        def cross(count: int, g: float, cell: int) -> float:
+            row, col = divmod(cell, cols)
+            return abs((row - goal_row) * d_col - d_row * (col - goal_col))
+        return cross
+    return None
+
+
+def path_cost(
+    gmap: GridMap,
+    path: List[int],
+) -> float:
+    """
+    Get the cost of a path of adjacent cells: 1 per straight move and
+    sqrt(2) per diagonal move.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - path (List[int]): Cell indices from start to goal.
+
+    Returns:
+    - float: The path cost.
+    """
+    cols = gmap.cols
+    cost = 0.0
+    for a, b in zip(path, path[1:]):
+        straight = a // cols == b // cols or a % cols == b % cols
+        cost += 1.0 if straight else SQRT2
+    return cost
+
+
+def _walk_back(
+    parent: array,
+    goal: int,
+) -> List[int]:
+    """
+    Rebuild a path by following parent links from the goal.
+
+    Parameters:
+    - parent (array): Parent cell per cell index, -1 at the start.
+    - goal (int): The goal cell index.
+
+    Returns:
+    - List[int]: Cell indices from start to goal.
+    """
+    path = [goal]
+    while parent[path[-1]] != -1:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def _blocked(gmap: GridMap, start: int, goal: int) -> bool:
+    """
+    Check if either endpoint of a query is a barrier, so no search is needed.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+
+    Returns:
+    - bool: True if the start or goal is a barrier.
+    """
+    return bool(gmap.cells[start] or gmap.cells[goal])
+
+
+def _unreachable(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    components: Optional[ComponentIndex],
+) -> bool:
+    """
+    Check if a query has no path. Connectivity is only checked against an
+    index the caller already has: building one takes time and memory in
+    proportion to the grid, which memory-bounded searches must not spend.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - components (Optional[ComponentIndex]): A component index of the map.
+
+    Returns:
+    - bool: True if the start or goal is a barrier, or they are not
+    connected in `components`.
+    """
+    if _blocked(gmap, start, goal):
+        return True
+    return components is not None and not components.connected(start, goal)
+
+
+def _check_backend(backend: str, connectivity: int) -> None:
+    """Raise ValueError for unknown or unsupported BFS backends."""
+    if backend not in BFS_BACKENDS:
+        raise ValueError(f"Unknown BFS backend: {backend}")
+    if backend == "bitboard" and connectivity != 4:
+        raise ValueError("The bitboard backend only supports connectivity 4")
+
+
+def bfs(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    backend: str = "deque",
+) -> SearchResult:
+    """
+    Breadth-first search, counting every move as one step.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - backend (str): One of `BFS_BACKENDS`. 'bitboard' needs connectivity
+    4 and only pays off on open maps (see `BitGrid`); its expansions are
+    the cells closer to the start than the goal.
+
+    Returns:
+    - SearchResult: The search outcome. The path has the fewest moves.
+    """
+    t0 = time.perf_counter()
+    _check_backend(backend, connectivity)
+    if _blocked(gmap, start, goal):
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    if backend == "bitboard":
+        found = BitGrid(gmap).shortest_path(start, goal)
+        if found is None:
+            return SearchResult(False, [], math.inf, 0,
+                                time.perf_counter() - t0)
+        path, expansions = found
+        return SearchResult(True, path, path_cost(gmap, path), expansions,
+                            time.perf_counter() - t0)
+    expand = make_expander(gmap, connectivity)
+    workspace = SearchWorkspace.for_size(len(gmap))
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    parent = workspace.parent
+    workspace.visit(start, 0.0, -1)
+    queue = deque([start])
+    expansions = 0
+
+    while queue:
+        current = queue.popleft()
+        expansions += 1
+        if current == goal:
+            path = _walk_back(parent, goal)
+            return SearchResult(True, path, path_cost(gmap, path),
+                                expansions, time.perf_counter() - t0)
+        for neighbor, _ in expand(current):
+            if stamp[neighbor] != generation:
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                queue.append(neighbor)
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def dfs(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+) -> SearchResult:
+    """
+    Depth-first search. Finds a path, not necessarily a short one.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+
+    Returns:
+    - SearchResult: The search outcome.
+    """
+    t0 = time.perf_counter()
+    if _blocked(gmap, start, goal):
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    expand = make_expander(gmap, connectivity)
+    workspace = SearchWorkspace.for_size(len(gmap))
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    parent = workspace.parent
+    workspace.visit(start, 0.0, -1)
+    stack = [start]
+    expansions = 0
+
+    while stack:
+        current = stack.pop()
+        expansions += 1
+        if current == goal:
+            path = _walk_back(parent, goal)
+            return SearchResult(True, path, path_cost(gmap, path),
+                                expansions, time.perf_counter() - t0)
+        for neighbor, _ in expand(current):
+            if stamp[neighbor] != generation:
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                stack.append(neighbor)
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def a_star(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    heuristic: Optional[Callable[[int], float]] = None,
+    tie_break: str = "fifo",
+) -> SearchResult:
+    """
+    A* search with a binary heap and lazy deletion of stale entries.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - heuristic (Optional[Callable[[int], float]]): Estimated distance from
+    a cell to the goal. Defaults to Manhattan (4-connected) or octile
+    (8-connected) distance.
+    - tie_break (str): How entries of equal f are ordered, one of
+    `TIE_BREAKING`.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal when the
+    heuristic is admissible.
+    """
+    t0 = time.perf_counter()
+    if _blocked(gmap, start, goal):
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    tie_breaker = make_tie_breaker(tie_break, gmap.cols, start, goal)
+    if heuristic is None:
+        heuristic = make_heuristic(gmap, goal, connectivity)
+    return _a_star(gmap, [start], {goal}, connectivity, heuristic, t0,
+                   tie_breaker)
+
+
+def nearest_goal(
+    gmap: GridMap,
+    starts: List[int],
+    goals: List[int],
+    connectivity: int = 4,
+    heuristic: Optional[Callable[[int], float]] = None,
+) -> SearchResult:
+    """
+    Find the shortest path from any of several start cells to the nearest
+    of several goal cells with one multi-source A* search, instead of one
+    search per start and goal.
+
+    Every start is queued at cost 0 and the search stops at the first goal
+    expanded. The default heuristic is the distance to the nearest goal
+    (see `make_nearest_heuristic`), which stays admissible.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - starts (List[int]): The start cell indices.
+    - goals (List[int]): The goal cell indices.
+    - connectivity (int): 4 or 8.
+    - heuristic (Optional[Callable[[int], float]]): Estimated distance from
+    a cell to the nearest goal.
+
+    Returns:
+    - SearchResult: The search outcome. The path runs from one of the starts
+    to the goal nearest to any start, and is optimal when the heuristic is
+    admissible. Barrier starts and goals are ignored.
+    """
+    t0 = time.perf_counter()
+    cells = gmap.cells
+    starts = [start for start in set(starts) if not cells[start]]
+    goals = {goal for goal in goals if not cells[goal]}
+    if not starts or not goals:
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    if heuristic is None:
+        heuristic = make_nearest_heuristic(gmap, list(goals), connectivity)
+    return _a_star(gmap, sorted(starts), goals, connectivity, heuristic, t0)
+
+
+def _a_star(
+    gmap: GridMap,
+    starts: List[int],
+    goals: set,
+    connectivity: int,
+    heuristic: Callable[[int], float],
+    t0: float,
+    tie_breaker: Optional[Callable[[int, float, int], float]] = None,
+) -> SearchResult:
+    """Run A* from every start to the first goal expanded."""
+    expand = make_expander(gmap, connectivity)
+    workspace = SearchWorkspace.for_size(len(gmap))
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    g_score = workspace.g
+    parent = workspace.parent
+    # entries carry their g so stale ones can be skipped; a node whose g
+    # improves after expansion is simply expanded again, which keeps the
+    # result optimal for admissible but inconsistent heuristics
+    open_set = []
+    for count, start in enumerate(starts):
+        workspace.visit(start, 0.0, -1)
+        tie = count if tie_breaker is None else tie_breaker(count, 0.0, start)
+        open_set.append((heuristic(start), tie, count, 0.0, start))
+    heapq.heapify(open_set)
+    count = len(starts) - 1
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expansions = 0
+
+    while open_set:
+        _, _, _, current_g, current = heappop(open_set)
+        if current_g > g_score[current]:
+            continue
+        expansions += 1
+        if current in goals:
+            path = _walk_back(parent, current)
+            return SearchResult(True, path, current_g, expansions,
+                                time.perf_counter() - t0)
+
+        for neighbor, cost in expand(current):
+            temp_g_score = current_g + cost
+            if (
+                stamp[neighbor] != generation
+                or temp_g_score < g_score[neighbor]
+            ):
+                stamp[neighbor] = generation
+                g_score[neighbor] = temp_g_score
+                parent[neighbor] = current
+                count += 1
+                tie = (count if tie_breaker is None
+                       else tie_breaker(count, temp_g_score, neighbor))
+                heappush(open_set, (temp_g_score + heuristic(neighbor), tie,
+                                    count, temp_g_score, neighbor))
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def dijkstra(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    tie_break: str = "fifo",
+) -> SearchResult:
+    """
+    Dijkstra's algorithm, i.e. A* with a zero heuristic.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - tie_break (str): How entries of equal cost are ordered, one of
+    `TIE_BREAKING`.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal.
+    """
+    return a_star(gmap, start, goal, connectivity, heuristic=lambda _: 0.0,
+                  tie_break=tie_break)
+
+
+def weighted_a_star(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    weight: float = 2.0,
+    heuristic: Optional[Callable[[int], float]] = None,
+) -> SearchResult:
+    """
+    A* with the heuristic inflated by a weight, which steers the search
+    straight at the goal and expands far fewer nodes than A* at the price of
+    a path that may be longer than the shortest one.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - weight (float): The heuristic weight, at least 1 (1 is plain A*).
+    - heuristic (Optional[Callable[[int], float]]): Estimated distance from
+    a cell to the goal, as for `a_star`.
+
+    Returns:
+    - SearchResult: The search outcome. With an admissible heuristic the
+    path costs at most `weight` times the optimal cost.
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, not {weight}")
+    if heuristic is None:
+        heuristic = make_heuristic(gmap, goal, connectivity)
+    return a_star(gmap, start, goal, connectivity,
+                  heuristic=lambda index: weight * heuristic(index))
+
+
+class Solution(NamedTuple):
+    """
+    One path found by an anytime search.
+
+    Attributes:
+    - path (List[int]): Cell indices from start to goal.
+    - cost (float): The path cost.
+    - bound (float): The suboptimality bound: the path costs at most this
+    many times the optimal cost.
+    - expansions (int): Nodes expanded so far.
+    - seconds (float): Wall-clock time from the start of the search.
+    """
+    path: List[int]
+    cost: float
+    bound: float
+    expansions: int
+    seconds: float
+
+
+class AnytimeResult(NamedTuple):
+    """
+    The outcome of an anytime search: the best path found in time, with
+    the same leading fields as `SearchResult`.
+
+    Attributes:
+    - found (bool): True if a path was found.
+    - path (List[int]): The best path's cell indices, empty if not found.
+    - cost (float): The best path's cost, math.inf if not found.
+    - expansions (int): The number of nodes expanded.
+    - seconds (float): Wall-clock time spent searching.
+    - bound (float): The suboptimality bound of the best path, 1.0 if it is
+    known to be optimal and math.inf if no path was found.
+    - solutions (List[Solution]): Every improved path, in order.
+    """
+    found: bool
+    path: List[int]
+    cost: float
+    expansions: int
+    seconds: float
+    bound: float
+    solutions: List[Solution]
+
+
+def ara_star(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    weight: float = 2.0,
+    weight_step: float = 0.5,
+    deadline: Optional[float] = None,
+    heuristic: Optional[Callable[[int], float]] = None,
+    on_solution: Optional[Callable[[Solution], None]] = None,
+    observer: Optional[Callable[[int, str], None]] = None,
+) -> AnytimeResult:
+    """
+    Anytime Repairing A* (ARA*): a weighted A* search that finds a first
+    path quickly, then lowers the weight by `weight_step` and repairs the
+    search for a better path, until the weight reaches 1 and the path is
+    optimal or the deadline passes.
+
+    Each repair reuses the costs of the previous ones and only re-expands
+    cells whose cost improved, so the series of paths costs little more
+    than one search at the final weight. After every pass the bound is
+    tightened to the path cost over the smallest unweighted f value left to
+    expand.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - weight (float): The initial heuristic weight, at least 1.
+    - weight_step (float): How much the weight drops after each pass.
+    - deadline (Optional[float]): Seconds after which the best path so far
+    is returned, checked before every expansion (default: no limit).
+    - heuristic (Optional[Callable[[int], float]]): An admissible estimate
+    of the distance to the goal, as for `a_star`.
+    - on_solution (Optional[Callable[[Solution], None]]): Called with every
+    improved path as soon as it is found.
+    - observer (Optional[Callable[[int, str], None]]): Called with a cell
+    and 'open' when it is queued and 'closed' once its neighbors have been
+    expanded, e.g. to draw the search.
+
+    Returns:
+    - AnytimeResult: The best path found, its bound and every improvement.
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, not {weight}")
+    if weight_step <= 0:
+        raise ValueError(f"weight_step must be positive, not {weight_step}")
+    t0 = time.perf_counter()
+    stop = math.inf if deadline is None else t0 + deadline
+    if _blocked(gmap, start, goal):
+        return AnytimeResult(False, [], math.inf, 0,
+                             time.perf_counter() - t0, math.inf, [])
+    if heuristic is None:
+        heuristic = make_heuristic(gmap, goal, connectivity)
+    expand = make_expander(gmap, connectivity)
+    workspace = SearchWorkspace.for_size(len(gmap))
+    generation = workspace.next_generation()
+    stamp = workspace.stamp
+    g_score = workspace.g
+    parent = workspace.parent
+    workspace.visit(start, 0.0, -1)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    perf_counter = time.perf_counter
+
+    epsilon = weight
+    count = 0
+    # cells to expand in this pass; heap entries carry their g so entries
+    # superseded by a cheaper g are skipped
+    open_cells = {start}
+    open_set = [(epsilon * heuristic(start), count, 0.0, start)]
+    # cells whose g improved after their expansion in this pass, left for
+    # the next one
+    inconsistent = set()
+    expansions = 0
+    best_cost = math.inf
+    bound = math.inf
+    solutions: List[Solution] = []
+    timed_out = False
+
+    while True:
+        closed = set()
+        while open_set:
+            key, _, current_g, current = open_set[0]
+            if current not in open_cells or current_g != g_score[current]:
+                heappop(open_set)
+                continue
+            if stamp[goal] == generation and g_score[goal] <= key:
+                break
+            if perf_counter() > stop:
+                timed_out = True
+                break
+            heappop(open_set)
+            open_cells.discard(current)
+            closed.add(current)
+            expansions += 1
+
+            for neighbor, cost in expand(current):
+                temp_g_score = current_g + cost
+                if (
+                    stamp[neighbor] != generation
+                    or temp_g_score < g_score[neighbor]
+                ):
+                    stamp[neighbor] = generation
+                    g_score[neighbor] = temp_g_score
+                    parent[neighbor] = current
+                    if neighbor in closed:
+                        inconsistent.add(neighbor)
+                        continue
+                    open_cells.add(neighbor)
+                    count += 1
+                    heappush(open_set, (
+                        temp_g_score + epsilon * heuristic(neighbor),
+                        count, temp_g_score, neighbor,
+                    ))
+                    if observer is not None:
+                        observer(neighbor, "open")
+            if observer is not None:
+                observer(current, "closed")
+
+        if timed_out or stamp[goal] != generation:
+            break
+        # the cheapest path through any cell left to expand is a lower bound
+        # on the optimal cost
+        lower = min(
+            (g_score[cell] + heuristic(cell)
+             for cell in open_cells | inconsistent),
+            default=math.inf,
+        )
+        # a zero lower bound only happens when the start is the goal
+        ratio = g_score[goal] / lower if lower > 0 else 1.0
+        bound = max(1.0, min(epsilon, ratio))
+        if g_score[goal] < best_cost:
+            best_cost = g_score[goal]
+            solution = Solution(_walk_back(parent, goal), best_cost, bound,
+                                expansions, perf_counter() - t0)
+            solutions.append(solution)
+            if on_solution is not None:
+                on_solution(solution)
+        if bound <= 1.0 or perf_counter() > stop:
+            break
+
+        epsilon = max(1.0, epsilon - weight_step)
+        open_cells |= inconsistent
+        inconsistent = set()
+        open_set = []
+        for cell in open_cells:
+            count += 1
+            open_set.append((g_score[cell] + epsilon * heuristic(cell),
+                             count, g_score[cell], cell))
+        heapq.heapify(open_set)
+
+    seconds = perf_counter() - t0
+    if not solutions:
+        return AnytimeResult(False, [], math.inf, expansions, seconds,
+                             math.inf, [])
+    return AnytimeResult(True, solutions[-1].path, best_cost, expansions,
+                         seconds, bound, solutions)
+
+
+def ida_star(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    heuristic: Optional[Callable[[int], float]] = None,
+    table_size: int = TABLE_SIZE,
+    components: Optional[ComponentIndex] = None,
+) -> SearchResult:
+    """
+    Iterative-deepening A* (IDA*): depth-first searches bounded by an f
+    threshold, raised after each pass to the smallest f that exceeded it.
+
+    Only the current path is kept, plus a transposition table of the
+    cheapest g seen per cell in the current pass, which prunes paths that
+    reach a cell no cheaper than before. The table stops taking new cells
+    at `table_size` entries, so memory is bounded whatever the grid size;
+    a full table only means more repeated work.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - heuristic (Optional[Callable[[int], float]]): An admissible estimate
+    of the distance to the goal, as for `a_star`.
+    - table_size (int): The most cells kept in the transposition table.
+    - components (Optional[ComponentIndex]): A component index of the map.
+    If given, unreachable goals are reported without searching. Pass one
+    whenever the goal may be walled off: the passes would otherwise
+    retrace every path of the start's component before giving up.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal when the
+    heuristic is admissible. Expansions count every pass.
+    """
+    t0 = time.perf_counter()
+    if _unreachable(gmap, start, goal, components):
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    if heuristic is None:
+        heuristic = make_heuristic(gmap, goal, connectivity)
+    if start == goal:
+        return SearchResult(True, [start], 0.0, 1, time.perf_counter() - t0)
+    expand = make_expander(gmap, connectivity)
+    threshold = heuristic(start)
+    expansions = 0
+
+    while True:
+        # f values above the threshold, tolerating rounding of octile sums
+        limit = threshold + 1e-9
+        next_threshold = math.inf
+        table = {start: 0.0}
+        path = [start]
+        costs = [0.0]
+        on_path = {start}
+        # the neighbors still to try, per cell on the path
+        frames = [iter(expand(start))]
+        expansions += 1
+
+        while frames:
+            step = next(frames[-1], None)
+            if step is None:
+                frames.pop()
+                on_path.discard(path.pop())
+                costs.pop()
+                continue
+            neighbor, cost = step
+            if neighbor in on_path:
+                continue
+            g = costs[-1] + cost
+            f = g + heuristic(neighbor)
+            if f > limit:
+                if f < next_threshold:
+                    next_threshold = f
+                continue
+            seen = table.get(neighbor)
+            if seen is not None and seen <= g:
+                continue
+            if seen is not None or len(table) < table_size:
+                table[neighbor] = g
+            path.append(neighbor)
+            if neighbor == goal:
+                return SearchResult(True, path, g, expansions,
+                                    time.perf_counter() - t0)
+            costs.append(g)
+            on_path.add(neighbor)
+            frames.append(iter(expand(neighbor)))
+            expansions += 1
+
+        if next_threshold == math.inf:
+            return SearchResult(False, [], math.inf, expansions,
+                                time.perf_counter() - t0)
+        threshold = next_threshold
+
+
+def fringe_search(
+    gmap: GridMap,
+    start: int,
+    goal: int,
+    connectivity: int = 4,
+    heuristic: Optional[Callable[[int], float]] = None,
+    components: Optional[ComponentIndex] = None,
+) -> SearchResult:
+    """
+    Fringe Search: IDA*-style passes with an f threshold, but the fringe
+    of cells at the edge of one pass is kept and resumed by the next, and
+    the g and parent of each cell visited are cached, so nothing is
+    searched twice.
+
+    The fringe is two plain lists rather than a priority queue, and the
+    cache only holds the cells visited, so memory grows with the explored
+    region rather than the grid.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (int): The start cell index.
+    - goal (int): The goal cell index.
+    - connectivity (int): 4 or 8.
+    - heuristic (Optional[Callable[[int], float]]): An admissible estimate
+    of the distance to the goal, as for `a_star`.
+    - components (Optional[ComponentIndex]): A component index of the map.
+    If given, unreachable goals are reported without searching.
+
+    Returns:
+    - SearchResult: The search outcome. The path is optimal when the
+    heuristic is admissible.
+    """
+    t0 = time.perf_counter()
+    if _unreachable(gmap, start, goal, components):
+        return SearchResult(False, [], math.inf, 0, time.perf_counter() - t0)
+    if heuristic is None:
+        heuristic = make_heuristic(gmap, goal, connectivity)
+    expand = make_expander(gmap, connectivity)
+    # cell -> (g, parent) for every cell visited
+    cache = {start: (0.0, -1)}
+    # entries are (cell, g); one whose g is no longer cached is stale
+    now = [(start, 0.0)]
+    threshold = heuristic(start)
+    expansions = 0
+
+    while now:
+        limit = threshold + 1e-9
+        next_threshold = math.inf
+        later = []
+        while now:
+            current, current_g = now.pop()
+            if cache[current][0] != current_g:
+                continue
+            f = current_g + heuristic(current)
+            if f > limit:
+                if f < next_threshold:
+                    next_threshold = f
+                later.append((current, current_g))
+                continue
+            expansions += 1
+            if current == goal:
+                path = [goal]
+                while cache[path[-1]][1] != -1:
+                    path.append(cache[path[-1]][1])
+                path.reverse()
+                return SearchResult(True, path, current_g, expansions,
+                                    time.perf_counter() - t0)
+            for neighbor, cost in expand(current):
+                g = current_g + cost
+                seen = cache.get(neighbor)
+                if seen is not None and seen[0] <= g:
+                    continue
+                cache[neighbor] = (g, current)
+                # children are visited right after their parent
+                now.append((neighbor, g))
+        later.reverse()
+        now = later
+        threshold = next_threshold
+
+    return SearchResult(False, [], math.inf, expansions,
+                        time.perf_counter() - t0)
+
+
+def distance_field(
+    gmap: GridMap,
+    source: int,
+    connectivity: int = 4,
+    backend: str = "deque",
+) -> array:
+    """
+    Get the shortest-path distance from one cell to every cell, with
+    breadth-first search on 4-connected grids and Dijkstra's algorithm on
+    8-connected grids.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - source (int): The source cell index.
+    - connectivity (int): 4 or 8.
+    - backend (str): One of `BFS_BACKENDS`. 'bitboard' needs
+    connectivity 4, and only pays off on open maps (see `BitGrid`).
+
+    Returns:
+    - array: Distance per cell index ('d' typecode), math.inf where
+    unreachable.
+    """
+    _check_backend(backend, connectivity)
+    if backend == "bitboard":
+        return BitGrid(gmap).distances(source)
+    expand = make_expander(gmap, connectivity)
+    distance = array("d", [math.inf]) * len(gmap)
+    if gmap.cells[source]:
+        return distance
+    distance[source] = 0.0
+
+    if connectivity == 4:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distance[current] + 1.0
+            for neighbor, _ in expand(current):
+                if distance[neighbor] == math.inf:
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+        return distance
+
+    heap = [(0.0, source)]
+    while heap:
+        current_distance, current = heapq.heappop(heap)
+        if current_distance > distance[current]:
+            continue
+        for neighbor, cost in expand(current):
+            new_distance = current_distance + cost
+            if new_distance < distance[neighbor]:
+                distance[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+    return distance
+
+
+SEARCHES = {
+    "a_star": a_star,
+    "ara_star": ara_star,
+    "bfs": bfs,
+    "dfs": dfs,
+    "dijkstra": dijkstra,
+    "fringe_search": fringe_search,
+    "ida_star": ida_star,
+    "weighted_a_star": weighted_a_star,
+}
+
+
+def find_path(
+    gmap: GridMap,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    algorithm: str = "a_star",
+    connectivity: int = 4,
+    components: Optional[ComponentIndex] = None,
+    landmarks=None,
+) -> SearchResult:
+    """
+    Run a headless search between two (row, col) cells.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - start (Tuple[int, int]): The (row, col) of the start cell.
+    - goal (Tuple[int, int]): The (row, col) of the goal cell.
+    - algorithm (str): The algorithm name in `SEARCHES`.
+    - connectivity (int): 4 or 8.
+    - components (Optional[ComponentIndex]): A component index of the map.
+    If given, unreachable goals are reported without searching.
+    - landmarks (Optional[Landmarks]): Landmark tables of the map. If given,
+    'a_star' uses the ALT heuristic.
+
+    Returns:
+    - SearchResult: The search outcome.
+    """
+    start_index = gmap.index(*start)
+    goal_index = gmap.index(*goal)
+    if components is not None and not components.connected(start_index,
+                                                           goal_index):
+        return SearchResult(False, [], math.inf, 0, 0.0)
+    if landmarks is not None and algorithm == "a_star":
+        return a_star(gmap, start_index, goal_index, connectivity,
+                      landmarks.heuristic(goal_index))
+    if algorithm in ("fringe_search", "ida_star"):
+        # they check for barrier endpoints, and reachability from the index
+        return SEARCHES[algorithm](gmap, start_index, goal_index,
+                                   connectivity, components=components)
+    return SEARCHES[algorithm](gmap, start_index, goal_index, connectivity)
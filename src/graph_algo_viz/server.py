@@ -0,0 +1,680 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from components import ComponentIndex
+from gridmap import GridMap, load_movingai_map
+from search import SEARCHES, find_path
+
+
+# queries for the same map arriving within this many seconds are searched
+# as one batch
+BATCH_WINDOW = 0.002
+MAX_BATCH = 64
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found",
+               500: "Internal Server Error"}
+# (start row, start col, goal row, goal col, algorithm, connectivity)
+Query = Tuple[int, int, int, int, str, int]
+
+
+class QueryError(Exception):
+    """
+    A query that cannot be answered, with the HTTP status to reply with.
+
+    Parameters:
+    - message (str): What is wrong with the query.
+    - status (int): The HTTP status code.
+    """
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def map_names(paths: List[str]) -> Dict[str, str]:
+    """
+    Name maps after their file names without the extension.
+
+    Parameters:
+    - paths (List[str]): The '.map' files.
+
+    Returns:
+    - Dict[str, str]: The path of each map by name.
+    """
+    names = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in names:
+            raise ValueError(f"Two maps are named '{name}'")
+        names[name] = path
+    return names
+
+
+def solve_batch(
+    gmap: GridMap,
+    components: ComponentIndex,
+    queries: List[Query],
+) -> List[Dict]:
+    """
+    Answer a batch of queries on one map.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - components (ComponentIndex): Its component index, used to answer
+    unreachable queries without searching.
+    - queries (List[Query]): The queries.
+
+    Returns:
+    - List[Dict]: Per query, 'found', 'path' as [x, y] pairs, 'cost' (None
+    if not found), 'expansions' and 'search_ms'.
+    """
+    replies = []
+    for start_row, start_col, goal_row, goal_col, algorithm, connectivity in (
+        queries
+    ):
+        result = find_path(gmap, (start_row, start_col), (goal_row, goal_col),
+                           algorithm, connectivity, components)
+        replies.append({
+            "found": result.found,
+            "path": [list(reversed(gmap.pos(index)))
+                     for index in result.path],
+            "cost": result.cost if result.found else None,
+            "expansions": result.expansions,
+            "search_ms": result.seconds * 1000,
+        })
+    return replies
+
+
+_worker_maps: Dict[str, Tuple[GridMap, ComponentIndex]] = {}
+
+
+def _init_worker(paths: Dict[str, str]) -> None:
+    """
+    Load and index every map once per worker process.
+
+    Parameters:
+    - paths (Dict[str, str]): The path of each map by name.
+    """
+    for name, path in paths.items():
+        gmap = load_movingai_map(path)
+        _worker_maps[name] = (gmap, ComponentIndex(gmap))
+
+
+def _run_batch(
+    name: str,
+    queries: List[Query],
+) -> List[Dict]:
+    """
+    Answer a batch of queries on one of the worker's maps.
+    """
+    gmap, components = _worker_maps[name]
+    return solve_batch(gmap, components, queries)
+
+
+class PathServer:
+    """
+    A local path-query service speaking JSON over HTTP, on a TCP port or a
+    Unix socket.
+
+    `POST /path` takes {"map", "start": [x, y], "goal": [x, y]} and
+    optionally "algorithm" (default 'a_star') and "connectivity" (default
+    8), with x the column and y the row as in MovingAI files. The reply
+    holds the path and its timings: 'search_ms' in the search itself,
+    'queue_ms' waiting for its batch to be sent, 'batch_ms' for the whole
+    batch on the worker and 'total_ms' from arrival to reply, along with
+    'batch_size'. `GET /maps` lists the maps and `GET /stats` the counters.
+
+    Queries for the same map are collected for up to `batch_window` seconds
+    or `max_batch` queries and sent to the process pool as one task, so
+    busy maps pay the inter-process round trip once per batch instead of
+    once per query.
+
+    Parameters:
+    - paths (Dict[str, str]): The path of each map by name, as from
+    `map_names`. Every worker loads them all once.
+    - workers (Optional[int]): The number of processes (default: CPU
+    count).
+    - batch_window (float): Seconds to wait for more queries for a map.
+    - max_batch (int): Queries per batch.
+    """
+    def __init__(
+        self,
+        paths: Dict[str, str],
+        workers: Optional[int] = None,
+        batch_window: float = BATCH_WINDOW,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        self.maps = {name: load_movingai_map(path)
+                     for name, path in paths.items()}
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.stats = {"queries": 0, "batches": 0, "errors": 0}
+        self._pool: Executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(paths,),
+        )
+        self._pending: Dict[str, List] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._started = time.perf_counter()
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_path: Optional[str] = None,
+    ) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Parameters:
+        - host (str): The TCP host.
+        - port (int): The TCP port; 0 picks a free one.
+        - unix_path (Optional[str]): If given, listen on this Unix socket
+        instead of TCP.
+
+        Returns:
+        - asyncio.AbstractServer: The listening server.
+        """
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle,
+                                                           unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host,
+                                                      port)
+        return self._server
+
+    async def close(self) -> None:
+        """
+        Stop listening and shut the worker pool down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._pool.shutdown(cancel_futures=True)
+
+    def parse_query(self, request: Dict) -> Tuple[str, Query]:
+        """
+        Check a JSON query and convert it to (row, col) cells.
+
+        Parameters:
+        - request (Dict): The decoded request body.
+
+        Returns:
+        - Tuple[str, Query]: The map name and the query.
+        """
+        if not isinstance(request, dict):
+            raise QueryError("Expected a JSON object")
+        name = request.get("map")
+        if name not in self.maps:
+            raise QueryError(f"Unknown map '{name}'", 404)
+        gmap = self.maps[name]
+        algorithm = request.get("algorithm", "a_star")
+        if algorithm not in SEARCHES:
+            raise QueryError(f"Unknown algorithm '{algorithm}', choose from "
+                             f"{list(SEARCHES)}")
+        connectivity = request.get("connectivity", 8)
+        if connectivity not in (4, 8):
+            raise QueryError("connectivity must be 4 or 8")
+        cells = []
+        for key in ("start", "goal"):
+            try:
+                x, y = (int(value) for value in request[key])
+            except (KeyError, TypeError, ValueError):
+                raise QueryError(f"'{key}' must be an [x, y] pair")
+            if not (0 <= y < gmap.rows and 0 <= x < gmap.cols):
+                raise QueryError(f"'{key}' {[x, y]} is outside the map")
+            if gmap.is_barrier(y, x):
+                raise QueryError(f"'{key}' {[x, y]} is a barrier")
+            cells += [y, x]
+        return name, (*cells, algorithm, connectivity)
+
+    async def query(self, request: Dict) -> Dict:
+        """
+        Answer one JSON query, batched with other queries for its map.
+
+        Parameters:
+        - request (Dict): The decoded request body.
+
+        Returns:
+        - Dict: The reply.
+        """
+        arrived = time.perf_counter()
+        name, query = self.parse_query(request)
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(name, [])
+        pending.append((query, future, arrived))
+        if len(pending) >= self.max_batch:
+            self._flush(name)
+        elif name not in self._timers:
+            self._timers[name] = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush, name
+            )
+        reply = await future
+        reply["total_ms"] = (time.perf_counter() - arrived) * 1000
+        return reply
+
+    def _flush(self, name: str) -> None:
+        """
+        Send the pending queries of a map to the pool as one batch.
+        """
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(name, [])
+        if batch:
+            task = asyncio.ensure_future(self._run(name, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        name: str,
+        batch: List,
+    ) -> None:
+        """
+        Run a batch on the pool and resolve each query's future.
+        """
+        self.stats["batches"] += 1
+        dispatched = time.perf_counter()
+        try:
+            replies = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _run_batch, name, [query for query, _, _ in batch]
+            )
+        except Exception as error:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        batch_ms = (time.perf_counter() - dispatched) * 1000
+        for (_, future, arrived), reply in zip(batch, replies):
+            reply.update(queue_ms=(dispatched - arrived) * 1000,
+                         batch_ms=batch_ms, batch_size=len(batch))
+            if not future.done():
+                future.set_result(reply)
+
+    async def _respond(
+        self,
+        method: str,
+        target: str,
+        body: bytes,
+    ) -> Tuple[int, Dict]:
+        """
+        Route one HTTP request to its reply.
+        """
+        if method == "POST" and target == "/path":
+            try:
+                request = json.loads(body)
+            except ValueError:
+                raise QueryError("The body is not valid JSON")
+            reply = await self.query(request)
+            self.stats["queries"] += 1
+            return 200, reply
+        if method == "GET" and target == "/maps":
+            return 200, {name: {"rows": gmap.rows, "cols": gmap.cols}
+                         for name, gmap in self.maps.items()}
+        if method == "GET" and target == "/stats":
+            batches = self.stats["batches"]
+            return 200, dict(
+                self.stats,
+                mean_batch=self.stats["queries"] / batches if batches else 0,
+                uptime_s=time.perf_counter() - self._started,
+            )
+        raise QueryError(f"No route for {method} {target}", 404)
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """
+        Serve the HTTP requests of one keep-alive connection.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_message(reader)
+                except QueryError as error:
+                    # without a length the body's end is unknown, so the
+                    # connection cannot carry another request
+                    self.stats["errors"] += 1
+                    writer.write(http_message(
+                        f"HTTP/1.1 {error.status} {STATUS_TEXT[error.status]}",
+                        {"error": str(error)},
+                    ))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                start_line, headers, body = request
+                method, target = (start_line.split(" ") + [""])[:2]
+                try:
+                    status, reply = await self._respond(method, target, body)
+                except QueryError as error:
+                    self.stats["errors"] += 1
+                    status, reply = error.status, {"error": str(error)}
+                except Exception as error:
+                    self.stats["errors"] += 1
+                    status, reply = 500, {"error": repr(error)}
+                writer.write(http_message(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}", reply
+                ))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def http_message(
+    start_line: str,
+    payload: Optional[Dict] = None,
+) -> bytes:
+    """
+    Build an HTTP/1.1 request or response with a JSON body.
+
+    Parameters:
+    - start_line (str): E.g. 'POST /path HTTP/1.1' or 'HTTP/1.1 200 OK'.
+    - payload (Optional[Dict]): The body, if any.
+
+    Returns:
+    - bytes: The message.
+    """
+    body = b"" if payload is None else json.dumps(payload).encode()
+    return (f"{start_line}\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def read_message(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+    """
+    Read one HTTP/1.1 request or response.
+
+    Parameters:
+    - reader (asyncio.StreamReader): The connection.
+
+    Returns:
+    - Optional[Tuple[str, Dict[str, str], bytes]]: The start line, the
+    headers with lower-case names and the body, or None if the connection
+    was closed.
+
+    Raises:
+    - QueryError: If the Content-Length header is not a non-negative
+    integer.
+    """
+    start_line = await reader.readline()
+    if not start_line.strip():
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length", "0")
+    try:
+        size = int(length)
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise QueryError(f"Invalid Content-Length '{length}'")
+    body = await reader.readexactly(size)
+    return start_line.decode("latin-1").strip(), headers, body
+
+
+async def open_connection(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Connect to a `PathServer` over TCP or a Unix socket.
+
+    Parameters:
+    - host (str): The TCP host.
+    - port (int): The TCP port.
+    - unix_path (Optional[str]): If given, the Unix socket to use instead.
+
+    Returns:
+    - Tuple[asyncio.StreamReader, asyncio.StreamWriter]: The connection.
+    """
+    if unix_path is not None:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def call(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    payload: Optional[Dict] = None,
+) -> Tuple[int, Dict]:
+    """
+    Send one request on an open connection and wait for its reply.
+
+    Parameters:
+    - reader (asyncio.StreamReader): The connection's reader.
+    - writer (asyncio.StreamWriter): The connection's writer.
+    - method (str): 'GET' or 'POST'.
+    - target (str): E.g. '/path'.
+    - payload (Optional[Dict]): The JSON body, if any.
+
+    Returns:
+    - Tuple[int, Dict]: The status code and the decoded reply.
+    """
+    writer.write(http_message(f"{method} {target} HTTP/1.1", payload))
+    await writer.drain()
+    response = await read_message(reader)
+    if response is None:
+        raise ConnectionError("The server closed the connection")
+    start_line, _, body = response
+    return int(start_line.split(" ")[1]), json.loads(body)
+
+
+def random_queries(
+    name: str,
+    gmap: GridMap,
+    count: int,
+    seed: int = 0,
+    algorithm: str = "a_star",
+) -> List[Dict]:
+    """
+    Build queries between random passable cells of a map.
+
+    Parameters:
+    - name (str): The map name on the server.
+    - gmap (GridMap): The map.
+    - count (int): The number of queries.
+    - seed (int): The random seed.
+    - algorithm (str): The algorithm of every query.
+
+    Returns:
+    - List[Dict]: The JSON queries.
+    """
+    free = [index for index, cell in enumerate(gmap.cells) if cell == 0]
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        (start_row, start_col), (goal_row, goal_col) = (
+            gmap.pos(rng.choice(free)), gmap.pos(rng.choice(free))
+        )
+        queries.append({"map": name, "start": [start_col, start_row],
+                        "goal": [goal_col, goal_row],
+                        "algorithm": algorithm})
+    return queries
+
+
+def percentile(
+    values: List[float],
+    fraction: float,
+) -> float:
+    """
+    Get a percentile of a list of values by the nearest-rank method.
+
+    Parameters:
+    - values (List[float]): The values, sorted.
+    - fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+    - float: The value.
+    """
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+async def load_test(
+    queries: List[Dict],
+    concurrency: int = 32,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> Dict:
+    """
+    Send queries to a server from concurrent keep-alive connections and
+    measure throughput and latency.
+
+    Parameters:
+    - queries (List[Dict]): The JSON queries, shared out between the
+    connections.
+    - concurrency (int): The number of connections, each with one query in
+    flight at a time.
+    - host (str): The TCP host.
+    - port (int): The TCP port.
+    - unix_path (Optional[str]): If given, the Unix socket to use instead.
+
+    Returns:
+    - Dict: 'requests', 'errors', 'seconds', 'rps', latency percentiles
+    'p50_ms', 'p95_ms', 'p99_ms' and 'max_ms', and 'mean_batch', the mean
+    batch size the server reported.
+    """
+    latencies: List[float] = []
+    batch_sizes: List[int] = []
+    errors = 0
+
+    async def client(share: List[Dict]) -> None:
+        nonlocal errors
+        reader, writer = await open_connection(host, port, unix_path)
+        try:
+            for query in share:
+                sent = time.perf_counter()
+                status, reply = await call(reader, writer, "POST", "/path",
+                                           query)
+                latencies.append(time.perf_counter() - sent)
+                if status == 200:
+                    batch_sizes.append(reply["batch_size"])
+                else:
+                    errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(queries[i::concurrency])
+                           for i in range(concurrency)))
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": seconds,
+        "rps": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "mean_batch": statistics.mean(batch_sizes) if batch_sizes else 0,
+    }
+
+
+async def serve(args) -> None:
+    """
+    Run a server until interrupted.
+
+    Parameters:
+    - args (argparse.Namespace): The 'serve' command-line arguments.
+    """
+    server = PathServer(map_names(args.maps), args.workers,
+                        args.batch_ms / 1000, args.max_batch)
+    await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving {', '.join(server.maps)} on {where}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def arg_parse():
+    """
+    Parse command-line arguments for the server and the load generator.
+
+    Returns:
+    - argparse.Namespace: An object containing the parsed command-line
+    arguments.
+    """
+    parser = argparse.ArgumentParser(description="Local path-query service")
+    parser.add_argument("-host", default="127.0.0.1", help="TCP host")
+    parser.add_argument("-port", type=int, default=8765, help="TCP port")
+    parser.add_argument("-unix", default=None,
+                        help="Unix socket path, used instead of TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the server")
+    serve_parser.add_argument("maps", nargs="+", help="MovingAI '.map' files")
+    serve_parser.add_argument("-workers", type=int, default=None,
+                              help="Search processes (default: CPU count)")
+    serve_parser.add_argument("-batch-ms", type=float,
+                              default=BATCH_WINDOW * 1000,
+                              help="Milliseconds to collect a batch")
+    serve_parser.add_argument("-max-batch", type=int, default=MAX_BATCH,
+                              help="Queries per batch")
+
+    load_parser = commands.add_parser("load", help="Measure a running server")
+    load_parser.add_argument("map", help="The served '.map' file to query")
+    load_parser.add_argument("-requests", type=int, default=2000,
+                             help="Number of queries")
+    load_parser.add_argument("-concurrency", type=int, default=32,
+                             help="Concurrent connections")
+    load_parser.add_argument("-algo", choices=list(SEARCHES),
+                             default="a_star", help="Algorithm")
+    load_parser.add_argument("-seed", type=int, default=0, help="Query seed")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    """
+    Serve maps and measure the server from another terminal, e.g.
+
+        python server.py serve arena.map maze512.map -workers 4
+        python server.py load arena.map -requests 5000 -concurrency 64
+        curl -d '{"map": "arena", "start": [1, 1], "goal": [40, 30]}' \\
+            http://127.0.0.1:8765/path
+    """
+    args = arg_parse()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        (name, path), = map_names([args.map]).items()
+        queries = random_queries(name, load_movingai_map(path), args.requests,
+                                 args.seed, args.algo)
+        report = asyncio.run(load_test(queries, args.concurrency, args.host,
+                                       args.port, args.unix))
+        print(f"{report['requests']} requests ({report['errors']} errors) "
+              f"in {report['seconds']:.2f}s: {report['rps']:.0f} req/s")
+        print(f"latency p50 {report['p50_ms']:.1f} ms, p95 "
+              f"{report['p95_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms, "
+              f"max {report['max_ms']:.1f} ms; mean batch "
+              f"{report['mean_batch']:.1f}")
@@ -0,0 +1,374 @@
+import argparse
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple
+from components import ComponentIndex
+from generators import GENERATORS, generate
+from gridmap import GridMap
+from landmarks import Landmarks
+from search import SEARCHES, SearchResult, find_path
+
+
+# buffers in the block start at multiples of this many bytes
+_ALIGN = 8
+# ((start row, start col), (goal row, goal col))
+Query = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+class SharedMapHandle(NamedTuple):
+    """
+    What a process needs to attach to a SharedMap: the name of its shared
+    memory block and the shapes of the buffers in it, a few numbers whatever
+    the size of the map.
+
+    Attributes:
+    - name (str): The name of the shared memory block.
+    - rows (int): The number of rows of the map.
+    - cols (int): The number of columns of the map.
+    - components (int): The number of connected components.
+    - landmarks (Tuple[int, ...]): The landmark cell indices, empty without
+    landmark tables.
+    - typecode (str): The typecode of the landmark tables.
+    - connectivity (int): The connectivity of the landmark tables.
+    - scale (int): The fixed-point scale of the landmark tables.
+    - version (int): The map version the landmark tables were built for.
+    """
+    name: str
+    rows: int
+    cols: int
+    components: int
+    landmarks: Tuple[int, ...] = ()
+    typecode: str = "H"
+    connectivity: int = 4
+    scale: int = 1
+    version: int = 0
+
+
+def _aligned(offset: int) -> int:
+    """Round a byte offset up to the next buffer boundary."""
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _layout(handle: SharedMapHandle) -> Tuple[int, int, int]:
+    """Get the offsets of the labels and tables, and the block size."""
+    size = handle.rows * handle.cols
+    labels_at = _aligned(size)
+    tables_at = _aligned(labels_at + size * array("l").itemsize)
+    table_bytes = size * array(handle.typecode).itemsize
+    end = tables_at + len(handle.landmarks) * table_bytes
+    return labels_at, tables_at, end
+
+
+class SharedMap:
+    """
+    A map's cells, component labels and optional landmark distance tables
+    in one block of shared memory, so that worker processes search the
+    same buffers instead of each loading, indexing or unpickling the map.
+
+    `create` copies a map into a new block, `attach` opens an existing one
+    from its handle. The buffers are meant to be read only: a process that
+    edits them changes the map under every other process.
+
+    Parameters:
+    - handle (SharedMapHandle): The block's name and buffer shapes.
+    - memory (shared_memory.SharedMemory): The open block.
+    - owner (bool): Whether `close` also frees the block.
+
+    Attributes:
+    - gmap (GridMap): The map, with its cells in the block.
+    - components (ComponentIndex): Its component index, with its labels in
+    the block.
+    - landmarks (Optional[Landmarks]): Its landmark tables, if any, in the
+    block.
+    """
+    def __init__(
+        self,
+        handle: SharedMapHandle,
+        memory: shared_memory.SharedMemory,
+        owner: bool = False,
+    ) -> None:
+        self.handle = handle
+        self.owner = owner
+        self._memory = memory
+        size = handle.rows * handle.cols
+        labels_at, tables_at, _ = _layout(handle)
+        # every view has to be released before the block can be closed
+        self._views: List[memoryview] = []
+
+        self.gmap = GridMap(handle.rows, handle.cols,
+                            self._view(0, size, "B"))
+        labels = self._view(labels_at, size * array("l").itemsize, "l")
+        self.components = ComponentIndex.from_labels(self.gmap, labels,
+                                                     handle.components)
+        self.landmarks: Optional[Landmarks] = None
+        if handle.landmarks:
+            table_bytes = size * array(handle.typecode).itemsize
+            tables = [
+                self._view(tables_at + i * table_bytes, table_bytes,
+                           handle.typecode)
+                for i in range(len(handle.landmarks))
+            ]
+            self.landmarks = Landmarks(self.gmap, list(handle.landmarks),
+                                       tables, handle.connectivity,
+                                       handle.scale, handle.version)
+
+    @classmethod
+    def create(
+        cls,
+        gmap: GridMap,
+        landmarks: Optional[Landmarks] = None,
+    ) -> "SharedMap":
+        """
+        Copy a map, its component labels and landmark tables into a new
+        shared memory block.
+
+        Parameters:
+        - gmap (GridMap): The map.
+        - landmarks (Optional[Landmarks]): Landmark tables of the map to
+        share as well.
+
+        Returns:
+        - SharedMap: The owner of the new block.
+        """
+        labels, count = ComponentIndex(gmap).root_labels()
+        handle = SharedMapHandle("", gmap.rows, gmap.cols, count)
+        if landmarks is not None and landmarks.tables:
+            handle = handle._replace(
+                landmarks=tuple(landmarks.indices),
+                typecode=landmarks.tables[0].typecode,
+                connectivity=landmarks.connectivity,
+                scale=landmarks.scale,
+                version=landmarks.version,
+            )
+        labels_at, tables_at, size = _layout(handle)
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        handle = handle._replace(name=memory.name)
+
+        buf = memory.buf
+        buf[:len(gmap)] = gmap.cells
+        buf[labels_at:labels_at + len(labels) * labels.itemsize] = \
+            labels.tobytes()
+        if handle.landmarks:
+            offset = tables_at
+            for table in landmarks.tables:
+                data = table.tobytes()
+                buf[offset:offset + len(data)] = data
+                offset += len(data)
+        return cls(handle, memory, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedMapHandle) -> "SharedMap":
+        """
+        Open a block made by `create`, without copying it.
+
+        Parameters:
+        - handle (SharedMapHandle): The `handle` of the creating SharedMap.
+
+        Returns:
+        - SharedMap: A view of the block.
+        """
+        return cls(handle, shared_memory.SharedMemory(name=handle.name))
+
+    def _view(self, offset: int, length: int, typecode: str) -> memoryview:
+        """Get a view of part of the block as items of a typecode."""
+        view = self._memory.buf[offset:offset + length]
+        self._views.append(view)
+        if typecode != "B":
+            view = view.cast(typecode)
+            self._views.append(view)
+        return view
+
+    def close(self) -> None:
+        """
+        Close the block, and free it if this SharedMap created it. The map,
+        labels and tables can no longer be used.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
+            self.owner = False
+
+    def __enter__(self) -> "SharedMap":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_worker_shared: Optional[SharedMap] = None
+
+
+def _init_worker(handle: SharedMapHandle) -> None:
+    """
+    Attach to the shared map once per worker process.
+
+    Parameters:
+    - handle (SharedMapHandle): The handle of the shared map.
+    """
+    global _worker_shared
+    _worker_shared = SharedMap.attach(handle)
+
+
+def _solve_chunk(
+    queries: List[Query],
+    algorithm: str,
+    connectivity: int,
+) -> List[SearchResult]:
+    """
+    Answer a chunk of queries on the worker's shared map.
+    """
+    shared = _worker_shared
+    landmarks = shared.landmarks
+    if landmarks is not None and landmarks.connectivity != connectivity:
+        landmarks = None
+    return [
+        find_path(shared.gmap, start, goal, algorithm, connectivity,
+                  shared.components, landmarks)
+        for start, goal in queries
+    ]
+
+
+class SolverPool:
+    """
+    Worker processes that answer path queries on one SharedMap.
+
+    Every worker attaches to the map's block when it starts. Tasks carry
+    only a chunk of queries and results carry only the answers, so the map
+    is never pickled, and starting a worker costs the same on any map size.
+
+    Parameters:
+    - shared (SharedMap): The map to search. It must stay open while the
+    pool runs.
+    - workers (Optional[int]): The number of processes (default: CPU
+    count).
+    """
+    def __init__(
+        self,
+        shared: SharedMap,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.shared = shared
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(shared.handle,),
+        )
+
+    def solve(
+        self,
+        queries: List[Query],
+        algorithm: str = "a_star",
+        connectivity: int = 4,
+        chunk_size: int = 64,
+    ) -> List[SearchResult]:
+        """
+        Fan queries out to the workers and gather the results.
+
+        'a_star' uses the ALT heuristic where the shared map has landmark
+        tables of the same connectivity.
+
+        Parameters:
+        - queries (List[Query]): ((start row, start col), (goal row, goal
+        col)) pairs.
+        - algorithm (str): The algorithm name in `SEARCHES`.
+        - connectivity (int): 4 or 8.
+        - chunk_size (int): Queries per task.
+
+        Returns:
+        - List[SearchResult]: The result of each query, in query order.
+        """
+        if algorithm not in SEARCHES:
+            raise ValueError(f"Unknown algorithm '{algorithm}', choose from "
+                             f"{list(SEARCHES)}")
+        futures = [
+            self._pool.submit(_solve_chunk, queries[i:i + chunk_size],
+                              algorithm, connectivity)
+            for i in range(0, len(queries), chunk_size)
+        ]
+        return [result for future in futures for result in future.result()]
+
+    def close(self) -> None:
+        """
+        Shut the worker processes down. The shared map stays open.
+        """
+        self._pool.shutdown()
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def random_queries(
+    gmap: GridMap,
+    count: int,
+    seed: int = 0,
+) -> List[Query]:
+    """
+    Pick random queries between passable cells.
+
+    Parameters:
+    - gmap (GridMap): The map.
+    - count (int): The number of queries.
+    - seed (int): Random seed.
+
+    Returns:
+    - List[Query]: The queries.
+    """
+    rng = random.Random(seed)
+    free = [index for index in range(len(gmap)) if not gmap.cells[index]]
+    return [(gmap.pos(rng.choice(free)), gmap.pos(rng.choice(free)))
+            for _ in range(count)]
+
+
+if __name__ == "__main__":
+    """
+    Time queries on a generated map for several worker counts, e.g.
+    `python sharedmap.py caves -rows 1024 -workers 1 2 4 8`.
+    """
+    parser = argparse.ArgumentParser(description="Shared-map pool timing")
+    parser.add_argument("generator", choices=list(GENERATORS))
+    parser.add_argument("-rows", type=int, default=512)
+    parser.add_argument("-seed", type=int, default=0)
+    parser.add_argument("-queries", type=int, default=1000)
+    parser.add_argument("-algo", choices=list(SEARCHES), default="a_star")
+    parser.add_argument("-connectivity", type=int, choices=[4, 8],
+                        default=8)
+    parser.add_argument("-landmarks", type=int, default=0,
+                        help="Landmark tables to share for 'a_star'")
+    parser.add_argument("-workers", type=int, nargs="+",
+                        default=[os.cpu_count()])
+    parser.add_argument("-chunk", type=int, default=16,
+                        help="Queries per task")
+    args = parser.parse_args()
+
+    gmap = generate(args.generator, args.rows, seed=args.seed)
+    landmarks = (Landmarks.build(gmap, args.landmarks,
+                                 connectivity=args.connectivity)
+                 if args.landmarks else None)
+    queries = random_queries(gmap, args.queries, args.seed)
+    with SharedMap.create(gmap, landmarks) as shared:
+        first_rate = None
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            with SolverPool(shared, workers) as pool:
+                # one query per worker, so every worker has attached
+                pool.solve(queries[:workers], args.algo, args.connectivity,
+                           1)
+                warm = time.perf_counter()
+                results = pool.solve(queries, args.algo, args.connectivity,
+                                     args.chunk)
+                elapsed = time.perf_counter() - warm
+            rate = len(queries) / elapsed
+            first_rate = first_rate or rate
+            print(f"{workers:>3} workers: {rate:,.0f} queries/s "
+                  f"({rate / first_rate:.2f}x the first), started in "
+                  f"{(warm - t0) * 1000:.0f} ms, "
+                  f"{sum(result.found for result in results)} found")
@@ -0,0 +1,129 @@
+import math
+import threading
+from array import array
+
+
+# stamps are unsigned 32-bit; on overflow every stamp is cleared once
+MAX_GENERATION = 0xFFFFFFFF
+
+
+class SearchWorkspace:
+    """
+    Scratch arrays for searches on grids of up to one size, reused from
+    search to search.
+
+    Each cell has a g value, a parent and a generation stamp. A slot only
+    counts as written if its stamp equals the current generation, so
+    starting a new search is a single counter increment and a search only
+    ever touches the slots of the cells it reaches, however large the grid.
+
+    A workspace must not be shared by searches running at the same time;
+    `for_size` keeps one per thread, grown to the largest grid searched.
+
+    Parameters:
+    - size (int): The number of cells.
+
+    Attributes:
+    - size (int): The number of slots.
+    - stamp (array): The generation in which each slot was last written.
+    - g (array): The cost from the start per cell, valid where stamped.
+    - parent (array): The previous cell on the best path per cell, -1 at the
+    start, valid where stamped.
+    - generation (int): The current generation.
+    """
+    _local = threading.local()
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.stamp = array("I", [0]) * size
+        self.g = array("d", [0.0]) * size
+        self.parent = array("l", [-1]) * size
+        self.generation = 0
+
+    @classmethod
+    def for_size(cls, size: int) -> "SearchWorkspace":
+        """
+        Get the calling thread's workspace for grids of up to a size,
+        creating it on first use and growing it for larger grids. A thread
+        keeps only one workspace, so searching grids of many sizes holds no
+        more memory than searching the largest.
+
+        Parameters:
+        - size (int): The number of cells.
+
+        Returns:
+        - SearchWorkspace: The workspace.
+        """
+        workspace = getattr(cls._local, "workspace", None)
+        if workspace is None:
+            workspace = cls._local.workspace = cls(size)
+        elif workspace.size < size:
+            workspace.grow(size)
+        return workspace
+
+    @classmethod
+    def release(cls) -> None:
+        """
+        Drop the calling thread's workspace, e.g. so that measuring a
+        search's memory includes its workspace.
+        """
+        cls._local.workspace = None
+
+    def grow(self, size: int) -> None:
+        """
+        Add slots for a larger grid. The new slots are unstamped, so they
+        read as unreached in every generation.
+
+        Parameters:
+        - size (int): The new number of cells.
+        """
+        extra = size - self.size
+        self.stamp.extend(array("I", [0]) * extra)
+        self.g.extend(array("d", [0.0]) * extra)
+        self.parent.extend(array("l", [-1]) * extra)
+        self.size = size
+
+    def next_generation(self) -> int:
+        """
+        Start a new search, which invalidates every slot.
+
+        Returns:
+        - int: The new generation, to compare stamps against.
+        """
+        if self.generation == MAX_GENERATION:
+            self.stamp = array("I", [0]) * self.size
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+    def visit(
+        self,
+        index: int,
+        g: float,
+        parent: int,
+    ) -> None:
+        """
+        Write a cell's slots in the current generation.
+
+        Parameters:
+        - index (int): The cell index.
+        - g (float): The cost from the start.
+        - parent (int): The previous cell, -1 for the start.
+        """
+        self.stamp[index] = self.generation
+        self.g[index] = g
+        self.parent[index] = parent
+
+    def g_of(self, index: int) -> float:
+        """
+        Get a cell's cost from the start in the current generation.
+
+        Parameters:
+        - index (int): The cell index.
+
+        Returns:
+        - float: The cost, math.inf if the cell was not reached.
+        """
+        if self.stamp[index] != self.generation:
+            return math.inf
+        return self.g[index]
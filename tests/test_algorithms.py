@@ -1,4 +1,13 @@
-from src.graph_algo_viz.algorithms import a_star, bfs, dfs, dijkstra
+from src.graph_algo_viz.algorithms import (
+    a_star,
+    bfs,
+    dfs,
+    dijkstra,
+    fringe_search,
+    ida_star,
+)
+from src.graph_algo_viz.components import ComponentIndex
+from src.graph_algo_viz.gridmap import GridMap
 from .conftest import MockSpot
 
 
@@ -17,7 +26,7 @@ def test_no_path_found(grid):
         for j in range(len(grid[i])):
             grid[i][j].update_neighbors([])
 
-    for algorithm in (bfs, dfs, dijkstra, a_star):
+    for algorithm in (bfs, dfs, dijkstra, a_star, ida_star, fringe_search):
         result = algorithm(mock_draw, grid, start, end)
         assert not result, f"{algorithm.__name__} found a path."
 
@@ -46,7 +55,7 @@ def test_specific_path(grid):
     grid[2][1].update_neighbors([end])
     grid[1][2].update_neighbors([end])
 
-    for algorithm in (bfs, dfs, dijkstra, a_star):
+    for algorithm in (bfs, dfs, dijkstra, a_star, ida_star, fringe_search):
         result = algorithm(mock_draw, grid, start, end)
         assert result, f"{algorithm.__name__} failed to find the path."
 
@@ -58,7 +67,7 @@ def test_empty_grid(grid):
     _, start, end = grid
 
     empty_grid = []
-    for algorithm in (bfs, dfs, dijkstra, a_star):
+    for algorithm in (bfs, dfs, dijkstra, a_star, ida_star, fringe_search):
         result = algorithm(mock_draw, empty_grid, start, end)
         error_message = f"{algorithm.__name__} found a path in an empty grid."
         assert not result, error_message
@@ -85,7 +94,7 @@ def test_start_end_neighbour(grid):
     ensure_start_and_end_are_neighbors(start, end)
     start_end_grid = [[start], [end]]
 
-    for algorithm in (bfs, dfs, dijkstra, a_star):
+    for algorithm in (bfs, dfs, dijkstra, a_star, ida_star, fringe_search):
         result = algorithm(mock_draw, start_end_grid, start, end)
         error_message = (
             f"{algorithm.__name__} failed to find the path "
@@ -116,10 +125,50 @@ def test_start_end_not_neighbours(grid):
     ensure_start_and_end_are_not_neighbors(start, end)
     start_end_grid = [[start], [end]]
 
-    for algorithm in (bfs, dfs, dijkstra, a_star):
+    for algorithm in (bfs, dfs, dijkstra, a_star, ida_star, fringe_search):
         result = algorithm(mock_draw, start_end_grid, start, end)
         error_message = (
             f"{algorithm.__name__} incorrectly found a path "
             "when start and end are not neighbors."
         )
         assert not result, error_message
+
+
+def test_nearest_of_several_goals(grid):
+    """
+    Tests that with extra starts and goals the algorithms stop at the goal
+    nearest to any start
+    """
+    grid, start, end = grid
+
+    for algorithm in (bfs, dijkstra, a_star):
+        # (0, 2) is two moves from the start, (2, 2) four
+        assert algorithm(mock_draw, grid, start, end, goals=[grid[0][2]])
+        assert grid[0][2].color == (64, 224, 208)
+        assert grid[0][1].color == (255, 0, 255)
+        assert grid[1][0].color != (255, 0, 255)
+
+        assert algorithm(mock_draw, grid, start, grid[0][2],
+                         starts=[grid[2][1]], goals=[end])
+        assert end.color == (64, 224, 208)
+
+
+def test_threshold_searches_use_component_index(grid):
+    """
+    Tests that IDA* and Fringe Search given a component index report a
+    walled-off end without a single step, and that IDA* finds a start that
+    is its own end
+    """
+    grid, start, end = grid
+    components = ComponentIndex(GridMap(3))
+    for row, col in ((1, 2), (2, 1)):
+        components.set_barrier(row, col)
+    steps = []
+
+    for algorithm in (ida_star, fringe_search):
+        assert not algorithm(lambda: steps.append(1), grid, start, end,
+                             components=components)
+        assert algorithm(mock_draw, grid, start, grid[1][1],
+                         components=components)
+    assert steps == []
+    assert ida_star(mock_draw, grid, start, start)
@@ -0,0 +1,87 @@
+import copy
+from src.graph_algo_viz.benchmark import (
+    MAX_SIZES,
+    build_map,
+    compare_to_baseline,
+    endpoints,
+    make_cases,
+    run_case,
+    run_suite,
+)
+from src.graph_algo_viz.search import ara_star
+
+
+def test_suite_reports_every_algorithm():
+    """
+    Tests that a small benchmark run reports latency, throughput and memory
+    for each algorithm on each map
+    """
+    cases = make_cases([12], ["random", "maze"], [0.1], seed=0)
+    report = run_suite(["bfs", "a_star"], cases, repeats=2, verbose=False)
+
+    assert len(report["results"]) == 4
+    for result in report["results"]:
+        assert result["median_ms"] <= result["p95_ms"]
+        assert result["expansions"] > 0
+        assert result["peak_kib"] > 0
+
+
+def test_suite_caps_ida_star_size():
+    """
+    Tests that IDA* only runs on maps up to its size in `MAX_SIZES`
+    """
+    large = MAX_SIZES["ida_star"] + 1
+    cases = make_cases([16, large], ["rooms"], [0.1], seed=0)
+    report = run_suite(["ida_star", "bfs"], cases, repeats=1, verbose=False)
+
+    runs = {(result["algorithm"], result["size"])
+            for result in report["results"]}
+    assert runs == {("ida_star", 16), ("bfs", 16), ("bfs", large)}
+
+
+def test_baseline_comparison_flags_regressions():
+    """
+    Tests that slower, more expansive or hungrier results are reported as
+    regressions while an identical report passes
+    """
+    cases = make_cases([12], ["random"], [0.1], seed=0)
+    baseline = run_suite(["bfs"], cases, repeats=1, verbose=False)
+    assert compare_to_baseline(baseline, baseline) == []
+
+    report = copy.deepcopy(baseline)
+    result = report["results"][0]
+    result["median_ms"] = result["median_ms"] * 2 + 1
+    result["expansions"] += 1
+    result["peak_kib"] *= 2
+
+    assert len(compare_to_baseline(report, baseline)) == 3
+
+
+def test_suite_runs_each_tie_breaking_policy():
+    """
+    Tests that algorithms with tie-breaking policies are reported once per
+    policy, and that goal-directed ties expand fewer nodes on an open map
+    """
+    cases = make_cases([16], ["random"], [0.0], seed=0)
+    report = run_suite(["bfs", "a_star"], cases, repeats=1, verbose=False,
+                       tie_breaks=["fifo", "high_g"])
+
+    runs = {(result["algorithm"], result["tie_break"]): result
+            for result in report["results"]}
+    assert set(runs) == {("bfs", None), ("a_star", "fifo"),
+                         ("a_star", "high_g")}
+    assert (runs["a_star", "high_g"]["expansions"]
+            < runs["a_star", "fifo"]["expansions"])
+
+
+def test_anytime_expansions_match_search():
+    """
+    Tests that ARA*, which draws its paths without a search step, reports
+    the expansions of the search itself
+    """
+    case = make_cases([32], ["rooms"], [0.1], seed=0)[0]
+    result = run_case("ara_star", case, repeats=1)
+    gmap = build_map(case)
+    expected = ara_star(gmap, *endpoints(gmap))
+    assert result["expansions"] == expected.expansions
+    assert result["path_cost"] == expected.cost
@@ -0,0 +1,81 @@
+import math
+import random
+import pytest
+from src.graph_algo_viz.bitboard import BitGrid
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.gridmap import GridMap
+from src.graph_algo_viz.search import bfs, distance_field
+
+
+def test_distances_match_queue_bfs():
+    """
+    Tests that the bitboard distances and reachable cells equal those of the
+    queue-based breadth-first search on different kinds of maps
+    """
+    rng = random.Random(3)
+    for kind, size, options in (("random", 30, {"density": 0.3}),
+                                ("caves", 30, {}), ("maze", 21, {}),
+                                ("rooms", 31, {})):
+        gmap = generate(kind, size, seed=1, **options)
+        grid = BitGrid(gmap)
+        for _ in range(5):
+            source = rng.randrange(len(gmap))
+            expected = distance_field(gmap, source)
+            assert list(grid.distances(source)) == list(expected)
+            assert grid.cells(grid.reachable(source)) == [
+                cell for cell in range(len(gmap))
+                if expected[cell] != math.inf
+            ]
+
+
+def test_bitboard_bfs_matches_queue_bfs():
+    """
+    Tests that the bitboard backend of bfs finds paths as short as the
+    queue's, each cell of them at its queue distance from the start, and
+    gives the same distance fields and unreachable goals on random, maze
+    and cave maps
+    """
+    rng = random.Random(5)
+    for kind in ("random", "maze", "caves"):
+        gmap = generate(kind, 31, seed=2)
+        free = [cell for cell in range(len(gmap)) if not gmap.cells[cell]]
+        for _ in range(10):
+            start, goal = rng.choice(free), rng.choice(free)
+            distances = distance_field(gmap, start)
+            assert (list(distance_field(gmap, start, backend="bitboard"))
+                    == list(distances))
+            expected = bfs(gmap, start, goal)
+            result = bfs(gmap, start, goal, backend="bitboard")
+            assert result.found == expected.found
+            assert result.cost == expected.cost
+            if result.found:
+                assert [distances[cell] for cell in result.path] == list(
+                    range(len(result.path)))
+                assert all(abs(a - b) in (1, gmap.cols)
+                           for a, b in zip(result.path, result.path[1:]))
+
+
+def test_bitboard_backend():
+    """
+    Tests that distance_field gives the same distances with the bitboard
+    backend, that both bitboard backends handle a wall across the map, and
+    that they reject what they can't do
+    """
+    gmap = generate("caves", 31, seed=2)
+    source = gmap.cells.find(0)
+    assert (list(distance_field(gmap, source, backend="bitboard"))
+            == list(distance_field(gmap, source)))
+
+    gmap = GridMap(5)
+    for row in range(5):
+        gmap.set_barrier(row, 2, True)
+    distances = distance_field(gmap, 0, backend="bitboard")
+    assert distances[1] == 1 and distances[4] == math.inf
+    result = bfs(gmap, 0, 4, backend="bitboard")
+    assert not result.found and result.cost == math.inf
+    with pytest.raises(ValueError):
+        distance_field(gmap, 0, connectivity=8, backend="bitboard")
+    with pytest.raises(ValueError):
+        bfs(gmap, 0, 4, connectivity=8, backend="bitboard")
+    with pytest.raises(ValueError):
+        distance_field(gmap, 0, backend="numpy")
@@ -0,0 +1,58 @@
+from src.graph_algo_viz.brush import (
+    EditHistory,
+    flood_cells,
+    line_cells,
+    rect_cells,
+    stamp_cells,
+)
+from src.graph_algo_viz.gridmap import GridMap
+
+
+def test_lines_have_no_gaps():
+    """
+    Tests that a line between two mouse samples runs from one to the other
+    in single steps, so a fast drag paints without gaps
+    """
+    for end in [(0, 0), (0, 9), (7, 2), (-5, -12), (12, -3), (4, 4)]:
+        cells = line_cells((0, 0), end)
+        assert cells[0] == (0, 0) and cells[-1] == end
+        assert len(cells) == max(abs(end[0]), abs(end[1])) + 1
+        for (row_a, col_a), (row_b, col_b) in zip(cells, cells[1:]):
+            assert max(abs(row_a - row_b), abs(col_a - col_b)) == 1
+
+
+def test_shapes_and_flood_fill():
+    """
+    Tests that brushes are clipped to the grid, that rectangles cover both
+    corners, and that flood fill stops at cells of the other kind
+    """
+    assert len(stamp_cells((5, 5), 3, 10)) == 9
+    assert sorted(stamp_cells((0, 9), 3, 10)) == [(0, 8), (0, 9), (1, 8),
+                                                  (1, 9)]
+    assert stamp_cells((4, 4), 1, 10) == [(4, 4)]
+    assert len(rect_cells((3, 7), (1, 2))) == 3 * 6
+
+    gmap = GridMap(5, 5)
+    for row in range(5):
+        gmap.set_barrier(row, 2)
+    left = flood_cells(gmap, 0, 0)
+    assert len(left) == 10 and all(col < 2 for _, col in left)
+    assert len(flood_cells(gmap, 4, 2)) == 5
+
+
+def test_undo_reverts_whole_strokes():
+    """
+    Tests that undo returns the previous states of one stroke at a time,
+    newest first, and that only the last strokes up to the limit are kept
+    """
+    history = EditHistory(limit=2)
+    for stroke in range(3):
+        history.record(stroke, 0, False)
+        history.record(stroke, 1, True)
+        history.end_stroke()
+    history.record(9, 9, False)
+
+    assert history.undo() == [(9, 9, False)]
+    assert history.undo() == [(2, 0, False), (2, 1, True)]
+    # only the last two strokes are kept
+    assert history.undo() == []
@@ -0,0 +1,87 @@
+import threading
+import time
+import pygame
+from src.graph_algo_viz.compare import run_comparison, run_recorded
+from src.graph_algo_viz.game import make_grid
+
+
+def make_open_grid(rows: int):
+    """
+    Helper function to build a barrier-free grid with neighbors set
+    (Not a test case itself)
+    """
+    grid = make_grid(rows, rows * 10)
+    for row in grid:
+        for spot in row:
+            spot.update_neighbors(grid)
+    return grid
+
+
+def test_recorded_runs_leave_grid_untouched():
+    """
+    Tests that comparison runs search private copies of the grid, so every
+    algorithm sees the same untouched maze
+    """
+    grid = make_open_grid(8)
+    colors_before = [[spot.color for spot in row] for row in grid]
+
+    for algorithm in ("bfs", "dfs", "dijkstra", "a_star"):
+        recorder = run_recorded(algorithm, grid, grid[0][0], grid[7][7])
+        assert recorder.found, f"{algorithm} failed to find the path."
+
+    assert [[spot.color for spot in row] for row in grid] == colors_before
+
+
+def test_recorded_stats():
+    """
+    Tests that the recorded statistics match the run: shortest-path
+    algorithms report the optimal cost and expansions precede the path
+    """
+    grid = make_open_grid(8)
+
+    for algorithm in ("bfs", "dijkstra", "a_star"):
+        recorder = run_recorded(algorithm, grid, grid[0][0], grid[7][7])
+        assert recorder.path_cost == 14
+        assert 0 < recorder.expansions <= recorder.steps
+        assert recorder.step_at_time(recorder.compute_time) <= recorder.steps
+
+
+def test_recorded_anytime_run():
+    """
+    Tests that an anytime run showing several paths reports the cost of the
+    last one and counts every expansion
+    """
+    grid = make_open_grid(12)
+    for col in range(1, 11):
+        grid[6][col].make_barrier()
+
+    recorder = run_recorded("ara_star", grid, grid[11][6], grid[0][6])
+    assert recorder.found
+    assert recorder.path_cost == run_recorded(
+        "bfs", grid, grid[11][6], grid[0][6]
+    ).path_cost
+    assert recorder.expansions == recorder.steps
+
+
+def test_quit_stops_running_searches():
+    """
+    Tests that closing the window during a comparison returns at once and
+    stops the searches still running
+    """
+    grid = make_open_grid(30)
+    for row in range(30):
+        grid[row][15].make_barrier()
+    for row in grid:
+        for spot in row:
+            spot.update_neighbors(grid)
+    threads = threading.active_count()
+
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    t0 = time.perf_counter()
+    assert not run_comparison(grid, 300, pygame.Surface((300, 300)),
+                              ["ida_star"], grid[0][0], grid[29][29])
+    assert time.perf_counter() - t0 < 1.0
+    deadline = time.perf_counter() + 1.0
+    while threading.active_count() > threads:
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
@@ -0,0 +1,88 @@
+import random
+from src.graph_algo_viz.components import ComponentIndex
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.gridmap import GridMap
+from src.graph_algo_viz.search import find_path
+
+
+def same_partition(index):
+    """
+    Helper function to check an incrementally updated index against one
+    built from scratch (Not a test case itself)
+    """
+    fresh = ComponentIndex(index.gmap.copy())
+    mapping = {}
+    for cell in range(len(index.gmap)):
+        old, new = index.component(cell), fresh.component(cell)
+        if (old == -1) != (new == -1):
+            return False
+        if old != -1 and mapping.setdefault(old, new) != new:
+            return False
+    return len(set(mapping.values())) == len(mapping)
+
+
+def test_incremental_updates_match_rebuild():
+    """
+    Tests that painting and erasing barriers one at a time keeps the same
+    components as labelling the edited map from scratch
+    """
+    rng = random.Random(1)
+    for seed in range(10):
+        index = ComponentIndex(generate("random", 10, seed=seed,
+                                        density=0.35))
+        assert same_partition(index)
+        for _ in range(100):
+            index.set_barrier(rng.randrange(10), rng.randrange(10),
+                              rng.random() < 0.5)
+            assert same_partition(index)
+
+
+def test_wall_splits_and_gap_joins():
+    """
+    Tests that a full wall splits the map and that opening a gap in it joins
+    the two sides again
+    """
+    gmap = GridMap(5)
+    index = ComponentIndex(gmap)
+    left, right = gmap.index(2, 0), gmap.index(2, 4)
+    assert index.connected(left, right)
+
+    for row in range(5):
+        index.set_barrier(row, 2)
+    assert not index.connected(left, right)
+    assert not index.connected(left, gmap.index(0, 2))
+
+    index.set_barrier(4, 2, False)
+    assert index.connected(left, right)
+
+
+def test_unreachable_query_skips_search():
+    """
+    Tests that find_path answers a walled-off query without expanding nodes
+    """
+    gmap = GridMap(6)
+    for col in range(6):
+        gmap.set_barrier(3, col)
+    index = ComponentIndex(gmap)
+
+    result = find_path(gmap, (0, 0), (5, 5), "dijkstra", components=index)
+    assert not result.found
+    assert result.expansions == 0
+
+
+def test_batched_updates_match_rebuild():
+    """
+    Tests that painting or erasing many barriers at once, in batches small
+    enough to update cell by cell and large enough to relabel, keeps the
+    same components as labelling the edited map from scratch
+    """
+    rng = random.Random(2)
+    index = ComponentIndex(generate("caves", 30, seed=4))
+    for size in (3, 40, 300):
+        for barrier in (True, False):
+            cells = [(rng.randrange(30), rng.randrange(30))
+                     for _ in range(size)]
+            index.set_barriers(cells, barrier)
+            assert all(index.gmap.is_barrier(*cell) == barrier
+                       for cell in cells)
+            assert same_partition(index)
@@ -0,0 +1,85 @@
+import math
+import os
+import random
+import networkx as nx
+from src.graph_algo_viz.dimacs import (
+    cache_path,
+    load_dimacs_cached,
+    load_graph_cache,
+    read_dimacs_graph,
+    source_stamp,
+)
+from src.graph_algo_viz.graph import SEARCHES
+
+
+def write_road_network(tmp_path, size, seed):
+    """
+    Helper function to write a grid-shaped road network as DIMACS '.gr' and
+    '.co' files, returning the paths and the same graph in networkx (Not a
+    test case itself)
+    """
+    rng = random.Random(seed)
+    nx_graph = nx.DiGraph()
+    arcs = []
+    for node in range(size * size):
+        row, col = divmod(node, size)
+        for other in (node + 1 if col < size - 1 else None,
+                      node + size if row < size - 1 else None):
+            if other is not None:
+                weight = rng.randint(10, 30)
+                arcs += [(node, other, weight), (other, node, weight)]
+    for u, v, w in arcs:
+        nx_graph.add_edge(u, v, weight=w)
+
+    gr_path = tmp_path / "road.gr"
+    co_path = tmp_path / "road.co"
+    gr_path.write_text(
+        f"c test network\np sp {size * size} {len(arcs)}\n"
+        + "".join(f"a {u + 1} {v + 1} {w}\n" for u, v, w in arcs)
+    )
+    co_path.write_text("".join(
+        f"v {node + 1} {10 * (node % size)} {10 * (node // size)}\n"
+        for node in range(size * size)
+    ))
+    return str(gr_path), str(co_path), nx_graph
+
+
+def test_dimacs_searches_match_networkx(tmp_path):
+    """
+    Tests that dijkstra and a_star on a parsed DIMACS network find the same
+    shortest path lengths as networkx
+    """
+    gr_path, co_path, nx_graph = write_road_network(tmp_path, 12, seed=1)
+    graph = read_dimacs_graph(gr_path, co_path)
+    assert graph.directed and graph.edge_count == nx_graph.number_of_edges()
+    assert graph.heuristic_scale() == 1.0
+    rng = random.Random(2)
+    for _ in range(10):
+        start, goal = rng.randrange(144), rng.randrange(144)
+        expected = nx.dijkstra_path_length(nx_graph, start, goal)
+        for name in ("dijkstra", "a_star"):
+            assert math.isclose(SEARCHES[name](graph, start, goal).cost,
+                                expected)
+
+
+def test_cache_round_trip(tmp_path):
+    """
+    Tests that the binary cache maps back to the parsed arrays and is
+    rewritten once the source file changes
+    """
+    gr_path, co_path, _ = write_road_network(tmp_path, 6, seed=3)
+    parsed = read_dimacs_graph(gr_path, co_path)
+    first = load_dimacs_cached(gr_path, co_path)
+    assert os.path.exists(cache_path(gr_path))
+    for name in ("offsets", "targets", "weights", "coords"):
+        assert list(getattr(first, name)) == list(getattr(parsed, name))
+    cached = load_dimacs_cached(gr_path, co_path)
+    assert cached.version() == parsed.version()
+
+    with open(gr_path, "a") as f:
+        f.write("c edited\n")
+    stamp = source_stamp(gr_path, co_path)
+    assert load_graph_cache(cache_path(gr_path), stamp) is None
+    reloaded = load_dimacs_cached(gr_path, co_path)
+    assert list(reloaded.targets) == list(parsed.targets)
+    assert load_graph_cache(cache_path(gr_path), stamp) is not None
@@ -0,0 +1,90 @@
+import os
+import struct
+import pygame
+from src.graph_algo_viz.compare import run_recorded
+from src.graph_algo_viz.export import export_run, split_frames
+from src.graph_algo_viz.game import make_grid
+
+
+def make_run(rows: int):
+    """
+    Helper function to record an A* run across a barrier-free grid with
+    its start and end marked
+    (Not a test case itself)
+    """
+    grid = make_grid(rows, rows * 10)
+    for row in grid:
+        for spot in row:
+            spot.update_neighbors(grid)
+    start = grid[0][0]
+    end = grid[rows - 1][rows - 1]
+    start.make_start()
+    end.make_end()
+    return grid, run_recorded("a_star", grid, start, end)
+
+
+def count_gif_images(data: bytes) -> int:
+    """
+    Helper function to walk the blocks of a GIF and count its images
+    (Not a test case itself)
+    """
+    flags = data[10]
+    position = 13 + 3 * (2 << (flags & 7))
+    images = 0
+    while data[position] != 0x3B:
+        if data[position] == 0x2C:
+            images += 1
+            position += 11
+        else:
+            position += 2
+        while data[position]:
+            position += data[position] + 1
+        position += 1
+    return images
+
+
+def test_gif_export(tmp_path):
+    """
+    Tests that a GIF export holds one image per frame and that its first
+    frame shows the grid before the search
+    """
+    grid, recorder = make_run(12)
+    path = os.path.join(tmp_path, "run.gif")
+
+    frames = export_run(recorder, grid, path, "gif", steps_per_frame=5,
+                        cell=10, workers=1)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:6] == b"GIF89a"
+    assert struct.unpack_from("<HH", data, 6) == (120, 120)
+    assert frames == len(split_frames(recorder, 5))
+    assert count_gif_images(data) == frames
+
+    image = pygame.image.load(path)
+    assert image.get_at((5, 5))[:3] == (255, 165, 0)
+    assert image.get_at((115, 115))[:3] == (64, 224, 208)
+    assert image.get_at((55, 5))[:3] == (255, 255, 255)
+    assert image.get_at((50, 55))[:3] == (128, 128, 128)
+
+
+def test_png_export_on_process_pool(tmp_path):
+    """
+    Tests that PNG frames rendered on a process pool are numbered in order
+    and that the last one shows the path between the start and end
+    """
+    grid, recorder = make_run(12)
+
+    frames = export_run(recorder, grid, str(tmp_path), "png",
+                        steps_per_frame=10, cell=10, workers=2)
+
+    names = sorted(os.listdir(tmp_path))
+    assert names == [f"frame_{i:05d}.png" for i in range(frames)]
+    first = pygame.image.load(os.path.join(tmp_path, names[0]))
+    last = pygame.image.load(os.path.join(tmp_path, names[-1]))
+    assert first.get_at((5, 5))[:3] == (255, 165, 0)
+    assert last.get_at((5, 5))[:3] == (255, 165, 0)
+    assert last.get_at((115, 115))[:3] == (64, 224, 208)
+    path_colors = {tuple(last.get_at((row * 10 + 5, col * 10 + 5))[:3])
+                   for row in range(12) for col in range(12)}
+    assert (255, 0, 255) in path_colors
@@ -0,0 +1,97 @@
+from collections import deque
+import pytest
+from src.graph_algo_viz.generators import GENERATORS, generate
+
+
+def count_reachable(gmap, source):
+    """
+    Helper function to count the passable cells reachable from a cell
+    (Not a test case itself)
+    """
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        row, col = queue.popleft()
+        for r, c in ((row + 1, col), (row - 1, col), (row, col + 1),
+                     (row, col - 1)):
+            if (
+                0 <= r < gmap.rows
+                and 0 <= c < gmap.cols
+                and not gmap.is_barrier(r, c)
+                and (r, c) not in seen
+            ):
+                seen.add((r, c))
+                queue.append((r, c))
+    return len(seen)
+
+
+@pytest.mark.parametrize("name", list(GENERATORS))
+def test_generators_are_reproducible(name):
+    """
+    Tests that every generator builds the same map for the same seed and a
+    different one for a different seed
+    """
+    first = generate(name, 40, 30, seed=7)
+    again = generate(name, 40, 30, seed=7)
+    other = generate(name, 40, 30, seed=8)
+
+    assert (first.rows, first.cols) == (40, 30)
+    assert set(first.cells) <= {0, 1}
+    assert first.cells == again.cells
+    assert first.cells != other.cells
+
+
+@pytest.mark.parametrize("name", ["maze", "division", "rooms"])
+def test_mazes_are_connected(name):
+    """
+    Tests that every passable cell of a maze or room layout can be reached
+    from any other
+    """
+    gmap = generate(name, 41, 41, seed=3)
+    passable = len(gmap.cells) - gmap.cells.count(1)
+    source = gmap.pos(gmap.cells.index(0))
+
+    assert count_reachable(gmap, source) == passable
+
+
+@pytest.mark.parametrize("name", ["maze", "division"])
+@pytest.mark.parametrize("rows, cols", [(150, 130), (127, 191)])
+def test_large_mazes_are_connected(name, rows, cols):
+    """
+    Tests that mazes over 64 cells a side are connected and not built from
+    repeated blocks, and that backtracker mazes stay perfect
+    """
+    gmap = generate(name, rows, cols, seed=3)
+    passable = len(gmap.cells) - gmap.cells.count(1)
+    source = gmap.pos(gmap.cells.index(0))
+    assert count_reachable(gmap, source) == passable
+
+    if name == "maze":
+        links = sum(
+            1
+            for row in range(gmap.rows)
+            for col in range(gmap.cols)
+            if not gmap.is_barrier(row, col)
+            for r, c in ((row + 1, col), (row, col + 1))
+            if r < gmap.rows and c < gmap.cols and not gmap.is_barrier(r, c)
+        )
+        assert links == passable - 1
+
+    blocks = [
+        bytes(gmap.cells[(top + row) * cols + left:
+                         (top + row) * cols + left + 63])
+        for top in range(0, rows - 63, 64)
+        for left in range(0, cols - 63, 64)
+        for row in range(63)
+    ]
+    tiles = [tuple(blocks[i:i + 63]) for i in range(0, len(blocks), 63)]
+    assert len(set(tiles)) == len(tiles)
+
+
+def test_random_density():
+    """
+    Tests that random obstacles are placed at roughly the requested density
+    """
+    gmap = generate("random", 200, seed=1, density=0.25)
+
+    assert abs(gmap.density() - 0.25) < 0.02
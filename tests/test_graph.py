@@ -0,0 +1,103 @@
+import math
+import random
+import networkx as nx
+from src.graph_algo_viz.graph import (
+    SEARCHES,
+    compute_layout,
+    graph_from_networkx,
+    load_edge_list,
+    load_layout,
+    load_or_compute_layout,
+    layout_path,
+)
+
+
+def weighted_grid_graph(size, seed):
+    """
+    Helper function to build a networkx grid graph with positions and edge
+    weights no shorter than the straight-line distance (Not a test case
+    itself)
+    """
+    rng = random.Random(seed)
+    nx_graph = nx.grid_2d_graph(size, size)
+    for u, v in nx_graph.edges:
+        nx_graph.edges[u, v]["weight"] = rng.uniform(1.0, 3.0)
+    for node in nx_graph.nodes:
+        nx_graph.nodes[node]["pos"] = node
+    return nx_graph
+
+
+def test_searches_match_networkx():
+    """
+    Tests that dijkstra and a_star find networkx's shortest path length and
+    bfs its fewest hops, on weighted graphs with coordinates
+    """
+    nx_graph = weighted_grid_graph(15, seed=1)
+    graph = graph_from_networkx(nx_graph)
+    assert graph.coords is not None
+    rng = random.Random(2)
+    labels = list(nx_graph.nodes)
+    for _ in range(20):
+        source, target = rng.choice(labels), rng.choice(labels)
+        start, goal = graph.index(source), graph.index(target)
+        expected = nx.dijkstra_path_length(nx_graph, source, target)
+        for name in ("dijkstra", "a_star"):
+            result = SEARCHES[name](graph, start, goal)
+            assert math.isclose(result.cost, expected)
+        hops = nx.shortest_path_length(nx_graph, source, target)
+        assert len(SEARCHES["bfs"](graph, start, goal).path) == hops + 1
+        path = SEARCHES["dfs"](graph, start, goal).path
+        assert all(nx_graph.has_edge(graph.label(a), graph.label(b))
+                   for a, b in zip(path, path[1:]))
+
+
+def test_directed_edge_list(tmp_path):
+    """
+    Tests that a directed edge list keeps edge direction and weights, and
+    that unreachable goals are reported
+    """
+    path = tmp_path / "graph.txt"
+    path.write_text("# a comment\na b 2.5\nb c\nc a 1\nd a\n")
+    graph = load_edge_list(str(path), directed=True)
+    a, c, d = graph.index("a"), graph.index("c"), graph.index("d")
+    assert graph.edge_count == 4
+    assert SEARCHES["dijkstra"](graph, a, c).cost == 3.5
+    trace = []
+    result = SEARCHES["a_star"](graph, a, d, trace)
+    assert not result.found and result.path == []
+    assert sorted(trace) == sorted([a, graph.index("b"), c])
+
+
+def test_edge_list_isolated_node(tmp_path):
+    """
+    Tests that a line with a single name adds a node without edges
+    """
+    path = tmp_path / "graph.txt"
+    path.write_text("a b\nlonely\n")
+    graph = load_edge_list(str(path))
+    assert graph.node_count == 3
+    assert graph.edge_count == 2
+    lonely = graph.index("lonely")
+    assert not SEARCHES["bfs"](graph, graph.index("a"), lonely).found
+
+
+def test_layout_is_cached(tmp_path):
+    """
+    Tests that a computed layout lies in the unit square, is stored next to
+    the graph file and is ignored once the graph changes
+    """
+    nx_graph = nx.connected_watts_strogatz_graph(300, 4, 0.1, seed=3)
+    path = tmp_path / "graph.txt"
+    path.write_text("".join(f"{u} {v}\n" for u, v in nx_graph.edges))
+    graph = load_edge_list(str(path))
+
+    layout = load_or_compute_layout(str(path), graph)
+    assert len(layout) == 2 * graph.node_count
+    assert all(0.0 <= value <= 1.0 for value in layout)
+    assert graph.layout() is layout
+    assert load_layout(graph, layout_path(str(path))) == layout
+    assert layout == compute_layout(graph)
+
+    path.write_text(path.read_text() + "0 150\n")
+    assert load_layout(load_edge_list(str(path)),
+                       layout_path(str(path))) is None
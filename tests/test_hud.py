@@ -0,0 +1,36 @@
+import pygame
+from src.graph_algo_viz.hud import GlyphCache, Hud, get_font
+
+
+def test_fonts_and_glyphs_render_once():
+    """
+    Tests that fonts are loaded once and that drawing labels and values
+    again renders no new text
+    """
+    assert get_font(None, 18) is get_font(None, 18)
+
+    glyphs = GlyphCache(get_font(None, 18), (0, 0, 0))
+    surface = pygame.Surface((200, 40))
+    glyphs.draw_label(surface, "Open", (0, 0))
+    right = glyphs.draw_value(surface, "1,024.5", (50, 0))
+    assert right > 50
+    cached = (dict(glyphs._labels), dict(glyphs._glyphs))
+
+    glyphs.draw_label(surface, "Open", (0, 20))
+    assert glyphs.draw_value(surface, "4,201.5", (50, 20)) == right
+    assert glyphs._labels == cached[0] and glyphs._glyphs == cached[1]
+
+
+def test_hud_follows_open_set():
+    """
+    Tests that the HUD counts the cells shown as open, forgets them when
+    they close and starts over on reset
+    """
+    hud = Hud()
+    hud.track([(0, 1, 1, "open"), (0, 1, 2, "open"), (1, 1, 1, "closed"),
+               (1, 2, 2, "open"), (2, 1, 2, "path")])
+    assert hud._open == {(2, 2)}
+
+    hud.draw(pygame.Surface((300, 300)))
+    hud.reset()
+    assert hud._open == set() and hud.render_time == 0.0
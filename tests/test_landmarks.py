@@ -0,0 +1,131 @@
+import math
+import random
+from array import array
+from src.graph_algo_viz import algorithms as algorithms_module
+from src.graph_algo_viz import landmarks as landmarks_module
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.gridmap import GridMap, grid_from_map
+from src.graph_algo_viz.landmarks import UNREACHABLE, Landmarks
+from src.graph_algo_viz.search import find_path
+
+
+def random_queries(gmap, count, seed):
+    """
+    Helper function to pick (start, goal) pairs of passable cells (Not a
+    test case itself)
+    """
+    rng = random.Random(seed)
+    passable = [i for i in range(len(gmap)) if not gmap.cells[i]]
+    return [
+        (gmap.pos(rng.choice(passable)), gmap.pos(rng.choice(passable)))
+        for _ in range(count)
+    ]
+
+
+def test_alt_matches_a_star_costs():
+    """
+    Tests that ALT finds paths as short as plain A* while expanding no more
+    nodes, for both connectivities
+    """
+    for name, connectivity in [("maze", 4), ("caves", 8)]:
+        gmap = generate(name, 40, seed=3)
+        landmarks = Landmarks.build(gmap, 6, connectivity=connectivity)
+        plain_total = alt_total = 0
+        for start, goal in random_queries(gmap, 30, seed=4):
+            plain = find_path(gmap, start, goal, "a_star", connectivity)
+            alt = find_path(gmap, start, goal, "a_star", connectivity,
+                            landmarks=landmarks)
+            assert plain.found == alt.found
+            assert abs(plain.cost - alt.cost) < 1e-9
+            plain_total += plain.expansions
+            alt_total += alt.expansions
+        assert alt_total < plain_total
+
+
+def test_save_and_load(tmp_path):
+    """
+    Tests that stored tables load back unchanged and are rejected once the
+    map changes
+    """
+    gmap = generate("rooms", 32, seed=1)
+    landmarks = Landmarks.build(gmap, 4, selection="planar", connectivity=8)
+    path = str(tmp_path / "rooms.map.alt")
+    landmarks.save(path)
+
+    loaded = Landmarks.load(path, gmap, connectivity=8)
+    assert loaded.indices == landmarks.indices
+    assert loaded.tables == landmarks.tables
+    assert Landmarks.load(path, gmap, connectivity=4) is None
+
+    edited = gmap.copy()
+    edited.set_barrier(*gmap.pos(gmap.cells.find(0)))
+    assert not landmarks.is_current(edited)
+    assert Landmarks.load(path, edited, connectivity=8) is None
+
+
+def test_rounded_distances_avoid_sentinel(monkeypatch):
+    """
+    Tests that a distance rounding up to the 16-bit unreachable sentinel is
+    stored in a wider table instead of reading as unreachable
+    """
+    longest = (UNREACHABLE["H"] - 0.3) / 1024
+    monkeypatch.setattr(
+        landmarks_module, "distance_field",
+        lambda gmap, source, connectivity: array(
+            "d", [0.0, longest, math.inf]),
+    )
+    landmarks = Landmarks.build(GridMap(1, 3), 1, connectivity=8)
+    table = landmarks.tables[0]
+    assert table.typecode == "I"
+    assert table[1] == UNREACHABLE["H"]
+    assert table[2] == UNREACHABLE["I"]
+
+
+def test_load_or_build_reuses_short_tables(tmp_path, monkeypatch):
+    """
+    Tests that stored tables with fewer landmarks than requested are reused
+    for the same request, and rebuilt for another selection
+    """
+    gmap = GridMap(2)
+    path = str(tmp_path / "tiny.map")
+    first = Landmarks.load_or_build(path, gmap, 8, "farthest")
+    assert len(first.indices) == 4
+
+    builds = []
+    build = Landmarks.build.__func__
+    monkeypatch.setattr(Landmarks, "build", classmethod(
+        lambda cls, *args, **kwargs: builds.append(args)
+        or build(cls, *args, **kwargs)
+    ))
+    again = Landmarks.load_or_build(path, gmap, 8, "farthest")
+    assert builds == [] and again.indices == first.indices
+    assert (again.selection, again.requested) == ("farthest", 8)
+
+    planar = Landmarks.load_or_build(path, gmap, 8, "planar")
+    assert len(builds) == 1 and planar.selection == "planar"
+
+
+def test_alt_grid_search_checks_tables_after_edits(monkeypatch):
+    """
+    Tests that searching the same grid again reuses the landmark tables
+    without reading its barriers, until an edit is reported
+    """
+    gmap = generate("maze", 21, seed=5)
+    grid = grid_from_map(gmap)
+    (start_row, start_col), (end_row, end_col) = (
+        gmap.pos(gmap.cells.find(0)), gmap.pos(gmap.cells.rfind(0))
+    )
+    start, end = grid[start_row][start_col], grid[end_row][end_col]
+    reads = []
+    map_from_grid = algorithms_module.map_from_grid
+    monkeypatch.setattr(algorithms_module, "map_from_grid",
+                        lambda g: reads.append(g) or map_from_grid(g))
+
+    assert algorithms_module.alt_a_star(lambda: None, grid, start, end)
+    assert algorithms_module.alt_a_star(lambda: None, grid, start, end)
+    assert len(reads) == 1
+
+    edits = algorithms_module.grid_edit_count() + 1
+    monkeypatch.setattr(algorithms_module, "grid_edit_count", lambda: edits)
+    assert algorithms_module.alt_a_star(lambda: None, grid, start, end)
+    assert len(reads) == 2
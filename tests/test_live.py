@@ -0,0 +1,176 @@
+import time
+import pygame
+import pytest
+from src.graph_algo_viz import live
+from src.graph_algo_viz.compare import run_recorded
+from src.graph_algo_viz.game import (
+    GridRenderer,
+    apply_events,
+    clear_search,
+    draw_grid,
+    make_grid,
+)
+from src.graph_algo_viz.live import LiveSearch
+
+
+def make_open_grid(rows: int):
+    """
+    Helper function to build a barrier-free grid with neighbors set
+    (Not a test case itself)
+    """
+    grid = make_grid(rows, rows * 10)
+    for row in grid:
+        for spot in row:
+            spot.update_neighbors(grid)
+    return grid
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """
+    Helper function to poll a condition until it holds or time runs out
+    (Not a test case itself)
+    """
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_live_search_matches_recorded_run():
+    """
+    Tests that taking a live search a few steps at a time yields the same
+    changes as a recorded run, without touching the UI's grid
+    """
+    grid = make_open_grid(10)
+    start, end = grid[0][0], grid[9][9]
+    search = LiveSearch("a_star", grid, start, end).start()
+
+    events = []
+    while not search.done:
+        taken = search.advance(3)
+        assert len({event[0] for event in taken}) <= 3 or search.finished
+        events += taken
+        time.sleep(0.0001)
+
+    assert search.result is True
+    assert events == run_recorded("a_star", grid, start, end).events
+    assert all(spot.color == (255, 255, 255) for row in grid for spot in row)
+    _, row, col, state = events[-1]
+    apply_events(grid, events)
+    assert state == "path" and grid[row][col].color == (255, 0, 255)
+
+
+def test_pause_and_cancel():
+    """
+    Tests that a paused search makes no progress and hands out no changes,
+    and that a cancelled search stops without a result
+    """
+    grid = make_open_grid(100)
+    search = LiveSearch("bfs", grid, grid[0][0], grid[99][99])
+    search.pause()
+    search.start()
+    time.sleep(0.05)
+
+    assert search.paused
+    assert search.recorder.steps == 0
+    assert search.advance(10) == []
+
+    search.resume()
+    assert wait_for(lambda: search.recorder.steps > 0)
+    search.pause()
+    search.cancel()
+    assert wait_for(lambda: not search._thread.is_alive())
+    assert search.result is None and not search.finished
+
+
+def test_failed_search_is_reported(monkeypatch):
+    """
+    Tests that a search raising on the worker thread finishes without a
+    result and raises its exception on the next advance
+    """
+    def broken(draw, grid, start, end):
+        draw()
+        raise RuntimeError("broken search")
+
+    monkeypatch.setitem(live.ALGORITHMS, "broken", broken)
+    grid = make_open_grid(5)
+    search = live.LiveSearch("broken", grid, grid[0][0], grid[4][4]).start()
+
+    assert wait_for(lambda: search.finished)
+    assert search.result is None and not search.done
+    assert isinstance(search.error, RuntimeError)
+    with pytest.raises(RuntimeError, match="broken search"):
+        search.advance(10)
+
+
+def test_rerun_reuses_copy_and_clears_touched_spots():
+    """
+    Tests that a search reusing an earlier one's copy records the same run
+    as a fresh search, and that clearing resets exactly the spots shown
+    """
+    grid = make_open_grid(12)
+    start, end = grid[2][3], grid[9][8]
+    start.make_start()
+    end.make_end()
+    grid[5][5].make_barrier()
+
+    first = LiveSearch("bfs", grid, start, end).start()
+    assert wait_for(lambda: first.finished)
+    second = LiveSearch("a_star", grid, start, end, reuse=first).start()
+    assert wait_for(lambda: second.finished)
+    assert second._copy is first._copy
+    assert second.recorder.events == run_recorded(
+        "a_star", grid, start, end
+    ).events
+
+    touched = []
+    while not second.done:
+        apply_events(grid, second.advance(100), touched)
+    assert {(spot.row, spot.col) for spot in touched} == {
+        (row, col) for _, row, col, _ in second.recorder.events
+    }
+
+    clear_search(touched, start, end)
+    assert touched == []
+    assert grid[5][5].is_barrier()
+    assert start.is_start() and end.is_end()
+    assert all(
+        spot.color == (255, 255, 255)
+        for row in grid for spot in row
+        if spot not in (start, end, grid[5][5])
+    )
+
+
+def test_renderer_matches_full_redraw():
+    """
+    Tests that a frame kept up to date from changed spots alone is pixel
+    for pixel the frame drawn from every spot
+    """
+    rows, width = 12, 120
+    grid = make_open_grid(rows)
+    for spot in (grid[1][1], grid[4][7], grid[8][2]):
+        spot.make_barrier()
+    renderer = GridRenderer(rows, width).rebuild(grid)
+
+    grid[4][7].reset()
+    grid[6][6].make_barrier()
+    grid[2][3].make_start()
+    grid[9][8].make_end()
+    events = [(0, 3, 3, "open"), (1, 3, 4, "closed"), (2, 5, 5, "path")]
+    touched = [grid[4][7], grid[6][6], grid[2][3], grid[9][8]]
+    apply_events(grid, events, touched)
+    renderer.update(touched)
+
+    window = pygame.Surface((width, width))
+    renderer.draw(window)
+    expected = pygame.Surface((width, width))
+    expected.fill((255, 255, 255))
+    for row in grid:
+        for spot in row:
+            spot.draw(expected)
+    draw_grid(expected, rows, width)
+    assert pygame.image.tobytes(window, "RGB") == pygame.image.tobytes(
+        expected, "RGB"
+    )
@@ -0,0 +1,72 @@
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.gridmap import GridMap
+from src.graph_algo_viz.mapf import (
+    conflict_based_search,
+    cooperative_a_star,
+    is_collision_free,
+    random_agents,
+)
+from src.graph_algo_viz.search import bfs
+
+
+def assert_valid_paths(gmap, agents, result):
+    """
+    Helper function to check that every solved path runs from the agent's
+    start to its goal in single moves or waits (Not a test case itself)
+    """
+    for (start, goal), path in zip(agents, result.paths):
+        if path is None:
+            continue
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert not gmap.cells[b]
+            assert abs(a - b) in (0, 1, gmap.cols)
+    assert is_collision_free(result.paths)
+
+
+def test_cooperative_a_star_many_agents():
+    """
+    Tests that cooperative A* plans many agents at once without collisions
+    """
+    gmap = generate("random", 48, seed=2, density=0.15)
+    agents = random_agents(gmap, 60, seed=3)
+    result = cooperative_a_star(gmap, agents)
+    assert result.solved == len(agents)
+    assert_valid_paths(gmap, agents, result)
+    shortest = sum(len(bfs(gmap, start, goal).path) - 1
+                   for start, goal in agents)
+    assert result.sum_of_costs >= shortest
+
+
+def test_agents_swap_through_a_corridor():
+    """
+    Tests that two agents swapping the ends of a corridor use the side
+    pocket to pass each other, with both solvers. The pocket sits next to
+    the second agent, which cooperative A* plans last
+    """
+    gmap = GridMap(3, 7, bytearray(
+        b"\x01\x01\x01\x01\x01\x00\x01"
+        b"\x00\x00\x00\x00\x00\x00\x00"
+        b"\x01\x01\x01\x01\x01\x01\x01"
+    ))
+    agents = [(gmap.index(1, 0), gmap.index(1, 6)),
+              (gmap.index(1, 6), gmap.index(1, 0))]
+    for solver in (cooperative_a_star, conflict_based_search):
+        result = solver(gmap, agents)
+        assert result.solved == 2, solver.__name__
+        assert_valid_paths(gmap, agents, result)
+        assert gmap.index(0, 5) in result.paths[0] + result.paths[1]
+
+
+def test_conflict_based_search_is_no_worse():
+    """
+    Tests that conflict-based search finds collision-free paths costing no
+    more than cooperative A*
+    """
+    gmap = generate("rooms", 24, seed=3)
+    agents = random_agents(gmap, 8, seed=5)
+    optimal = conflict_based_search(gmap, agents)
+    greedy = cooperative_a_star(gmap, agents)
+    assert optimal.solved == len(agents)
+    assert_valid_paths(gmap, agents, optimal)
+    assert optimal.sum_of_costs <= greedy.sum_of_costs
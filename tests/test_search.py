@@ -0,0 +1,250 @@
+import math
+import random
+import pytest
+from src.graph_algo_viz.components import ComponentIndex
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.gridmap import (
+    GridMap,
+    load_movingai_map,
+    save_movingai_map,
+)
+from src.graph_algo_viz.scenarios import load_scenario, run_queries
+from src.graph_algo_viz.search import (
+    SEARCHES,
+    TIE_BREAKING,
+    a_star,
+    ara_star,
+    find_path,
+    fringe_search,
+    ida_star,
+    nearest_distance,
+    nearest_goal,
+)
+from src.graph_algo_viz.search import dijkstra as grid_dijkstra
+
+
+def random_queries(gmap, count, seed=0):
+    """
+    Helper function to pick random pairs of passable cells
+    (Not a test case itself)
+    """
+    rng = random.Random(seed)
+    free = [i for i, cell in enumerate(gmap.cells) if not cell]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+def test_optimal_searches_agree(connectivity):
+    """
+    Tests that A* and Dijkstra find paths of the same cost, and that every
+    algorithm returns a connected path between the endpoints
+    """
+    gmap = generate("random", 30, seed=2, density=0.25)
+
+    for start, goal in random_queries(gmap, 20):
+        results = {
+            name: search(gmap, start, goal, connectivity)
+            for name, search in SEARCHES.items()
+        }
+        assert len({result.found for result in results.values()}) == 1
+        if not results["a_star"].found:
+            continue
+        for name in ("a_star", "ara_star", "fringe_search", "ida_star"):
+            assert math.isclose(results[name].cost,
+                                results["dijkstra"].cost)
+        if connectivity == 4:
+            assert results["bfs"].cost == results["dijkstra"].cost
+        for result in results.values():
+            assert result.path[0] == start and result.path[-1] == goal
+            assert all(not gmap.cells[i] for i in result.path)
+
+
+def test_octile_costs():
+    """
+    Tests diagonal costs and that diagonal moves may not cut corners
+    """
+    gmap = GridMap(3)
+    assert math.isclose(
+        find_path(gmap, (0, 0), (2, 2), "a_star", 8).cost, 2 * math.sqrt(2)
+    )
+
+    gmap.set_barrier(0, 1)
+    result = find_path(gmap, (0, 0), (1, 1), "dijkstra", 8)
+    assert result.cost == 2.0
+
+
+def test_scenario_round_trip(tmp_path):
+    """
+    Tests that a MovingAI map and scenario load correctly and that the
+    runner checks costs against the scenario's optimal lengths, with a
+    map name holding a space
+    """
+    gmap = generate("rooms", 24, seed=4)
+    save_movingai_map(gmap, tmp_path / "rooms.map")
+    loaded = load_movingai_map(tmp_path / "rooms.map")
+    assert loaded.cells == gmap.cells
+
+    start, goal = gmap.cells.find(0), gmap.cells.rfind(0)
+    optimal = SEARCHES["dijkstra"](gmap, start, goal, 8).cost
+    (start_y, start_x), (goal_y, goal_x) = gmap.pos(start), gmap.pos(goal)
+    (tmp_path / "rooms.scen").write_text(
+        "version 1\n"
+        f"0\tmy rooms.map\t24\t24\t{start_x}\t{start_y}\t{goal_x}\t{goal_y}\t"
+        f"{optimal:.8f}\n"
+        f"0\tmy rooms.map\t24\t24\t{start_x}\t{start_y}\t{goal_x}\t{goal_y}\t"
+        f"{optimal + 1:.8f}\n"
+    )
+
+    queries = load_scenario(tmp_path / "rooms.scen")
+    rows = run_queries(loaded, "a_star", queries, 8)
+    assert [row["found"] for row in rows] == [True, True]
+    assert [row["optimal_ok"] for row in rows] == [True, False]
+
+
+def test_anytime_paths_improve_within_bounds():
+    """
+    Tests that ARA* reports paths of falling cost that stay within their
+    suboptimality bounds and ends with the optimal path, and that a spent
+    time budget returns without searching
+    """
+    gmap = generate("caves", 60, seed=5)
+
+    for start, goal in random_queries(gmap, 10, seed=1):
+        optimal = SEARCHES["dijkstra"](gmap, start, goal, 8)
+        weighted = SEARCHES["weighted_a_star"](gmap, start, goal, 8)
+        result = ara_star(gmap, start, goal, 8, weight=3.0)
+        assert result.found == optimal.found == weighted.found
+        if not optimal.found:
+            continue
+        assert weighted.cost <= 2.0 * optimal.cost + 1e-9
+        costs = [solution.cost for solution in result.solutions]
+        assert costs == sorted(set(costs), reverse=True)
+        for solution in result.solutions:
+            assert solution.cost <= solution.bound * optimal.cost + 1e-9
+            assert solution.path[0] == start and solution.path[-1] == goal
+        assert result.bound == 1.0
+        assert math.isclose(result.cost, optimal.cost)
+
+        timed_out = ara_star(gmap, start, goal, 8, deadline=0.0)
+        assert not timed_out.found and timed_out.expansions == 0
+
+
+def test_ara_star_start_is_goal():
+    """
+    Tests that ARA* returns a single-cell path of cost 0 with bound 1 when
+    the start is the goal
+    """
+    gmap = GridMap(5)
+    result = ara_star(gmap, 12, 12, 8)
+    assert result.found and result.path == [12] and result.cost == 0
+    assert result.bound == 1.0
+    assert find_path(gmap, (2, 2), (2, 2), "ara_star").cost == 0
+
+
+def test_ida_star_table_cap():
+    """
+    Tests that IDA* stays optimal when its transposition table is capped
+    far below the number of cells it visits
+    """
+    gmap = generate("random", 16, seed=6, density=0.2)
+
+    for start, goal in random_queries(gmap, 4, seed=2):
+        optimal = SEARCHES["dijkstra"](gmap, start, goal, 8)
+        capped = ida_star(gmap, start, goal, 8, table_size=16)
+        assert capped.found == optimal.found
+        if optimal.found:
+            assert math.isclose(capped.cost, optimal.cost)
+            assert capped.expansions >= ida_star(gmap, start, goal,
+                                                 8).expansions
+
+
+def test_threshold_searches_skip_unreachable_goals():
+    """
+    Tests that IDA* and Fringe Search given a component index report a
+    walled-off goal without expanding, even with a capped table on an open
+    map, and that a barrier goal needs no index
+    """
+    gmap = GridMap(40)
+    components = ComponentIndex(gmap)
+    for row, col in ((38, 39), (39, 38)):
+        components.set_barrier(row, col)
+    start, goal = gmap.index(0, 0), gmap.index(39, 39)
+
+    for result in (ida_star(gmap, start, goal, 4, table_size=16,
+                            components=components),
+                   fringe_search(gmap, start, goal, 8, components=components),
+                   find_path(gmap, (0, 0), (39, 39), "ida_star",
+                             components=components),
+                   ida_star(gmap, start, gmap.index(38, 39)),
+                   fringe_search(gmap, gmap.index(39, 38), goal)):
+        assert not result.found and result.expansions == 0
+
+
+def test_start_is_goal():
+    """
+    Tests that every search returns a single-cell path of cost 0 when the
+    start is the goal
+    """
+    gmap = GridMap(5)
+    for name, search in SEARCHES.items():
+        result = search(gmap, 12, 12, 8)
+        assert result.found and result.path == [12], name
+        assert result.cost == 0, name
+
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+def test_nearest_goal_matches_separate_searches(connectivity):
+    """
+    Tests that one multi-source search finds the cost of the cheapest of
+    all start-goal searches, and that the nearest-goal heuristic matches a
+    brute-force minimum
+    """
+    gmap = generate("caves", 40, seed=7)
+    rng = random.Random(3)
+    free = [i for i, cell in enumerate(gmap.cells) if not cell]
+
+    for _ in range(5):
+        starts = rng.sample(free, 3)
+        goals = rng.sample(free, 8)
+        result = nearest_goal(gmap, starts, goals, connectivity)
+        best = min(
+            SEARCHES["dijkstra"](gmap, start, goal, connectivity).cost
+            for start in starts for goal in goals
+        )
+        assert result.cost == best or math.isclose(result.cost, best)
+        if result.found:
+            assert result.path[0] in starts and result.path[-1] in goals
+
+    points = [gmap.pos(goal) for goal in rng.sample(free, 20)]
+    distance = nearest_distance(points, connectivity)
+    for cell in rng.sample(free, 50):
+        row, col = gmap.pos(cell)
+        expected = min(
+            abs(row - r) + abs(col - c) if connectivity == 4
+            else max(abs(row - r), abs(col - c))
+            + (math.sqrt(2) - 1) * min(abs(row - r), abs(col - c))
+            for r, c in points
+        )
+        assert math.isclose(distance(row, col), expected)
+
+
+def test_tie_breaking_keeps_cost_and_cuts_plateaus():
+    """
+    Tests that every tie-breaking policy finds optimal paths, and that on
+    an open map the goal-directed policies expand little more than the path
+    """
+    gmap = generate("caves", 40, seed=5)
+    for start, goal in random_queries(gmap, 10, seed=2):
+        optimal = a_star(gmap, start, goal).cost
+        for policy in TIE_BREAKING:
+            assert a_star(gmap, start, goal, tie_break=policy).cost == optimal
+            assert grid_dijkstra(gmap, start, goal,
+                                 tie_break=policy).cost == optimal
+
+    empty = GridMap(40)
+    corner = empty.index(39, 39)
+    assert a_star(empty, 0, corner).expansions > 1000
+    for policy in ("lifo", "high_g", "low_h"):
+        assert a_star(empty, 0, corner, tie_break=policy).expansions == 79
+    with pytest.raises(ValueError):
+        a_star(empty, 0, corner, tie_break="random")
@@ -0,0 +1,106 @@
+import asyncio
+import os
+from src.graph_algo_viz.gridmap import GridMap, save_movingai_map
+from src.graph_algo_viz.server import (PathServer, call, load_test,
+                                       map_names, open_connection,
+                                       read_message)
+
+
+def serve_map(tmp_path, scenario):
+    """
+    Helper function to serve a 6x6 map with a wall across its third row,
+    open at the far end, while running a client coroutine
+    (Not a test case itself)
+    """
+    gmap = GridMap(6)
+    for col in range(5):
+        gmap.set_barrier(2, col)
+    path = os.path.join(tmp_path, "wall.map")
+    save_movingai_map(gmap, path)
+
+    async def run():
+        server = PathServer(map_names([path]), workers=1, batch_window=0.05)
+        listening = await server.start(port=0)
+        port = listening.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_queries_are_batched(tmp_path):
+    """
+    Tests that concurrent queries for one map are answered in batches with
+    shortest paths and timing stats
+    """
+    async def scenario(port):
+        queries = [{"map": "wall", "start": [0, 0], "goal": [0, 5],
+                    "connectivity": 4}] * 16
+        report = await load_test(queries, concurrency=8, port=port)
+        reader, writer = await open_connection(port=port)
+        status, reply = await call(reader, writer, "POST", "/path",
+                                   queries[0])
+        writer.close()
+        return report, status, reply
+
+    report, status, reply = serve_map(tmp_path, scenario)
+
+    assert report["requests"] == 16 and report["errors"] == 0
+    assert report["mean_batch"] > 1
+    assert report["p99_ms"] >= report["p50_ms"] > 0
+    assert status == 200 and reply["found"]
+    assert reply["cost"] == 15
+    assert reply["path"][0] == [0, 0] and reply["path"][-1] == [0, 5]
+    for key in ("search_ms", "queue_ms", "batch_ms", "total_ms"):
+        assert reply[key] >= 0
+
+
+def test_invalid_queries_are_rejected(tmp_path):
+    """
+    Tests that queries on unknown maps or barrier cells get error replies
+    and leave the connection usable
+    """
+    async def scenario(port):
+        reader, writer = await open_connection(port=port)
+        replies = [
+            await call(reader, writer, "POST", "/path",
+                       {"map": "nowhere", "start": [0, 0], "goal": [1, 1]}),
+            await call(reader, writer, "POST", "/path",
+                       {"map": "wall", "start": [0, 2], "goal": [1, 1]}),
+            await call(reader, writer, "GET", "/maps"),
+        ]
+        writer.close()
+        return replies
+
+    unknown, barrier, maps = serve_map(tmp_path, scenario)
+
+    assert unknown[0] == 404
+    assert barrier[0] == 400 and "barrier" in barrier[1]["error"]
+    assert maps == (200, {"wall": {"rows": 6, "cols": 6}})
+
+
+def test_bad_content_length_is_rejected(tmp_path):
+    """
+    Tests that a request with a malformed or negative Content-Length gets a
+    400 reply before the connection is closed
+    """
+    async def scenario(port):
+        replies = []
+        for length in ("abc", "-5"):
+            reader, writer = await open_connection(port=port)
+            writer.write(f"POST /path HTTP/1.1\r\nHost: localhost\r\n"
+                         f"Content-Length: {length}\r\n\r\n{{}}".encode())
+            await writer.drain()
+            replies.append(await read_message(reader))
+            replies.append(await read_message(reader))
+            writer.close()
+        return replies
+
+    bad, closed, negative, closed_again = serve_map(tmp_path, scenario)
+
+    assert bad[0].startswith("HTTP/1.1 400")
+    assert b"Content-Length" in bad[2] and b"Content-Length" in negative[2]
+    assert negative[0].startswith("HTTP/1.1 400")
+    assert closed is None and closed_again is None
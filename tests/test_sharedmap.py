@@ -0,0 +1,51 @@
+from src.graph_algo_viz.components import ComponentIndex
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.landmarks import Landmarks
+from src.graph_algo_viz.search import find_path
+from src.graph_algo_viz.sharedmap import SharedMap, SolverPool, random_queries
+
+
+def test_attached_map_shares_buffers():
+    """
+    Tests that an attached map sees the creator's cells, components and
+    landmark tables, and edits made through either one
+    """
+    gmap = generate("rooms", 30, seed=2)
+    landmarks = Landmarks.build(gmap, 3)
+    components = ComponentIndex(gmap)
+    with SharedMap.create(gmap, landmarks) as shared:
+        attached = SharedMap.attach(shared.handle)
+        assert bytes(attached.gmap.cells) == bytes(gmap.cells)
+        for a, b in ((0, 899), (31, 450), (100, 700)):
+            assert (attached.components.connected(a, b)
+                    == components.connected(a, b))
+        assert attached.landmarks.indices == landmarks.indices
+        assert [list(table) for table in attached.landmarks.tables] == [
+            list(table) for table in landmarks.tables
+        ]
+
+        free = gmap.cells.find(0)
+        shared.gmap.set_barrier(*gmap.pos(free))
+        assert attached.gmap.cells[free] == 1
+        attached.close()
+
+
+def test_pool_matches_find_path():
+    """
+    Tests that a solver pool answers queries in order with the same costs as
+    searching in this process
+    """
+    gmap = generate("caves", 40, seed=1)
+    queries = random_queries(gmap, 30, seed=4)
+    with SharedMap.create(gmap, Landmarks.build(gmap, 2)) as shared:
+        with SolverPool(shared, workers=2) as pool:
+            for algorithm in ("a_star", "bfs"):
+                results = pool.solve(queries, algorithm, 4, chunk_size=7)
+                assert [result.cost for result in results] == [
+                    find_path(gmap, start, goal, algorithm).cost
+                    for start, goal in queries
+                ]
+                for result, (start, goal) in zip(results, queries):
+                    if result.found:
+                        assert result.path[0] == gmap.index(*start)
+                        assert result.path[-1] == gmap.index(*goal)
@@ -0,0 +1,67 @@
+import math
+from src.graph_algo_viz.generators import generate
+from src.graph_algo_viz.search import SEARCHES
+from src.graph_algo_viz.workspace import MAX_GENERATION, SearchWorkspace
+
+
+def test_generations_isolate_searches():
+    """
+    Tests that slots written in one generation read as unreached in the
+    next, and that overflowing the stamp counter clears every slot
+    """
+    workspace = SearchWorkspace(4)
+    workspace.next_generation()
+    workspace.visit(2, 5.0, 1)
+    assert workspace.g_of(2) == 5.0 and workspace.g_of(3) == math.inf
+
+    workspace.next_generation()
+    assert workspace.g_of(2) == math.inf
+
+    workspace.generation = MAX_GENERATION
+    workspace.stamp[1] = 1
+    assert workspace.next_generation() == 1
+    assert list(workspace.stamp) == [0, 0, 0, 0]
+
+
+def test_repeated_searches_agree():
+    """
+    Tests that searches reusing the same workspace, in any order, return
+    the same results as the first run
+    """
+    gmap = generate("caves", 40, seed=3)
+    free = [i for i, cell in enumerate(gmap.cells) if not cell]
+    queries = [(free[0], free[-1]), (free[5], free[len(free) // 2])]
+
+    first = {
+        (name, query): search(gmap, *query)
+        for name, search in SEARCHES.items()
+        for query in queries
+    }
+    for (name, query), result in reversed(list(first.items())):
+        again = SEARCHES[name](gmap, *query)
+        assert again.found == result.found
+        assert again.path == result.path and again.cost == result.cost
+
+
+def test_one_workspace_per_thread_grows():
+    """
+    Tests that a thread keeps a single workspace, grown for larger grids
+    and still used for smaller ones, and that a search after a larger one
+    returns what it did before
+    """
+    SearchWorkspace.release()
+    workspace = SearchWorkspace.for_size(400)
+    workspace.next_generation()
+    workspace.visit(7, 2.0, 6)
+    assert SearchWorkspace.for_size(1600) is workspace
+    assert workspace.size == len(workspace.stamp) == len(workspace.g) == 1600
+    assert workspace.g_of(7) == 2.0 and workspace.g_of(1000) == math.inf
+    assert SearchWorkspace.for_size(400) is workspace
+    assert workspace.size == 1600
+
+    small, large = generate("caves", 20, seed=1), generate("caves", 40, seed=1)
+    free = [i for i, cell in enumerate(small.cells) if not cell]
+    before = SEARCHES["a_star"](small, free[0], free[-1])
+    SEARCHES["a_star"](large, 0, len(large) - 1)
+    after = SEARCHES["a_star"](small, free[0], free[-1])
+    assert after.path == before.path and after.cost == before.cost